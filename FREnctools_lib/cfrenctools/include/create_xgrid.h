@@ -32,6 +32,18 @@
 #endif
 /* this value is small compare to earth area */
 
+/* exchange grid cells in buffers that grow as needed */
+typedef struct {
+  int nxgrid;
+  int size;
+  int *i_in;
+  int *j_in;
+  int *i_out;
+  int *j_out;
+  double *area;
+} Xgrid_cells;
+
+
 double poly_ctrlon(const double lon[], const double lat[], int n, double clon);
 double poly_ctrlat(const double lon[], const double lat[], int n);
 double box_ctrlon(double ll_lon, double ll_lat, double ur_lon, double ur_lat, double clon);
@@ -67,6 +79,11 @@ int create_xgrid_2dx2d_order1(const int *nlon_in, const int *nlat_in, const int
                               const double *lon_in, const double *lat_in, const double *lon_out, const double *lat_out,
                               const double *mask_in, const double *mask_out, int *i_in, int *j_in, int *i_out,
                               int *j_out, double *xgrid_area);
+Xgrid_cells *create_xgrid_2dx2d_order1_cells(const int *nlon_in, const int *nlat_in, const int *nlon_out,
+                                             const int *nlat_out, const double *lon_in, const double *lat_in,
+                                             const double *lon_out, const double *lat_out, const double *mask_in,
+                                             const double *mask_out);
+void free_xgrid_cells_buffers(Xgrid_cells *xgrid_cells);
 int create_xgrid_2dx2d_order2(const int *nlon_in, const int *nlat_in, const int *nlon_out, const int *nlat_out,
                               const double *lon_in, const double *lat_in, const double *lon_out, const double *lat_out,
                               const double *mask_in, int *i_in, int *j_in, int *i_out, int *j_out,
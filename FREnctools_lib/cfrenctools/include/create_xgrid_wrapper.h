@@ -0,0 +1,13 @@
+#ifndef CREATE_XGRID_WRAPPER_
+#define CREATE_XGRID_WRAPPER_
+
+#include "create_xgrid.h"
+
+int create_xgrid_order1_wrapper(int nx_src, int ny_src, int nx_dst, int ny_dst, double *x_src,
+                                double *y_src, double *x_dst, double *y_dst, double *mask_src,
+                                double *mask_dst, Xgrid_cells **xgrid_cells);
+
+void create_xgrid_order1_transfer_data(Xgrid_cells *xgrid_cells, int *src_i, int *src_j, int *tgt_i,
+                                       int *tgt_j, double *xarea);
+
+#endif
@@ -618,23 +618,62 @@ int create_xgrid_2dx2d_order1_(const int *nlon_in, const int *nlat_in, const int
 
 };
 #endif
-int create_xgrid_2dx2d_order1(const int *nlon_in, const int *nlat_in, const int *nlon_out, const int *nlat_out,
-                              const double *lon_in, const double *lat_in, const double *lon_out, const double *lat_out,
-                              const double *mask_in, const double *mask_out, int *i_in, int *j_in, int *i_out,
-                              int *j_out, double *xgrid_area)
+/*******************************************************************************
+  static void grow_xgrid_cells
+  Resizes the buffers of xgrid_cells to hold size exchange grid cells.
+*******************************************************************************/
+static void grow_xgrid_cells(Xgrid_cells *xgrid_cells, int size)
+{
+  xgrid_cells->i_in = (int *)realloc(xgrid_cells->i_in, size*sizeof(int));
+  xgrid_cells->j_in = (int *)realloc(xgrid_cells->j_in, size*sizeof(int));
+  xgrid_cells->i_out = (int *)realloc(xgrid_cells->i_out, size*sizeof(int));
+  xgrid_cells->j_out = (int *)realloc(xgrid_cells->j_out, size*sizeof(int));
+  xgrid_cells->area = (double *)realloc(xgrid_cells->area, size*sizeof(double));
+
+  if(xgrid_cells->i_in == NULL || xgrid_cells->j_in == NULL || xgrid_cells->i_out == NULL ||
+     xgrid_cells->j_out == NULL || xgrid_cells->area == NULL)
+    error_handler("create_xgrid.c: not enough memory to grow the exchange grid");
+
+  xgrid_cells->size = size;
+}
+
+/*******************************************************************************
+  void free_xgrid_cells_buffers
+  Frees the buffers of xgrid_cells, but not xgrid_cells itself.
+*******************************************************************************/
+void free_xgrid_cells_buffers(Xgrid_cells *xgrid_cells)
 {
- 
+  free(xgrid_cells->i_in);
+  free(xgrid_cells->j_in);
+  free(xgrid_cells->i_out);
+  free(xgrid_cells->j_out);
+  free(xgrid_cells->area);
+}
+
+/*******************************************************************************
+  static Xgrid_cells *create_xgrid_2dx2d_order1_blocks
+  Clipping loop of create_xgrid_2dx2d_order1 and create_xgrid_2dx2d_order1_cells.
+  The output grid is split into one block per OpenMP thread and the exchange grid
+  cells of block m are stored in the m-th of the nblocks returned Xgrid_cells.
+  The buffers grow as needed.  If max_xgrid > 0, a block cannot hold more than
+  max_xgrid/nblocks cells, as in the MAXXGRID sized arrays of create_xgrid_2dx2d_order1.
+*******************************************************************************/
 #define MAX_V 8
-  int nx1, nx2, ny1, ny2, nx1p, nx2p, nxgrid;
+#define NXGRID_INIT 1024
+static Xgrid_cells *create_xgrid_2dx2d_order1_blocks(const int *nlon_in, const int *nlat_in, const int *nlon_out,
+                                                     const int *nlat_out, const double *lon_in, const double *lat_in,
+                                                     const double *lon_out, const double *lat_out,
+                                                     const double *mask_in, const double *mask_out, int max_xgrid,
+                                                     int *nblocks_out)
+{
+  int nx1, nx2, ny1, ny2, nx1p, nx2p;
   double *area_in, *area_out;
   int nblocks =1;
   int *istart2=NULL, *iend2=NULL;
   int npts_left, nblks_left, pos, m, npts_my, ij;
   double *lon_out_min_list,*lon_out_max_list,*lon_out_avg,*lat_out_min_list,*lat_out_max_list;
   double *lon_out_list, *lat_out_list;
-  int *pnxgrid=NULL, *pstart;
-  int *pi_in=NULL, *pj_in=NULL, *pi_out=NULL, *pj_out=NULL;
-  double *pxgrid_area=NULL;
+  Xgrid_cells *cells;
   int    *n2_list;
   int nthreads, nxgrid_block_max;
 
@@ -661,30 +700,10 @@ int create_xgrid_2dx2d_order1(const int *nlon_in, const int *nlat_in, const int
   istart2 = (int *)malloc(nblocks*sizeof(int));
   iend2 = (int *)malloc(nblocks*sizeof(int));
 
-  pstart = (int *)malloc(nblocks*sizeof(int));
-  pnxgrid = (int *)malloc(nblocks*sizeof(int));
+  nxgrid_block_max = max_xgrid/nblocks;
 
-  nxgrid_block_max = MAXXGRID/nblocks;
-
-  for(m=0; m<nblocks; m++) {
-    pnxgrid[m] = 0;
-    pstart[m] = m*nxgrid_block_max;
-  }
-
-  if(nblocks == 1) {
-    pi_in = i_in;
-    pj_in = j_in;
-    pi_out = i_out;
-    pj_out = j_out;
-    pxgrid_area = xgrid_area;
-  }
-  else {
-    pi_in = (int *)malloc(MAXXGRID*sizeof(int));
-    pj_in = (int *)malloc(MAXXGRID*sizeof(int));
-    pi_out = (int *)malloc(MAXXGRID*sizeof(int));
-    pj_out = (int *)malloc(MAXXGRID*sizeof(int));
-    pxgrid_area = (double *)malloc(MAXXGRID*sizeof(double));
-  }
+  cells = (Xgrid_cells *)calloc(nblocks, sizeof(Xgrid_cells));
+  for(m=0; m<nblocks; m++) grow_xgrid_cells(cells+m, NXGRID_INIT);
 
   npts_left = nx2*ny2;
   nblks_left = nblocks;
@@ -738,14 +757,12 @@ int create_xgrid_2dx2d_order1(const int *nlon_in, const int *nlat_in, const int
     }
   }
 
-  nxgrid = 0;
-  
 #if defined(_OPENMP)
 #pragma omp parallel for default(none) shared(nblocks,nx1,ny1,nx1p,mask_in,mask_out,lon_in,lat_in, \
                                               istart2,iend2,nx2,lat_out_min_list,lat_out_max_list, \
                                               n2_list,lon_out_list,lat_out_list,lon_out_min_list, \
                                               lon_out_max_list,lon_out_avg,area_in,area_out, \
-                                              pxgrid_area,pnxgrid,pi_in,pj_in,pi_out,pj_out,pstart,nthreads)
+                                              cells,nxgrid_block_max)
 #endif
   for(m=0; m<nblocks; m++) {
     int i1, j1, ij;
@@ -810,18 +827,18 @@ int create_xgrid_2dx2d_order1(const int *nlon_in, const int *nlat_in, const int
             min_area = min(area_in[j1*nx1+i1], area_out[j2*nx2+i2]);
 
             if( xarea/min_area > AREA_RATIO_THRESH ) {
-              pnxgrid[m]++;
-              if(pnxgrid[m]>= MAXXGRID/nthreads)
+              nn = cells[m].nxgrid++;
+              if(nxgrid_block_max > 0 && cells[m].nxgrid >= nxgrid_block_max)
                 error_handler("The xgrid size is too large for resources.\n"
                               " nxgrid is greater than MAXXGRID/nthreads; increase MAXXGRID,\n"
                               " decrease nthreads, or increase number of MPI ranks.");
-              nn = pstart[m] + pnxgrid[m]-1;
-              
-              pxgrid_area[nn] = xarea;
-              pi_in[nn]       = i1;
-              pj_in[nn]       = j1;
-              pi_out[nn]      = i2;
-              pj_out[nn]      = j2;
+              if(nn == cells[m].size) grow_xgrid_cells(cells+m, 2*cells[m].size);
+
+              cells[m].area[nn]  = xarea;
+              cells[m].i_in[nn]  = i1;
+              cells[m].j_in[nn]  = j1;
+              cells[m].i_out[nn] = i2;
+              cells[m].j_out[nn] = j2;
               
             }
             
@@ -831,36 +848,6 @@ int create_xgrid_2dx2d_order1(const int *nlon_in, const int *nlat_in, const int
     }
   }
 
-  /*copy data if nblocks > 1 */
-  if(nblocks == 1) {
-    nxgrid = pnxgrid[0];
-    pi_in = NULL;
-    pj_in = NULL;
-    pi_out = NULL;
-    pj_out = NULL;
-    pxgrid_area = NULL;
-  }
-  else {
-    int nn, i;
-    nxgrid = 0;
-    for(m=0; m<nblocks; m++) {
-      for(i=0; i<pnxgrid[m]; i++) {
-	nn = pstart[m] + i;
-	i_in[nxgrid] = pi_in[nn];
-	j_in[nxgrid] = pj_in[nn];
-	i_out[nxgrid] = pi_out[nn];
-	j_out[nxgrid] = pj_out[nn];
-	xgrid_area[nxgrid] = pxgrid_area[nn];
-	nxgrid++;
-      }
-    }
-    free(pi_in);
-    free(pj_in);
-    free(pi_out);
-    free(pj_out);
-    free(pxgrid_area);
-  }
-
   free(area_in);
   free(area_out);
   free(lon_out_min_list);
@@ -871,11 +858,85 @@ int create_xgrid_2dx2d_order1(const int *nlon_in, const int *nlat_in, const int
   free(n2_list);
   free(lon_out_list);
   free(lat_out_list);
+  free(istart2);
+  free(iend2);
+
+  *nblocks_out = nblocks;
+  return cells;
+
+};/* create_xgrid_2dx2d_order1_blocks */
+
+int create_xgrid_2dx2d_order1(const int *nlon_in, const int *nlat_in, const int *nlon_out, const int *nlat_out,
+                              const double *lon_in, const double *lat_in, const double *lon_out, const double *lat_out,
+                              const double *mask_in, const double *mask_out, int *i_in, int *j_in, int *i_out,
+                              int *j_out, double *xgrid_area)
+{
+  int nxgrid, nblocks, m, i;
+  Xgrid_cells *cells;
+
+  cells = create_xgrid_2dx2d_order1_blocks(nlon_in, nlat_in, nlon_out, nlat_out, lon_in, lat_in, lon_out, lat_out,
+                                           mask_in, mask_out, MAXXGRID, &nblocks);
+
+  nxgrid = 0;
+  for(m=0; m<nblocks; m++) {
+    for(i=0; i<cells[m].nxgrid; i++) {
+      i_in[nxgrid] = cells[m].i_in[i];
+      j_in[nxgrid] = cells[m].j_in[i];
+      i_out[nxgrid] = cells[m].i_out[i];
+      j_out[nxgrid] = cells[m].j_out[i];
+      xgrid_area[nxgrid] = cells[m].area[i];
+      nxgrid++;
+    }
+    free_xgrid_cells_buffers(cells+m);
+  }
+  free(cells);
 
   return nxgrid;
 
 };/* get_xgrid_2Dx2D_order1 */
 
+/*******************************************************************************
+  Xgrid_cells *create_xgrid_2dx2d_order1_cells
+  Same as create_xgrid_2dx2d_order1, but the exchange grid cells are returned in
+  buffers that are sized to the exchange grid instead of in caller-provided arrays
+  of size MAXXGRID.  The buffers and the returned Xgrid_cells are owned by the caller.
+*******************************************************************************/
+Xgrid_cells *create_xgrid_2dx2d_order1_cells(const int *nlon_in, const int *nlat_in, const int *nlon_out,
+                                             const int *nlat_out, const double *lon_in, const double *lat_in,
+                                             const double *lon_out, const double *lat_out, const double *mask_in,
+                                             const double *mask_out)
+{
+  int nxgrid, nblocks, m, i;
+  Xgrid_cells *blocks, *cells;
+
+  blocks = create_xgrid_2dx2d_order1_blocks(nlon_in, nlat_in, nlon_out, nlat_out, lon_in, lat_in, lon_out, lat_out,
+                                            mask_in, mask_out, 0, &nblocks);
+
+  if(nblocks == 1) return blocks;
+
+  nxgrid = 0;
+  for(m=0; m<nblocks; m++) nxgrid += blocks[m].nxgrid;
+
+  cells = (Xgrid_cells *)calloc(1, sizeof(Xgrid_cells));
+  grow_xgrid_cells(cells, max(nxgrid, 1));
+
+  for(m=0; m<nblocks; m++) {
+    for(i=0; i<blocks[m].nxgrid; i++) {
+      cells->i_in[cells->nxgrid] = blocks[m].i_in[i];
+      cells->j_in[cells->nxgrid] = blocks[m].j_in[i];
+      cells->i_out[cells->nxgrid] = blocks[m].i_out[i];
+      cells->j_out[cells->nxgrid] = blocks[m].j_out[i];
+      cells->area[cells->nxgrid] = blocks[m].area[i];
+      cells->nxgrid++;
+    }
+    free_xgrid_cells_buffers(blocks+m);
+  }
+  free(blocks);
+
+  return cells;
+
+};/* create_xgrid_2dx2d_order1_cells */
+
 /********************************************************************************
   void create_xgrid_2dx1d_order2
   This routine generate exchange grids between two grids for the second order
@@ -0,0 +1,69 @@
+/***********************************************************************
+ *                   GNU Lesser General Public License
+ *
+ * This file is part of the GFDL FRE NetCDF tools package (FRE-NCTools).
+ *
+ * FRE-NCtools is free software: you can redistribute it and/or modify it under
+ * the terms of the GNU Lesser General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or (at
+ * your option) any later version.
+ *
+ * FRE-NCtools is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public
+ * License along with FRE-NCTools.  If not, see
+ * <http://www.gnu.org/licenses/>.
+ **********************************************************************/
+#include <stdio.h>
+#include <stdlib.h>
+#include <math.h>
+#include "mosaic_util.h"
+#include "constant.h"
+#include "create_xgrid.h"
+#include "create_xgrid_wrapper.h"
+
+/*******************************************************************************
+  int create_xgrid_order1_wrapper
+  Same as create_xgrid_2dx2d_order1, but the exchange grid cells are stored in
+  buffers that grow as needed instead of in caller-provided arrays of size MAXXGRID.
+  Returns the number of exchange grid cells.  The cells must be retrieved with
+  create_xgrid_order1_transfer_data, which also frees the buffers.  The buffers
+  are owned by the returned xgrid_cells handle so that several exchange grids can
+  be computed concurrently.
+*******************************************************************************/
+int create_xgrid_order1_wrapper(int nx_src, int ny_src, int nx_dst, int ny_dst, double *x_src,
+                                double *y_src, double *x_dst, double *y_dst, double *mask_src,
+                                double *mask_dst, Xgrid_cells **xgrid_cells)
+{
+
+  *xgrid_cells = create_xgrid_2dx2d_order1_cells(&nx_src, &ny_src, &nx_dst, &ny_dst, x_src, y_src,
+                                                 x_dst, y_dst, mask_src, mask_dst);
+
+  return (*xgrid_cells)->nxgrid;
+
+}
+
+/*******************************************************************************
+  void create_xgrid_order1_transfer_data
+  Copies the exchange grid cells computed by create_xgrid_order1_wrapper
+  into the caller's arrays of size nxgrid and frees xgrid_cells.
+*******************************************************************************/
+void create_xgrid_order1_transfer_data(Xgrid_cells *xgrid_cells, int *src_i, int *src_j, int *tgt_i,
+                                       int *tgt_j, double *xarea)
+{
+
+  for(int i=0; i<xgrid_cells->nxgrid; i++){
+    src_i[i] = xgrid_cells->i_in[i];
+    src_j[i] = xgrid_cells->j_in[i];
+    tgt_i[i] = xgrid_cells->i_out[i];
+    tgt_j[i] = xgrid_cells->j_out[i];
+    xarea[i] = xgrid_cells->area[i];
+  }
+
+  free_xgrid_cells_buffers(xgrid_cells);
+  free(xgrid_cells);
+
+}
@@ -2,5 +2,6 @@ from . import cfrenctools
 from .shared import create_xgrid, grid_utils
 from .make_hgrid import make_hgrid_wrappers
 from .make_mosaic import mosaic_util
+from .make_topog import topog
 
 cfrenctools.init()
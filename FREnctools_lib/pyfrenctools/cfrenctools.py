@@ -1,28 +1,136 @@
 import ctypes
+from ctypes import POINTER, c_char_p, c_double, c_int, c_void_p
 import os
 
+import numpy as np
+
 from .shared import create_xgrid, grid_utils
 from .make_mosaic import mosaic_util
 from .make_hgrid import make_hgrid_wrappers
+from .make_topog import topog
+from .utils.ctypes import CFunctions
+
+arrayptr_double = np.ctypeslib.ndpointer(dtype=np.float64, flags="C_CONTIGUOUS")
+arrayptr_int = np.ctypeslib.ndpointer(dtype=np.int32, flags="C_CONTIGUOUS")
+
+#C prototypes, name: (restype, argtypes)
+_prototypes = {
+    #create_xgrid
+    "create_xgrid_order1_wrapper": (c_int, [c_int, c_int, #src_nlon, src_nlat
+                                            c_int, c_int, #tgt_nlon, tgt_nlat
+                                            arrayptr_double, arrayptr_double, #src_lon, src_lat
+                                            arrayptr_double, arrayptr_double, #tgt_lon, tgt_lat
+                                            arrayptr_double, arrayptr_double, #src_mask, tgt_mask
+                                            POINTER(c_void_p)]), #xgrid_cells
+    "create_xgrid_order1_transfer_data": (None, [c_void_p, #xgrid_cells
+                                                 arrayptr_int, arrayptr_int, #src_i, src_j
+                                                 arrayptr_int, arrayptr_int, #tgt_i, tgt_j
+                                                 arrayptr_double]), #xarea
+    "create_xgrid_order1_gpu_wrapper": (c_int, [c_int, c_int, #src_nlon, src_nlat
+                                                c_int, c_int, #tgt_nlon, tgt_nlat
+                                                arrayptr_double, arrayptr_double, #src_lon, src_lat
+                                                arrayptr_double, arrayptr_double, #tgt_lon, tgt_lat
+                                                arrayptr_double, arrayptr_double]), #src_mask, tgt_mask
+    "create_xgrid_transfer_data": (None, [c_int, c_int, c_int, #nxcells, src_nlon, tgt_nlon
+                                          arrayptr_int, arrayptr_int, #src_i, src_j
+                                          arrayptr_int, arrayptr_int, #tgt_i, tgt_j
+                                          arrayptr_double]), #xarea
+    #grid_utils
+    "get_grid_area": (None, [POINTER(c_int), POINTER(c_int), #nlon, nlat
+                             arrayptr_double, arrayptr_double, #lon, lat
+                             arrayptr_double]), #area
+    #mosaic_util
+    "get_align_contact": (c_int, [c_int, c_int, #tile1, tile2
+                                  c_int, c_int, c_int, c_int, #nx1, ny1, nx2, ny2
+                                  arrayptr_double, arrayptr_double, #x1, y1
+                                  arrayptr_double, arrayptr_double, #x2, y2
+                                  c_double, c_double, #periodx, periody
+                                  POINTER(c_int), POINTER(c_int), #istart1, iend1
+                                  POINTER(c_int), POINTER(c_int), #jstart1, jend1
+                                  POINTER(c_int), POINTER(c_int), #istart2, iend2
+                                  POINTER(c_int), POINTER(c_int)]), #jstart2, jend2
+    #make_hgrid_wrappers
+    "create_regular_lonlat_grid": (None, [POINTER(c_int), POINTER(c_int), #nxbnds, nybnds
+                                          arrayptr_double, arrayptr_double, #xbnds, ybnds
+                                          arrayptr_int, arrayptr_int, #nlon, nlat
+                                          arrayptr_double, arrayptr_double, #dlon, dlat
+                                          c_int, #use_legacy
+                                          POINTER(c_int), POINTER(c_int), #isc, iec
+                                          POINTER(c_int), POINTER(c_int), #jsc, jec
+                                          arrayptr_double, arrayptr_double, #x, y
+                                          arrayptr_double, arrayptr_double, #dx, dy
+                                          arrayptr_double, arrayptr_double, #area, angle_dx
+                                          c_char_p, c_int]), #center, use_great_circle_algorithm
+    "create_gnomonic_cubic_grid": (None, [c_char_p, #grid_type
+                                          arrayptr_int, arrayptr_int, #nlon, nlat
+                                          arrayptr_double, arrayptr_double, #x, y
+                                          arrayptr_double, arrayptr_double, #dx, dy
+                                          arrayptr_double, arrayptr_double, #area, angle_dx
+                                          arrayptr_double, #angle_dy
+                                          c_double, c_int, c_int, #shift_fac, do_schmidt, do_cube_transform
+                                          c_double, c_double, c_double, #stretch_factor, target_lon, target_lat
+                                          c_int, #num_nest_grids
+                                          arrayptr_int, arrayptr_int, #parent_tile, refine_ratio
+                                          arrayptr_int, arrayptr_int, #istart_nest, iend_nest
+                                          arrayptr_int, arrayptr_int, #jstart_nest, jend_nest
+                                          c_int, c_int]), #halo, output_length_angle
+    "create_gnomonic_cubic_grid_GR": (None, [c_char_p, #grid_type
+                                             arrayptr_int, arrayptr_int, #nlon, nlat
+                                             arrayptr_double, arrayptr_double, #x, y
+                                             arrayptr_double, arrayptr_double, #dx, dy
+                                             arrayptr_double, arrayptr_double, #area, angle_dx
+                                             arrayptr_double, #angle_dy
+                                             c_double, c_int, c_int, #shift_fac, do_schmidt, do_cube_transform
+                                             c_double, c_double, c_double, #stretch_factor, target_lon, target_lat
+                                             c_int, c_int, c_int, #nest_grid, parent_tile, refine_ratio
+                                             c_int, c_int, #istart_nest, iend_nest
+                                             c_int, c_int, #jstart_nest, jend_nest
+                                             c_int, c_int]), #halo, output_length_angle
+    #topog
+    "create_realistic_topog_wrapper": (None, [c_int, c_int, #nx_dst, ny_dst
+                                              arrayptr_double, arrayptr_double, #x_dst, y_dst
+                                              c_char_p, c_char_p, c_char_p, #vgrid_file, topog_file, topog_field
+                                              c_double, c_int, #scale_factor, tripolar_grid
+                                              c_int, c_int, #cyclic_x, cyclic_y
+                                              c_int, c_int, c_int, #fill_first_row, filter_topog, num_filter_pass
+                                              c_int, c_int, c_int, #smooth_topo_allow_deepening, round_shallow, fill_shallow
+                                              c_int, c_int, c_int, #deepen_shallow, full_cell, flat_bottom
+                                              c_int, c_int, c_int, #adjust_topo, fill_isolated_cells, dont_change_landmask
+                                              c_int, c_double, c_int, #kmt_min, min_thickness, open_very_this_cell
+                                              c_double, arrayptr_double, arrayptr_int, #fraction_full_cell, depth, num_levels
+                                              c_int, c_int, #debug, use_great_circle_algorithm
+                                              c_int, c_int, c_int, #on_grid, x_refine, y_refine
+                                              c_char_p, c_int, c_int]), #tile_file, rotate_poly, gpu
+    "get_boundary_type": (None, [c_char_p, c_int, #grid_file, grid_version
+                                 POINTER(c_int), POINTER(c_int), POINTER(c_int)]) #cyclic_x, cyclic_y, is_tripolar
+}
 
+#the library is loaded on the first call to a C function, not on import
 _libpath = os.path.dirname(__file__) + "/c_install/clib.so"
-_lib = ctypes.cdll.LoadLibrary(_libpath)
+
+#C functions with their prototypes set, shared by all modules
+_functions = CFunctions(_prototypes)
 
 def init(libpath: str = None):
 
-    global _libpath, _lib
+    global _libpath
 
     if libpath is not None:
         _libpath = libpath
-        _lib = ctypes.cdll.LoadLibrary(_libpath)
 
-    create_xgrid.init(_libpath, _lib)
-    grid_utils.init(_libpath, _lib)
-    mosaic_util.init(_libpath, _lib)
-    make_hgrid_wrappers.init(_libpath, _lib)
+    _functions.set_libpath(_libpath)
+
+    create_xgrid.init(_libpath, _functions)
+    grid_utils.init(_libpath, _functions)
+    mosaic_util.init(_libpath, _functions)
+    make_hgrid_wrappers.init(_libpath, _functions)
+    topog.init(_libpath, _functions)
 
 def lib() -> type[ctypes.CDLL]:
-    return _lib
+    return _functions.load()
 
 def libpath() -> str:
     return _libpath
+
+def functions() -> CFunctions:
+    return _functions
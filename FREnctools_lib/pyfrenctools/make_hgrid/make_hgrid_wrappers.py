@@ -1,8 +1,8 @@
-from ctypes import CDLL, POINTER, c_int, c_double, c_bool, c_char_p
 import numpy as np
 import numpy.typing as npt
 
 from pyfrenctools.utils.ctypes import (
+    CFunctions,
     set_array,
     set_c_double,
     set_c_int,
@@ -10,14 +10,14 @@ from pyfrenctools.utils.ctypes import (
 )
 
 _libpath = None
-_lib = None
+_functions = None
 
-def init(libpath: str, lib: type[CDLL]):
+def init(libpath: str, functions: CFunctions):
 
-    global _libpath, _lib
+    global _libpath, _functions
 
     _libpath = libpath
-    _lib = lib    
+    _functions = functions
 
 def create_regular_lonlat_grid(
     nxbnds: int,
@@ -42,7 +42,7 @@ def create_regular_lonlat_grid(
     center: str,
     use_great_circle_algorithm: int
 ):
-    _create_regular_lonlat_grid = _lib.create_regular_lonlat_grid
+    _create_regular_lonlat_grid = _functions["create_regular_lonlat_grid"]
     arglist = []
     set_c_int(nxbnds, arglist)
     set_c_int(nybnds, arglist)
@@ -66,32 +66,6 @@ def create_regular_lonlat_grid(
     set_c_str(center, arglist)
     set_c_int(use_great_circle_algorithm, arglist)
 
-
-    _create_regular_lonlat_grid.argtypes = [
-        POINTER(c_int),
-        POINTER(c_int),
-        np.ctypeslib.ndpointer(dtype=xbnds.dtype, ndim=xbnds.ndim, shape=xbnds.shape),
-        np.ctypeslib.ndpointer(dtype=ybnds.dtype, ndim=ybnds.ndim, shape=ybnds.shape),
-        np.ctypeslib.ndpointer(dtype=nlon.dtype, ndim=nlon.ndim, shape=nlon.shape),
-        np.ctypeslib.ndpointer(dtype=nlat.dtype, ndim=nlat.ndim, shape=nlat.ndim),
-        np.ctypeslib.ndpointer(dtype=dlon.dtype, ndim=dlon.ndim, shape=dlon.shape),
-        np.ctypeslib.ndpointer(dtype=dlat.dtype, ndim=dlat.ndim, shape=dlat.shape),
-        c_int,
-        POINTER(c_int),
-        POINTER(c_int),
-        POINTER(c_int),
-        POINTER(c_int),
-        np.ctypeslib.ndpointer(dtype=x.dtype, ndim=x.ndim, shape=x.shape),
-        np.ctypeslib.ndpointer(dtype=y.dtype, ndim=y.ndim, shape=y.shape),
-        np.ctypeslib.ndpointer(dtype=dx.dtype, ndim=dx.ndim, shape=dx.shape),
-        np.ctypeslib.ndpointer(dtype=dy.dtype, ndim=dy.ndim, shape=dy.shape),
-        np.ctypeslib.ndpointer(dtype=area.dtype, ndim=area.ndim, shape=area.shape),
-        np.ctypeslib.ndpointer(dtype=angle_dx.dtype, ndim=angle_dx.ndim, shape=angle_dx.shape),
-        c_char_p,
-        c_int,
-    ] 
-    _create_regular_lonlat_grid.restype = None
-
     _create_regular_lonlat_grid(*arglist)
 
 def create_gnomonic_cubic_grid(
@@ -121,7 +95,7 @@ def create_gnomonic_cubic_grid(
         halo: int,
         output_length_angle: int,
 ):
-    _create_gnomonic_cubic_grid = _lib.create_gnomonic_cubic_grid
+    _create_gnomonic_cubic_grid = _functions["create_gnomonic_cubic_grid"]
 
     arglist = []
     set_c_str(grid_type, arglist)
@@ -150,35 +124,6 @@ def create_gnomonic_cubic_grid(
     set_c_int(halo, arglist)
     set_c_int(output_length_angle, arglist)
 
-    _create_gnomonic_cubic_grid.argtypes = [
-        c_char_p,
-        np.ctypeslib.ndpointer(dtype=nlon.dtype, ndim=nlon.ndim, shape=nlon.shape),
-        np.ctypeslib.ndpointer(dtype=nlat.dtype, ndim=nlat.ndim, shape=nlat.shape),
-        np.ctypeslib.ndpointer(dtype=x.dtype, ndim=x.ndim, shape=x.shape),
-        np.ctypeslib.ndpointer(dtype=y.dtype, ndim=y.ndim, shape=y.shape),
-        np.ctypeslib.ndpointer(dtype=dx.dtype, ndim=dx.ndim, shape=dx.shape),
-        np.ctypeslib.ndpointer(dtype=dy.dtype, ndim=dy.ndim, shape=dy.shape),
-        np.ctypeslib.ndpointer(dtype=area.dtype, ndim=area.ndim, shape=area.shape),
-        np.ctypeslib.ndpointer(dtype=angle_dx.dtype, ndim=angle_dx.ndim, shape=angle_dx.shape),
-        np.ctypeslib.ndpointer(dtype=angle_dy.dtype, ndim=angle_dy.ndim, shape=angle_dy.shape),
-        c_double,
-        c_int,
-        c_int,
-        c_double,
-        c_double,
-        c_double,
-        c_int,
-        np.ctypeslib.ndpointer(dtype=parent_tile.dtype, ndim=parent_tile.ndim, shape=parent_tile.shape),
-        np.ctypeslib.ndpointer(dtype=refine_ratio.dtype, ndim=refine_ratio.ndim, shape=refine_ratio.shape),
-        np.ctypeslib.ndpointer(dtype=istart_nest.dtype, ndim=istart_nest.ndim, shape=istart_nest.shape),
-        np.ctypeslib.ndpointer(dtype=iend_nest.dtype, ndim=iend_nest.ndim, shape=iend_nest.shape),
-        np.ctypeslib.ndpointer(dtype=jstart_nest.dtype, ndim=jstart_nest.ndim, shape=jstart_nest.shape),
-        np.ctypeslib.ndpointer(dtype=jend_nest.dtype, ndim=jend_nest.ndim, shape=jend_nest.shape),
-        c_int,
-        c_int, 
-    ]
-    _create_gnomonic_cubic_grid.restype = None
-
     _create_gnomonic_cubic_grid(*arglist)
 
 def create_gnomonic_cubic_grid_GR(
@@ -208,7 +153,7 @@ def create_gnomonic_cubic_grid_GR(
         halo: int,
         output_length_angle: int,
 ):
-    _create_gnomonic_cubic_grid_GR = _lib.create_gnomonic_cubic_grid_GR
+    _create_gnomonic_cubic_grid_GR = _functions["create_gnomonic_cubic_grid_GR"]
 
     arglist = []
     set_c_str(grid_type, arglist)
@@ -237,33 +182,4 @@ def create_gnomonic_cubic_grid_GR(
     set_c_int(halo, arglist)
     set_c_int(output_length_angle, arglist)
 
-    _create_gnomonic_cubic_grid_GR.argtypes = [
-        c_char_p,
-        np.ctypeslib.ndpointer(dtype=nlon.dtype, ndim=nlon.ndim, shape=nlon.shape),
-        np.ctypeslib.ndpointer(dtype=nlat.dtype, ndim=nlat.ndim, shape=nlat.shape),
-        np.ctypeslib.ndpointer(dtype=x.dtype, ndim=x.ndim, shape=x.shape),
-        np.ctypeslib.ndpointer(dtype=y.dtype, ndim=y.ndim, shape=y.shape),
-        np.ctypeslib.ndpointer(dtype=dx.dtype, ndim=dx.ndim, shape=dx.shape),
-        np.ctypeslib.ndpointer(dtype=dy.dtype, ndim=dy.ndim, shape=dy.shape),
-        np.ctypeslib.ndpointer(dtype=area.dtype, ndim=area.ndim, shape=area.shape),
-        np.ctypeslib.ndpointer(dtype=angle_dx.dtype, ndim=angle_dx.ndim, shape=angle_dx.shape),
-        np.ctypeslib.ndpointer(dtype=angle_dy.dtype, ndim=angle_dy.ndim, shape=angle_dy.shape),
-        c_double,
-        c_int,
-        c_int,
-        c_double,
-        c_double,
-        c_double,
-        c_int,
-        c_int,
-        c_int,
-        c_int,
-        c_int,
-        c_int,
-        c_int,
-        c_int,
-        c_int, 
-    ]
-    _create_gnomonic_cubic_grid_GR.restype = None
-
     _create_gnomonic_cubic_grid_GR(*arglist)
@@ -1,20 +1,20 @@
 import ctypes
-from ctypes import create_string_buffer
 import numpy as np
 import numpy.typing as npt
-from numpy.ctypeslib import ndpointer
+
+from pyfrenctools.utils.ctypes import CFunctions
 
 
 _libpath = None
-_lib = None
+_functions = None
 
 
-def init(libpath: str, lib: type[ctypes.CDLL]):
+def init(libpath: str, functions: CFunctions):
 
-    global _libpath, _lib
+    global _libpath, _functions
 
     _libpath = libpath
-    _lib = lib
+    _functions = functions
 
     
 class Contact:
@@ -38,65 +38,29 @@ class Contact:
         self.nxp2 = nxp2
         self.nyp1 = nyp1 
         self.nyp2 = nyp2
-        self.x1 = x1
-        self.x2 = x2
-        self.y1 = y1
-        self.y2 = y2
+        self.x1 = np.ascontiguousarray(x1, dtype=np.float64)
+        self.x2 = np.ascontiguousarray(x2, dtype=np.float64)
+        self.y1 = np.ascontiguousarray(y1, dtype=np.float64)
+        self.y2 = np.ascontiguousarray(y2, dtype=np.float64)
         self.periodx = periodx
         self.periody = periody
 
+        #istart1, iend1, jstart1, jend1, istart2, iend2, jstart2, jend2
+        self._indices = [ctypes.c_int() for i in range(8)]
+
     def align_contact(self) -> int:
 
-        #acquire function signature
-        find_align = _lib.get_align_contact
-
-        #represent parameters needed
-        find_align.argtypes = [ctypes.c_int, ctypes.c_int,
-                               ctypes.c_int, ctypes.c_int,
-                               ctypes.c_int, ctypes.c_int,
-                               ctypes.POINTER(ctypes.c_double),
-                               ctypes.POINTER(ctypes.c_double),
-                               ctypes.POINTER(ctypes.c_double),
-                               ctypes.POINTER(ctypes.c_double),
-                               ctypes.c_double,
-                               ctypes.c_double,
-                               ctypes.POINTER(ctypes.c_int),
-                               ctypes.POINTER(ctypes.c_int),
-                               ctypes.POINTER(ctypes.c_int),
-                               ctypes.POINTER(ctypes.c_int),
-                               ctypes.POINTER(ctypes.c_int),
-                               ctypes.POINTER(ctypes.c_int),
-                               ctypes.POINTER(ctypes.c_int),
-                               ctypes.POINTER(ctypes.c_int)]
-
-        c_double_p = ctypes.POINTER(ctypes.c_double)
-
-        istart1, iend1, jstart1, jend1, \
-        istart2, iend2, jstart2, jend2 = [ctypes.c_int() for i in range(8)]
-        count = find_align(
-            ctypes.c_int(self.tile1),
-            ctypes.c_int(self.tile2),
-            ctypes.c_int(self.nxp1),
-            ctypes.c_int(self.nyp1),
-            ctypes.c_int(self.nxp2),
-            ctypes.c_int(self.nyp2),
-            self.x1.ctypes.data_as(c_double_p),
-            self.y1.ctypes.data_as(c_double_p),
-            self.x2.ctypes.data_as(c_double_p),
-            self.y2.ctypes.data_as(c_double_p),
-            ctypes.c_double(self.periodx),
-            ctypes.c_double(self.periody),
-            ctypes.byref(istart1),
-            ctypes.byref(iend1),
-            ctypes.byref(jstart1),
-            ctypes.byref(jend1),
-            ctypes.byref(istart2),
-            ctypes.byref(iend2),
-            ctypes.byref(jstart2),
-            ctypes.byref(jend2))
-
-        return (count, istart1.value, iend1.value, jstart1.value,
-    jend1.value, istart2.value, iend2.value, jstart2.value, jend2.value)
+        find_align = _functions["get_align_contact"]
+
+        count = find_align(self.tile1, self.tile2,
+                           self.nxp1, self.nyp1,
+                           self.nxp2, self.nyp2,
+                           self.x1, self.y1,
+                           self.x2, self.y2,
+                           self.periodx, self.periody,
+                           *[ctypes.byref(index) for index in self._indices])
+
+        return (count, *[index.value for index in self._indices])
 
 
     def overlap_contact_call(self):
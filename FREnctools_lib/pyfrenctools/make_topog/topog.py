@@ -0,0 +1,95 @@
+from ctypes import byref, c_int
+import numpy as np
+import numpy.typing as npt
+
+from pyfrenctools.utils.ctypes import CFunctions
+
+
+_libpath = None
+_functions = None
+
+
+def init(libpath: str, functions: CFunctions):
+
+    global _libpath, _functions
+
+    _libpath = libpath
+    _functions = functions
+
+
+def get_boundary_type(grid_file: str, grid_version: int) -> tuple[int, int, int]:
+
+    """
+    Returns cyclic_x, cyclic_y, and is_tripolar of the
+    single tile mosaic grid_file
+    """
+
+    cyclic_x, cyclic_y, is_tripolar = c_int(0), c_int(0), c_int(0)
+
+    _functions["get_boundary_type"](grid_file.encode("utf-8"), grid_version,
+                                    byref(cyclic_x), byref(cyclic_y), byref(is_tripolar))
+
+    return cyclic_x.value, cyclic_y.value, is_tripolar.value
+
+
+def create_realistic_topog(nx_dst: int,
+                           ny_dst: int,
+                           x_dst: npt.NDArray[np.float64],
+                           y_dst: npt.NDArray[np.float64],
+                           vgrid_file: str,
+                           topog_file: str,
+                           topog_field: str,
+                           scale_factor: float,
+                           tripolar_grid: int,
+                           cyclic_x: int,
+                           cyclic_y: int,
+                           fill_first_row: int,
+                           filter_topog: int,
+                           num_filter_pass: int,
+                           smooth_topo_allow_deepening: int,
+                           round_shallow: int,
+                           fill_shallow: int,
+                           deepen_shallow: int,
+                           full_cell: int,
+                           flat_bottom: int,
+                           adjust_topo: int,
+                           fill_isolated_cells: int,
+                           dont_change_landmask: int,
+                           kmt_min: int,
+                           min_thickness: float,
+                           open_very_this_cell: int,
+                           fraction_full_cell: float,
+                           debug: int,
+                           use_great_circle_algorithm: int,
+                           on_grid: int,
+                           x_refine: int,
+                           y_refine: int,
+                           tile_file: str,
+                           rotate_poly: int,
+                           gpu: int) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.int32]]:
+
+    """
+    Returns the depth and the number of vertical levels of the
+    model grid of tile_file remapped from topog_field in topog_file
+    """
+
+    depth = np.zeros((ny_dst//y_refine, nx_dst//x_refine), dtype=np.float64)
+    num_levels = np.zeros((ny_dst//y_refine, nx_dst//x_refine), dtype=np.int32)
+
+    _functions["create_realistic_topog_wrapper"](
+        nx_dst, ny_dst,
+        np.ascontiguousarray(x_dst, dtype=np.float64),
+        np.ascontiguousarray(y_dst, dtype=np.float64),
+        None if vgrid_file is None else vgrid_file.encode("utf-8"),
+        topog_file.encode("utf-8"), topog_field.encode("utf-8"),
+        scale_factor, tripolar_grid, cyclic_x, cyclic_y,
+        fill_first_row, filter_topog, num_filter_pass,
+        smooth_topo_allow_deepening, round_shallow, fill_shallow,
+        deepen_shallow, full_cell, flat_bottom,
+        adjust_topo, fill_isolated_cells, dont_change_landmask,
+        kmt_min, min_thickness, open_very_this_cell,
+        fraction_full_cell, depth, num_levels,
+        debug, use_great_circle_algorithm, on_grid, x_refine, y_refine,
+        tile_file.encode("utf-8"), rotate_poly, gpu)
+
+    return depth, num_levels
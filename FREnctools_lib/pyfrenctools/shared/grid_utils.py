@@ -1,16 +1,18 @@
-from ctypes import POINTER, c_int, CDLL
+from ctypes import c_int
 import numpy as np
 import numpy.typing as npt
 
+from pyfrenctools.utils.ctypes import CFunctions
+
 _libpath = None
-_lib = None
+_functions = None
 
-def init(libpath: str, lib: type[CDLL]):
+def init(libpath: str, functions: CFunctions):
 
-    global _libpath, _lib
+    global _libpath, _functions
 
     _libpath = libpath
-    _lib = lib
+    _functions = functions
 
 
 def get_grid_area(lon: npt.NDArray[np.float64],
@@ -22,13 +24,7 @@ def get_grid_area(lon: npt.NDArray[np.float64],
     on lon and lat
     """
 
-    _get_grid_area = _lib.get_grid_area
-
-    _get_grid_area.argtypes = [POINTER(c_int), #nlon
-                               POINTER(c_int), #nlat
-                               np.ctypeslib.ndpointer(dtype=np.float64), #lon
-                               np.ctypeslib.ndpointer(dtype=np.float64), #lat
-                               np.ctypeslib.ndpointer(dtype=np.float64)] #area
+    _get_grid_area = _functions["get_grid_area"]
 
     nlat, nlon = lon.shape 
     nlat, nlon = nlat-1, nlon-1
@@ -5,10 +5,12 @@ from ctypes import (
     c_double,
     c_float,
     c_int,
+    cdll,
     POINTER
 )
 import numpy as np
 import numpy.typing as npt
+import threading
 from typing import Union
 
 ctypelist = Union[type(c_int),
@@ -95,3 +97,52 @@ def set_array(arg: npt.ArrayLike|None,
 
     arglist.append(arg)
     return arg
+
+
+class CFunctions(dict):
+
+    """
+    Registry of the C functions of a library by name.  The library is
+    loaded and the prototypes, {name: (restype, argtypes)}, are set on
+    the first lookup.  Functions not built into the library are skipped
+    """
+
+    def __init__(self, prototypes: dict):
+        super().__init__()
+        self.prototypes = prototypes
+        self.libpath = None
+        self.lib = None
+        self._lock = threading.Lock()
+
+    def set_libpath(self, libpath: str):
+
+        with self._lock:
+            self.clear()
+            self.libpath = libpath
+            self.lib = None
+
+    def load(self) -> type[CDLL]:
+
+        #the registry is filled before lib is set so that a lookup from
+        #another thread never sees the library loaded but the registry empty
+        with self._lock:
+            if self.lib is None:
+                lib = cdll.LoadLibrary(self.libpath)
+                functions = {}
+                for name, (restype, argtypes) in self.prototypes.items():
+                    if hasattr(lib, name):
+                        function = lib[name]
+                        function.restype = restype
+                        function.argtypes = argtypes
+                        functions[name] = function
+                self.update(functions)
+                self.lib = lib
+
+        return self.lib
+
+    def __missing__(self, name: str):
+
+        self.load()
+        if name in self: return dict.__getitem__(self, name)
+
+        raise KeyError(f"{name} is not in the library {self.libpath}")
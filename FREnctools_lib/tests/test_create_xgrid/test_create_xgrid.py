@@ -29,3 +29,28 @@ def test_create_xgrid_gpu():
 
     assert(results_cpu["nxgrid"]==nlon_src*nlat_src)
     assert(np.all(results_cpu["xgrid_ij1"]==results_cpu["xgrid_ij2"]))
+
+
+def test_create_xgrid_exact_size():
+
+    nlon_src = 180
+    nlat_src = 90
+    refine = 2
+    nlon_tgt = nlon_src * refine
+    nlat_tgt = nlat_src * refine
+
+    lon_src, lat_src = np.meshgrid(np.linspace(0, 360, nlon_src+1), np.linspace(-45, 45, nlat_src+1))
+    lon_tgt, lat_tgt = np.meshgrid(np.linspace(0, 360, nlon_tgt+1), np.linspace(-45, 45, nlat_tgt+1))
+
+    results = pyfrenctools.create_xgrid.get_2dx2d_order1(nlon_src, nlat_src, nlon_tgt, nlat_tgt,
+                                                         np.deg2rad(lon_src), np.deg2rad(lat_src),
+                                                         np.deg2rad(lon_tgt), np.deg2rad(lat_tgt))
+
+    #more cells than the initial C buffer, so the output had to grow
+    nxcells = nlon_tgt * nlat_tgt
+    assert results["nxcells"] == nxcells
+    for key in ["src_i", "src_j", "tgt_i", "tgt_j", "xarea"]:
+        assert results[key].size == nxcells
+
+    assert np.all(results["src_i"] == results["tgt_i"]//refine)
+    assert np.all(results["src_j"] == results["tgt_j"]//refine)
@@ -7,8 +7,11 @@ from pyfrenctools.utils.ctypes import(
     set_c_str,
     set_array
 )
+from concurrent.futures import ThreadPoolExecutor
 import ctypes
 import numpy as np
+import pyfrenctools
+import pytest
 
 def test_ctypes_utils():
 
@@ -43,3 +46,36 @@ def test_ctypes_utils():
     
                        
               
+
+
+def test_cfunctions():
+
+    functions = pyfrenctools.cfrenctools.functions()
+
+    with pytest.raises(KeyError):
+        functions["not_a_function"]
+
+    get_grid_area = functions["get_grid_area"]
+
+    lon, lat = np.meshgrid(np.deg2rad(np.arange(0.0, 5.0)), np.deg2rad(np.arange(-2.0, 3.0)))
+    area = np.zeros(16, dtype=np.float64)
+
+    #the prototype is set once, the arrays are validated against it
+    get_grid_area(ctypes.c_int(4), ctypes.c_int(4), lon, lat, area)
+    assert np.all(area > 0.0)
+
+    with pytest.raises(ctypes.ArgumentError):
+        get_grid_area(ctypes.c_int(4), ctypes.c_int(4), lon.astype(np.float32), lat, area)
+
+
+def test_cfunctions_threaded_first_lookup():
+
+    functions = pyfrenctools.cfrenctools.functions()
+
+    #unload the library so that the threads race on the first lookup
+    functions.set_libpath(pyfrenctools.cfrenctools.libpath())
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        found = list(executor.map(lambda i: functions["get_grid_area"], range(64)))
+
+    assert all(function is found[0] for function in found)
@@ -1,11 +1,39 @@
-from .make_topog.topogobj import TopogObj
-from .shared.gridobj import GridObj
-from .make_hgrid import make_hgrid
-from .make_mosaic import make_mosaic
-from .make_mosaic import coupler_mosaic
-from .make_topog import make_topog
-from .remap import remap
-from .shared.gridtools_utils import check_file_is_there, get_provenance_attrs
-from .shared.gridobj import GridObj
-from .shared.mosaicobj import MosaicObj
-from .shared.xgridobj import XGridObj
+import importlib
+
+#the public names are imported on first access so that importing fmsgridtools,
+#and starting the command line, does not load xarray, pyfms, and pyfrenctools
+_lazy_attrs = {
+    "TopogObj": "fmsgridtools.make_topog.topogobj",
+    "GridObj": "fmsgridtools.shared.gridobj",
+    "MosaicObj": "fmsgridtools.shared.mosaicobj",
+    "XGridObj": "fmsgridtools.shared.xgridobj",
+    "check_file_is_there": "fmsgridtools.shared.gridtools_utils",
+    "get_provenance_attrs": "fmsgridtools.shared.gridtools_utils",
+}
+
+_lazy_modules = {
+    "coupler_mosaic": "fmsgridtools.make_mosaic.coupler_mosaic",
+    "make_hgrid": "fmsgridtools.make_hgrid",
+    "make_mosaic": "fmsgridtools.make_mosaic",
+    "make_topog": "fmsgridtools.make_topog",
+    "remap": "fmsgridtools.remap",
+}
+
+__all__ = list(_lazy_attrs) + list(_lazy_modules)
+
+
+def __getattr__(name: str):
+
+    if name in _lazy_attrs:
+        value = getattr(importlib.import_module(_lazy_attrs[name]), name)
+    elif name in _lazy_modules:
+        value = importlib.import_module(_lazy_modules[name])
+    else:
+        raise AttributeError(f"module {__name__} has no attribute {name}")
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,39 +1,57 @@
+import importlib
+
 import click
-import fmsgridtools
-from fmsgridtools.make_hgrid.make_hgrid import gnomonic
-from fmsgridtools.make_hgrid.make_hgrid import lonlat
+
+
+class LazyGroup(click.Group):
+
+    """
+    click group whose subcommands are given as "module:command" and
+    imported only when they are invoked or their help is shown, so that
+    starting fmsgridtools does not import every subcommand module
+    """
+
+    def __init__(self, *args, lazy_subcommands: dict = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = {} if lazy_subcommands is None else lazy_subcommands
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted(super().list_commands(ctx) + list(self.lazy_subcommands))
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command:
+        if cmd_name in self.lazy_subcommands:
+            module, command = self.lazy_subcommands[cmd_name].split(":")
+            return getattr(importlib.import_module(module), command)
+        return super().get_command(ctx, cmd_name)
+
 
 @click.group()
 def main():
     click.echo("Starting fmsgridtools")
 
-@main.group()
+@main.group(cls=LazyGroup,
+            lazy_subcommands={"conservative-method": "fmsgridtools.remap.remap:conservative_method"})
 def regrid():
     click.echo("Starting remap")
 
-@main.group()
+@main.group(cls=LazyGroup,
+            lazy_subcommands={"realistic-or-basin": "fmsgridtools.make_topog.make_topog:realistic_or_basin"})
 def make_topog():
     click.echo("Starting make_topog")
 
-@main.group()
+@main.group(cls=LazyGroup,
+            lazy_subcommands={"solo": "fmsgridtools.make_mosaic.make_mosaic:solo",
+                              "regional": "fmsgridtools.make_mosaic.make_mosaic:regional",
+                              "quick": "fmsgridtools.make_mosaic.make_mosaic:quick",
+                              "coupler": "fmsgridtools.make_mosaic.make_mosaic:coupler"})
 def make_mosaic():
     click.echo("Starting make_mosaic")
 
-@main.group()
+@main.group(cls=LazyGroup,
+            lazy_subcommands={"gnomonic": "fmsgridtools.make_hgrid.make_hgrid:gnomonic",
+                              "lonlat": "fmsgridtools.make_hgrid.make_hgrid:lonlat"})
 def make_hgrid():
     click.echo("Starting make_hgrid")
 
-make_hgrid.add_command(gnomonic)
-make_hgrid.add_command(lonlat)
-regrid.add_command(fmsgridtools.remap.conservative_method)
-
-make_topog.add_command(fmsgridtools.make_topog.realistic_or_basin)
-
-make_mosaic.add_command(fmsgridtools.make_mosaic.solo)
-make_mosaic.add_command(fmsgridtools.make_mosaic.regional)
-make_mosaic.add_command(fmsgridtools.make_mosaic.quick)
-make_mosaic.add_command(fmsgridtools.make_mosaic.coupler)
-
 if __name__ == "__main__":
     main()
-    
@@ -0,0 +1,5 @@
+from ..shared.lazy import forward_to
+
+__getattr__ = forward_to(__name__, "make_hgrid",
+                         names=["gnomonic", "lonlat"],
+                         submodules=["gnomonic_grid", "hgridobj", "lonlat_grid"])
@@ -25,10 +25,17 @@ def make(
     do_schmidt: bool,
     do_cube_transform: bool,
     verbose: bool,
+    scratch_dir: str = None,
+    nprocs: int = 1,
+    compression: str = None,
+    complevel: int = 4,
 ):
     
     if do_cube_transform and do_schmidt:
         raise RuntimeError("make_hgrid: both --do_cube_transform and --do_schmidt are set")
+
+    if scratch_dir is not None and nprocs > 1:
+        raise RuntimeError("make_hgrid: --scratch_dir cannot be used with --nprocs > 1")
     
     grid_obj = HGridObj()
 
@@ -116,6 +123,8 @@ def make(
         conformal=conformal,
         output_length_angle=output_length_angle,
         verbose=verbose,
+        scratch_dir=scratch_dir,
+        nprocs=nprocs,
     )
 
     if nest_grids == 1 and parent_tile[0] == 0:
@@ -184,4 +193,7 @@ def make(
         out_halo=out_halo,
         output_length_angle=output_length_angle,
         verbose=verbose,
+        nprocs=nprocs,
+        compression=compression,
+        complevel=complevel,
     )
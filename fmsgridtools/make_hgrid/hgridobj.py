@@ -1,10 +1,14 @@
 import sys
 import ctypes
+import tempfile
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 import numpy as np
 from numpy.typing import NDArray
 import xarray as xr
 
-from fmsgridtools.shared.gridtools_utils import get_provenance_attrs
+from fmsgridtools.shared.gridtools_utils import attach_shared_memory, get_provenance_attrs, to_shared_memory
 from fmsgridtools.shared.gridobj import GridObj
 
 def fill_cubic_grid_halo(
@@ -18,43 +22,50 @@ def fill_cubic_grid_halo(
         ioff: int,
         joff: int,
 ):
+    """
+    Fills data, of size (ny+joff+2*halo)*(nx+ioff+2*halo), with the tile's
+    compute domain and the one-point halo from the neighbouring cubed-sphere tiles.
+    Points outside the halo are set to -9999.
+    """
+
     nxp = nx + ioff
     nyp = ny + joff
     nxph = nx + ioff + 2*halo
     nyph = ny + joff + 2*halo
-        
-    for i in range(nxph*nyph):
-        data[i] = -9999.
+    npts = nxp*nyp
+
+    data[:nxph*nyph] = -9999.
+    out = data[:nxph*nyph].reshape((nyph, nxph))
+
+    def tile_data(data_all, itile):
+        return data_all[itile*npts:(itile+1)*npts]
+
+    #reversed positions (nxp-1)*nyp, ..., nyp, 0 of the transposed neighbour edges
+    transposed = np.arange(nxp-1, -1, -1)*nyp
 
     # first copy computing domain data
-    for j in range (1, nyp+1):
-        for i in range(1, nxp+1):
-            data[j*nxph+i] = data1_all[tile*nxp*nyp+(j-1)*nxp+(i-1)]
-                
+    out[1:nyp+1, 1:nxp+1] = tile_data(data1_all, tile).reshape((nyp, nxp))
+
     ntiles = 6
-        
+
     if tile%2 == 1:
         lw = (tile+ntiles-1)%ntiles
         le = (tile+ntiles+2)%ntiles
         ls = (tile+ntiles-2)%ntiles
         ln = (tile+ntiles+1)%ntiles
-        for j in range(1, nyp+1):
-            data[j*nxph] = data1_all[lw*nxp*nyp+(j-1)*nxp+nx-1]       # west halo
-            data[j*nxph+nxp+1] = data2_all[le*nxp*nyp+ioff*nxp+nyp-j] # east halo
-        for i in range(1, nxp+1):
-            data[i] = data2_all[ls*nxp*nyp+(nxp-i)*nyp+(nx-1)]        # south halo
-            data[(nyp+1)*nxph+i] = data1_all[ln*nxp*nyp+joff*nxp+i-1] # north halo
+        out[1:nyp+1, 0] = tile_data(data1_all, lw)[nx-1::nxp][:nyp]                   # west halo
+        out[1:nyp+1, nxp+1] = tile_data(data2_all, le)[ioff*nxp:ioff*nxp+nyp][::-1]   # east halo
+        out[0, 1:nxp+1] = tile_data(data2_all, ls)[transposed+nx-1]                   # south halo
+        out[nyp+1, 1:nxp+1] = tile_data(data1_all, ln)[joff*nxp:joff*nxp+nxp]         # north halo
     else:
         lw = (tile+ntiles-2)%ntiles
         le = (tile+ntiles+1)%ntiles
         ls = (tile+ntiles-1)%ntiles
         ln = (tile+ntiles+2)%ntiles
-        for j in range(1, nyp+1):
-            data[j*nxph] = data2_all[lw*nxp*nyp+(ny-1)*nxp+nyp-j]     # west halo
-            data[j*nxph+nxp+1] = data1_all[le*nxp*nyp+(j-1)*nxp+ioff] # east halo
-        for i in range(1, nxp+1):
-            data[i] = data1_all[ls*nxp*nyp+(ny-1)*nxp+i-1]                # south halo
-            data[(nyp+1)*nxph+i] = data2_all[ln*nxp*nyp+(nxp-i)*nyp+joff] # north halo
+        out[1:nyp+1, 0] = tile_data(data2_all, lw)[(ny-1)*nxp:(ny-1)*nxp+nyp][::-1]   # west halo
+        out[1:nyp+1, nxp+1] = tile_data(data1_all, le)[ioff::nxp][:nyp]               # east halo
+        out[0, 1:nxp+1] = tile_data(data1_all, ls)[(ny-1)*nxp:(ny-1)*nxp+nxp]         # south halo
+        out[nyp+1, 1:nxp+1] = tile_data(data2_all, ln)[transposed+joff]               # north halo
 
 class HGridObj():
     def __init__(self):
@@ -77,6 +88,8 @@ class HGridObj():
         self.iec = None
         self.jsc = None
         self.jec = None
+        self.dataset = None
+        self.shms = None
 
     def make_grid_info(
             self,
@@ -98,8 +111,20 @@ class HGridObj():
             conformal: bool=True,
             output_length_angle: bool=True,
             verbose: bool=False,
+            scratch_dir: str=None,
+            nprocs: int=1,
     ):
-        """Get super grid size"""
+        """
+        Get super grid size.  With scratch_dir, the grid buffers are memory
+        mapped to unlinked files in scratch_dir.  The C generators still fill
+        every tile before any is written, so this bounds the memory only as
+        far as the kernel writes the dirty pages back to scratch_dir; it does
+        not generate the grid a tile at a time.  With nprocs > 1, the grid
+        buffers are allocated in shared memory for the processes of write_out_hgrid.
+        """
+
+        if scratch_dir is not None and nprocs > 1:
+            raise ValueError("make_hgrid: scratch_dir cannot be used with nprocs > 1")
 
         if verbose:
             print(f"[INFO] make_hgrid: Number of tiles (ntiles): {ntiles}", file=sys.stderr)
@@ -188,16 +213,19 @@ class HGridObj():
         if verbose:
             print(f"[INFO] Allocating arrays of size {size1.value} for x, y based on nxp: {self.nxp} nyp: {self.nyp} ntiles: {ntiles}\n", file=sys.stderr)
             print(f"size1 = {size1.value}, size2 = {size2.value}, size3 = {size3.value}, size4 = {size4.value}")
-        self.x = np.empty(shape=size1.value, dtype=np.float64)
-        self.y = np.empty(shape=size1.value, dtype=np.float64)
-        self.area = np.empty(shape=size4.value, dtype=np.float64)
+        if nprocs > 1:
+            self.shms = {}
+            weakref.finalize(self, _unlink_shared_memory, self.shms)
+        self.x = _empty(size1.value, scratch_dir, self.shms, "x")
+        self.y = _empty(size1.value, scratch_dir, self.shms, "y")
+        self.area = _empty(size4.value, scratch_dir, self.shms, "area")
         self.arcx = arcx
         if output_length_angle:
-            self.dx = np.empty(shape=size2.value, dtype=np.float64)
-            self.dy = np.empty(shape=size3.value, dtype=np.float64)
-            self.angle_dx = np.empty(shape=size1.value, dtype=np.float64)
+            self.dx = _empty(size2.value, scratch_dir, self.shms, "dx")
+            self.dy = _empty(size3.value, scratch_dir, self.shms, "dy")
+            self.angle_dx = _empty(size1.value, scratch_dir, self.shms, "angle_dx")
             if not conformal:
-                self.angle_dy = np.empty(shape=size1.value, dtype=np.float64)
+                self.angle_dy = _empty(size1.value, scratch_dir, self.shms, "angle_dy")
         self.isc = 0
         self.iec = self.nx - 1
         self.jsc = 0
@@ -217,267 +245,373 @@ class HGridObj():
             out_halo: int=0,
             output_length_angle: bool=True,
             verbose: bool=False,
+            nprocs: int=1,
+            compression: str=None,
+            complevel: int=4,
     ):
-        
-        var_dict={}
-        pos_c = 0
-        pos_e = 0
-        pos_t = 0
-        pos_n = 0
 
+        """
+        Writes each tile, and each nest, to its own file.  With nprocs > 1,
+        the files are written concurrently by a pool of nprocs processes
+        from views into the grid buffers.  The processes attach to the buffers
+        that make_grid_info allocated in shared memory, buffers allocated
+        otherwise are copied to shared memory first.  Buffers memory mapped
+        to scratch_dir are written serially.  compression, e.g. "zlib",
+        and complevel are applied to the 2-D variables only, the tile and
+        arcx strings are not compressed.
+        """
+
+        settings = dict(
+            grid_type=grid_type,
+            grid_name=grid_name,
+            ntiles=ntiles,
+            north_pole_tile=north_pole_tile,
+            north_pole_arcx=north_pole_arcx,
+            projection=projection,
+            geometry=geometry,
+            discretization=discretization,
+            conformal=conformal,
+            out_halo=out_halo,
+            output_length_angle=output_length_angle,
+            verbose=verbose,
+        )
+
+        encoding = {}
+        if compression is not None:
+            encoding = dict(compression=compression, complevel=complevel, shuffle=True)
+
+        offsets = self.get_tile_offsets(ntiles)
+
+        arrays = {}
+        for key in ("x", "y", "dx", "dy", "area", "angle_dx", "angle_dy"):
+            if getattr(self, key) is not None: arrays[key] = getattr(self, key)
+
+        if nprocs == 1 or ntiles == 1 or any(isinstance(array, np.memmap) for array in arrays.values()):
+            for n in range(ntiles):
+                self.write_tile(n, offsets[n], encoding, **settings)
+            return
+
+        if self.shms is not None and set(arrays) <= set(self.shms):
+            shms = []
+            descriptors = {key: (self.shms[key].name, array.shape, array.dtype.str)
+                           for key, array in arrays.items()}
+        else:
+            shms, descriptors = to_shared_memory(arrays)
+
+        try:
+            with ProcessPoolExecutor(max_workers=nprocs,
+                                     initializer=_init_worker,
+                                     initargs=(descriptors, self.nxl, self.nyl, self.arcx)) as pool:
+                futures = [pool.submit(_write_tile_worker, n, offsets[n], encoding, settings)
+                           for n in range(ntiles)]
+                outfiles = [future.result() for future in futures]
+        finally:
+            for shm in shms:
+                shm.close()
+                shm.unlink()
+
+        #keep the last tile for make_gridobj as in the serial write, its
+        #variables are read from the file only when they are accessed
+        self.dataset = xr.open_dataset(outfiles[-1])
+
+    def get_tile_offsets(self, ntiles: int) -> list[tuple[int, int, int, int]]:
+
+        """
+        Returns the offsets (pos_c, pos_e, pos_n, pos_t) of each tile in the
+        flat corner, east edge, north edge, and cell center buffers
+        """
+
+        offsets = []
+        pos_c, pos_e, pos_n, pos_t = 0, 0, 0, 0
         for n in range(ntiles):
-            self.tile = "tile" + str(n+1)
-            if ntiles > 1:
-                outfile = grid_name + ".tile" + str(n+1) + ".nc"
-            else:
-                outfile = grid_name + ".nc"
+            offsets.append((pos_c, pos_e, pos_n, pos_t))
+            nx = int(self.nxl[n])
+            ny = int(self.nyl[n])
+            pos_c += (nx+1)*(ny+1)
+            pos_e += (nx+1)*ny
+            pos_n += nx*(ny+1)
+            pos_t += nx*ny
 
-            if verbose:
-                print(f"Writing out {outfile}\n", file=sys.stderr)
+        return offsets
 
-            tile = xr.DataArray(
-                [self.tile],
+    def write_tile(self, n: int, offset: tuple[int, int, int, int], encoding: dict = None, **settings) -> str:
+
+        """
+        Writes tile n, whose data start at offset in the flat buffers,
+        and returns the output file
+        """
+
+        outfile, dataset = self.get_tile_dataset(n, offset, **settings)
+
+        if settings.get("verbose"):
+            print(f"About to close {outfile}")
+
+        self.dataset = dataset
+        dataset.to_netcdf(outfile, encoding={key: encoding for key in dataset.data_vars
+                                             if dataset[key].ndim == 2} if encoding else None)
+
+        return outfile
+
+    def get_tile_dataset(
+            self,
+            n: int,
+            offset: tuple[int, int, int, int],
+            grid_type = "regular_lonlat_grid",
+            grid_name: str="horizontal_grid",
+            ntiles: int=1,
+            north_pole_tile: str="0.0 90.0",
+            north_pole_arcx: str="0.0 90.0",
+            projection: str=None,
+            geometry: str="spherical",
+            discretization: str="logically_rectangular",
+            conformal: bool=True,
+            out_halo: int=0,
+            output_length_angle: bool=True,
+            verbose: bool=False,
+    ) -> tuple[str, xr.Dataset]:
+
+        """
+        Returns the output file and the dataset of tile n.  The dataset
+        holds views into the flat buffers when there is no output halo.
+        """
+
+        pos_c, pos_e, pos_n, pos_t = offset
+        var_dict = {}
+        self.tile = "tile" + str(n+1)
+        if ntiles > 1:
+            outfile = grid_name + ".tile" + str(n+1) + ".nc"
+        else:
+            outfile = grid_name + ".nc"
+
+        if verbose:
+            print(f"Writing out {outfile}\n", file=sys.stderr)
+
+        tile = xr.DataArray(
+            [self.tile],
+            attrs=dict(
+                standard_name="grid_tile_spec",
+                geometry=geometry,
+                discretization=discretization,
+                conformal=f"{conformal}",
+            )
+        )
+        if north_pole_tile is None:
+            tile = tile.assign_attrs(projection=f"{projection}")
+        if projection is None:
+            tile = tile.assign_attrs(north_pole_tile=north_pole_tile)
+        var_dict['tile'] = tile
+
+        if north_pole_arcx is None:
+            arcx = xr.DataArray(
+                [self.arcx],
                 attrs=dict(
-                    standard_name="grid_tile_spec",
-                    geometry=geometry,
-                    discretization=discretization,
-                    conformal=f"{conformal}",
+                    standard_name="grid_edge_x_arc_type",
+                )
+            )
+        else:
+            arcx = xr.DataArray(
+                [self.arcx],
+                attrs=dict(
+                    standard_name="grid_edge_x_arc_type",
+                    north_pole=north_pole_arcx,
                 )
             )
-            if north_pole_tile is None:
-                tile = tile.assign_attrs(projection=f"{projection}")
-            if projection is None:
-                tile = tile.assign_attrs(north_pole_tile=north_pole_tile)
-            var_dict['tile'] = tile
 
-            if north_pole_arcx is None:
-                arcx = xr.DataArray(
-                    [self.arcx],
-                    attrs=dict(
-                        standard_name="grid_edge_x_arc_type",
-                    )
+        var_dict['arcx'] = arcx
+    
+        """define dimension"""
+        nx = self.nxl[n]
+        ny = self.nyl[n]
+        if verbose:
+            print(f"[INFO] Outputting arrays of size nx: {nx} and ny: {ny} for tile: {n}")
+        nxp = nx + 1
+        nyp = ny + 1
+
+        if out_halo == 0:
+            if verbose:
+                print(f"[INFO] START NC XARRAY write out_halo = {out_halo} tile number = {n} offset = pos_c: {pos_c}", file=sys.stderr)
+                print(f"[INFO] XARRAY: n: {n} x[0]: {self.x[pos_c]} x[1]: {self.x[pos_c+1]} x[2]: {self.x[pos_c+2]} x[3]: {self.x[pos_c+3]} x[4]: {self.x[pos_c+4]} x[5]: {self.x[pos_c+5]} x[10]: {self.x[pos_c+10]}", file=sys.stderr)
+                if n > 0:
+                    print(f"[INFO] XARRAY: n: {n} x[0]: {self.x[pos_c]} x[-1]: {self.x[pos_c-1]} x[-2]: {self.x[pos_c-2]} x[-3]: {self.x[pos_c-3]} x[-4]: {self.x[pos_c-4]} x[-5]: {self.x[pos_c-5]} x[-10]: {self.x[pos_c-10]}", file=sys.stderr)
+            x = xr.DataArray(
+                data=self.x[pos_c:pos_c+nyp*nxp].reshape((nyp,nxp)),
+                dims=["nyp", "nxp"],
+                attrs=dict(
+                    units="degree_east", 
+                    standard_name="geographic_longitude",
                 )
-            else:
-                arcx = xr.DataArray(
-                    [self.arcx],
-                    attrs=dict(
-                        standard_name="grid_edge_x_arc_type",
-                        north_pole=north_pole_arcx,
-                    )
+            )
+            var_dict['x'] = x
+
+            y = xr.DataArray(
+                data=self.y[pos_c:pos_c+nyp*nxp].reshape((nyp, nxp)),
+                dims=["nyp", "nxp"],
+                attrs=dict(
+                    units="degree_north", 
+                    standard_name="geographic_latitude",
                 )
+            )
+            var_dict['y'] = y
 
-            var_dict['arcx'] = arcx
-        
-            """define dimension"""
-            nx = self.nxl[n]
-            ny = self.nyl[n]
-            if verbose:
-                print(f"[INFO] Outputting arrays of size nx: {nx} and ny: {ny} for tile: {n}")
-            nxp = nx + 1
-            nyp = ny + 1
+            area = xr.DataArray(
+                data=self.area[pos_t:pos_t+ny*nx].reshape((ny, nx)),
+                dims=["ny", "nx"],
+                attrs=dict(
+                    units="m2",
+                    standard_name="grid_cell_area",
+                )
+            )
+            var_dict['area'] = area
 
-            if out_halo == 0:
-                if verbose:
-                    print(f"[INFO] START NC XARRAY write out_halo = {out_halo} tile number = {n} offset = pos_c: {pos_c}", file=sys.stderr)
-                    print(f"[INFO] XARRAY: n: {n} x[0]: {self.x[pos_c]} x[1]: {self.x[pos_c+1]} x[2]: {self.x[pos_c+2]} x[3]: {self.x[pos_c+3]} x[4]: {self.x[pos_c+4]} x[5]: {self.x[pos_c+5]} x[10]: {self.x[pos_c+10]}", file=sys.stderr)
-                    if n > 0:
-                        print(f"[INFO] XARRAY: n: {n} x[0]: {self.x[pos_c]} x[-1]: {self.x[pos_c-1]} x[-2]: {self.x[pos_c-2]} x[-3]: {self.x[pos_c-3]} x[-4]: {self.x[pos_c-4]} x[-5]: {self.x[pos_c-5]} x[-10]: {self.x[pos_c-10]}", file=sys.stderr)
-                x = xr.DataArray(
-                    data=self.x[pos_c:pos_c+nyp*nxp].reshape((nyp,nxp)),
-                    dims=["nyp", "nxp"],
+            if output_length_angle:
+                dx = xr.DataArray(
+                    data=self.dx[pos_n:pos_n+nyp*nx].reshape((nyp, nx)),
+                    dims=["nyp", "nx"],
                     attrs=dict(
-                        units="degree_east", 
-                        standard_name="geographic_longitude",
+                        units="meters", 
+                        standard_name="grid_edge_x_distance",
                     )
                 )
-                var_dict['x'] = x
+                var_dict['dx'] = dx
 
-                y = xr.DataArray(
-                    data=self.y[pos_c:pos_c+nyp*nxp].reshape((nyp, nxp)),
-                    dims=["nyp", "nxp"],
+                dy = xr.DataArray(
+                    data=self.dy[pos_e:pos_e+ny*nxp].reshape((ny, nxp)),
+                    dims=["ny", "nxp"],
                     attrs=dict(
-                        units="degree_north", 
-                        standard_name="geographic_latitude",
+                        units="meters", 
+                        standard_name="grid_edge_y_distance",
                     )
                 )
-                var_dict['y'] = y
+                var_dict['dy'] = dy
 
-                area = xr.DataArray(
-                    data=self.area[pos_t:pos_t+ny*nx].reshape((ny, nx)),
-                    dims=["ny", "nx"],
+                angle_dx = xr.DataArray(
+                    data=self.angle_dx[pos_c:pos_c+nyp*nxp].reshape((nyp, nxp)),
+                    dims=["nyp", "nxp"],
                     attrs=dict(
-                        units="m2",
-                        standard_name="grid_cell_area",
+                        units="degrees_east",
+                        standard_name="grid_vertex_x_angle_WRT_geographic_east",
                     )
                 )
-                var_dict['area'] = area
+                var_dict['angle_dx'] = angle_dx
 
-                if output_length_angle:
-                    dx = xr.DataArray(
-                        data=self.dx[pos_n:pos_n+nyp*nx].reshape((nyp, nx)),
-                        dims=["nyp", "nx"],
+                if not conformal:
+                    angle_dy = xr.DataArray(
+                        data=self.angle_dy[pos_c:pos_c+nyp*nxp].reshape((nyp, nxp)),
+                        dims=["nyp", "nxp"],
                         attrs=dict(
-                            units="meters", 
-                            standard_name="grid_edge_x_distance",
+                            units="degrees_north",
+                            standard_name="grid_vertex_y_angle_WRT_geographic_north",
                         )
                     )
-                    var_dict['dx'] = dx
+                    var_dict['angle_dy'] = angle_dy
+        else:
+            if grid_type != "gnomonic_ed":
+                raise RuntimeError("make_hgrid: out_halo > 0, only working for grid_type = 'gnomonic_ed'")
 
-                    dy = xr.DataArray(
-                        data=self.dy[pos_e:pos_e+ny*nxp].reshape((ny, nxp)),
-                        dims=["ny", "nxp"],
-                        attrs=dict(
-                            units="meters", 
-                            standard_name="grid_edge_y_distance",
-                        )
-                    )
-                    var_dict['dy'] = dy
+            if verbose:
+                print(f"[INFO] INDEX NC write with halo tile number = n: {n}", file=sys.stderr)
 
-                    angle_dx = xr.DataArray(
-                        data=self.angle_dx[pos_c:pos_c+nyp*nxp].reshape((nyp, nxp)),
-                        dims=["nyp", "nxp"],
-                        attrs=dict(
-                            units="degrees_east",
-                            standard_name="grid_vertex_x_angle_WRT_geographic_east",
-                        )
-                    )
-                    var_dict['angle_dx'] = angle_dx
-
-                    if not conformal:
-                        angle_dy = xr.DataArray(
-                            data=self.angle_dy[pos_c:pos_c+nyp*nxp].reshape((nyp, nxp)),
-                            dims=["nyp", "nxp"],
-                            attrs=dict(
-                                units="degrees_north",
-                                standard_name="grid_vertex_y_angle_WRT_geographic_north",
-                            )
-                        )
-                        var_dict['angle_dy'] = angle_dy
-            else:
-                if grid_type is not "gnomonic_ed":
-                    raise RuntimeError("make_hgrid: out_halo > 0, only working for grid_type = 'gnomonic_ed'")
+            tmp_x = np.zeros(shape=(nxp+2*out_halo)*(nyp+2*out_halo), dtype=np.float64)
+            fill_cubic_grid_halo(nx, ny, out_halo, tmp_x, self.x, self.x, n, 1, 1)
+            x = xr.DataArray(
+                data=tmp_x.reshape((nyp+2*out_halo,nxp+2*out_halo)),
+                dims=["nyp", "nxp"],
+                attrs=dict(
+                    units="degree_east", 
+                    standard_name="geographic_longitude",
+                    _FillValue=-9999.,
+                )
+            )
+            var_dict['x'] = x
 
-                if verbose:
-                    print(f"[INFO] INDEX NC write with halo tile number = n: {n}", file=sys.stderr)
+            tmp_y = np.zeros(shape=(nxp+2*out_halo)*(nyp+2*out_halo), dtype=np.float64)
+            fill_cubic_grid_halo(nx, ny, out_halo, tmp_y, self.y, self.y, n, 1, 1)
+            y = xr.DataArray(
+                data=tmp_y.reshape((nyp+2*out_halo, nxp+2*out_halo)),
+                dims=["nyp", "nxp"],
+                attrs=dict(
+                    units="degree_north", 
+                    standard_name="geographic_latitude",
+                    _FillValue = -9999.,
+                )
+            )
+            var_dict['y'] = y
 
-                tmp_x = np.zeros(shape=(nxp+2*out_halo)*(nyp+2*out_halo), dtype=np.float64)
-                fill_cubic_grid_halo(nx, ny, out_halo, tmp_x, self.x, self.x, n, 1, 1)
-                x = xr.DataArray(
-                    data=tmp_x.reshape((nyp+2*out_halo,nxp+2*out_halo)),
-                    dims=["nyp", "nxp"],
+            tmp_area = np.zeros(shape=(nx+2*out_halo)*(ny+2*out_halo), dtype=np.float64)
+            fill_cubic_grid_halo(nx, ny, out_halo, tmp_area, self.area, self.area, n, 0, 0)
+            area = xr.DataArray(
+                data=tmp_area.reshape((ny+2*out_halo, nx+2*out_halo)),
+                dims=["ny", "nx"],
+                attrs=dict(
+                    units="m2",
+                    standard_name="grid_cell_area",
+                    _FillValue=-9999.,
+                )
+            )
+            var_dict['area'] = area
+
+            if output_length_angle:
+                tmp_dx = np.zeros(shape=(nx+2*out_halo)*(nyp+2*out_halo), dtype=np.float64)
+                fill_cubic_grid_halo(nx, ny, out_halo, tmp_dx, self.dx, self.dy, n, 0, 1)
+                dx = xr.DataArray(
+                    data=tmp_dx.reshape((nyp+2*out_halo, nx+2*out_halo)),
+                    dims=["nyp", "nx"],
                     attrs=dict(
-                        units="degree_east", 
-                        standard_name="geographic_longitude",
+                        units="meters", 
+                        standard_name="grid_edge_x_distance",
                         _FillValue=-9999.,
                     )
                 )
-                var_dict['x'] = x
+                var_dict['dx'] = dx
 
-                tmp_y = np.zeros(shape=(nxp+2*out_halo)*(nyp+2*out_halo), dtype=np.float64)
-                fill_cubic_grid_halo(nx, ny, out_halo, tmp_y, self.y, self.y, n, 1, 1)
-                y = xr.DataArray(
-                    data=tmp_y.reshape((nyp+2*out_halo, nxp+2*out_halo)),
-                    dims=["nyp", "nxp"],
+                tmp_dy = np.zeros(shape=(nxp+2*out_halo)*(ny+2*out_halo), dtype=np.float64)
+                fill_cubic_grid_halo(nx, ny, out_halo, tmp_dy, self.dy, self.dx, n, 1, 0)
+                dy = xr.DataArray(
+                    data=tmp_dy.reshape((ny+2*out_halo, nxp+2*out_halo)),
+                    dims=["ny", "nxp"],
                     attrs=dict(
-                        units="degree_north", 
-                        standard_name="geographic_latitude",
-                        _FillValue = -9999.,
+                        units="meters", 
+                        standard_name="grid_edge_y_distance",
+                        _FillValue=-9999.,
                     )
                 )
-                var_dict['y'] = y
+                var_dict['dy'] = dy
 
-                tmp_area = np.zeros(shape=(nx+2*out_halo)*(ny+2*out_halo), dtype=np.float64)
-                fill_cubic_grid_halo(nx, ny, out_halo, tmp_area, self.area, self.area, n, 0, 0)
-                area = xr.DataArray(
-                    data=tmp_area.reshape((ny+2*out_halo, nx+2*out_halo)),
-                    dims=["ny", "nx"],
+                tmp_adx = np.zeros(shape=(nxp+2*out_halo)*(nyp+2*out_halo), dtype=np.float64)
+                fill_cubic_grid_halo(nx, ny, out_halo, tmp_adx, self.angle_dx, self.angle_dx, n, 1, 1)
+                angle_dx = xr.DataArray(
+                    data=tmp_adx.reshape((nyp+2*out_halo, nxp+2*out_halo)),
+                    dims=["nyp", "nxp"],
                     attrs=dict(
-                        units="m2",
-                        standard_name="grid_cell_area",
+                        units="degrees_east",
+                        standard_name="grid_vertex_x_angle_WRT_geographic_east",
                         _FillValue=-9999.,
                     )
                 )
-                var_dict['area'] = area
-
-                if output_length_angle:
-                    tmp_dx = np.zeros(shape=(nx+2*out_halo)*(nyp+2*out_halo), dtype=np.float64)
-                    fill_cubic_grid_halo(nx, ny, out_halo, tmp_dx, self.dx, self.dy, n, 0, 1)
-                    dx = xr.DataArray(
-                        data=tmp_dx.reshape((nyp+2*out_halo, nx+2*out_halo)),
-                        dims=["nyp", "nx"],
-                        attrs=dict(
-                            units="meters", 
-                            standard_name="grid_edge_x_distance",
-                            _FillValue=-9999.,
-                        )
-                    )
-                    var_dict['dx'] = dx
-
-                    tmp_dy = np.zeros(shape=(nxp+2*out_halo)*(ny+2*out_halo), dtype=np.float64)
-                    fill_cubic_grid_halo(nx, ny, out_halo, tmp_dy, self.dy, self.dx, n, 1, 0)
-                    dy = xr.DataArray(
-                        data=tmp_dy.reshape((ny+2*out_halo, nxp+2*out_halo)),
-                        dims=["ny", "nxp"],
-                        attrs=dict(
-                            units="meters", 
-                            standard_name="grid_edge_y_distance",
-                            _FillValue=-9999.,
-                        )
-                    )
-                    var_dict['dy'] = dy
+                var_dict['angle_dx'] = angle_dx
 
-                    tmp_adx = np.zeros(shape=(nxp+2*out_halo)*(nyp+2*out_halo), dtype=np.float64)
-                    fill_cubic_grid_halo(nx, ny, out_halo, tmp_adx, self.angle_dx, self.angle_dx, n, 1, 1)
-                    angle_dx = xr.DataArray(
-                        data=tmp_adx.reshape((nyp+2*out_halo, nxp+2*out_halo)),
+                if not conformal:
+                    tmp_ady = np.zeros(shape=(nxp+2*out_halo)*(nyp+2*out_halo), dtype=np.float64)
+                    fill_cubic_grid_halo(nx, ny, out_halo, tmp_ady, self.angle_dy, self.angle_dy, n, 1, 1)
+                    angle_dy = xr.DataArray(
+                        data=tmp_ady.reshape((nyp+2*out_halo, nxp+2*out_halo)),
                         dims=["nyp", "nxp"],
                         attrs=dict(
-                            units="degrees_east",
-                            standard_name="grid_vertex_x_angle_WRT_geographic_east",
+                            units="degrees_north",
+                            standard_name="grid_vertex_y_angle_WRT_geographic_north",
                             _FillValue=-9999.,
                         )
                     )
-                    var_dict['angle_dx'] = angle_dx
-
-                    if not conformal:
-                        tmp_ady = np.zeros(shape=(nxp+2*out_halo)*(nyp+2*out_halo), dtype=np.float64)
-                        fill_cubic_grid_halo(nx, ny, out_halo, tmp_ady, self.angle_dy, self.angle_dy, n, 1, 1)
-                        angle_dy = xr.DataArray(
-                            data=tmp_ady.reshape((nyp+2*out_halo, nxp+2*out_halo)),
-                            dims=["nyp", "nxp"],
-                            attrs=dict(
-                                units="degrees_north",
-                                standard_name="grid_vertex_y_angle_WRT_geographic_north",
-                                _FillValue=-9999.,
-                            )
-                        )
-                        var_dict['angle_dy'] = angle_dy
+                    var_dict['angle_dy'] = angle_dy
 
-            nx = self.nxl[n]
-            ny = self.nyl[n]
-            nxp = nx + 1
-            nyp = ny + 1
-
-            if verbose:
-                print(f"[INFO] INDEX Before increment n: {n} pos_c {pos_c} nxp {nxp} nyp {nyp} nxp*nyp {nxp*nyp}\n", file=sys.stderr)
-            pos_c += nxp*nyp
-            if verbose:
-                print(f"[INFO] INDEX After increment n: {n} pos_c {pos_c}\n", file=sys.stderr)
-            pos_e += nxp*ny
-            pos_n += nx*nyp
-            pos_t += nx*ny
+        prov_attrs = get_provenance_attrs(great_circle_algorithm=True)
 
-            if verbose:
-                print(f"About to close {outfile}")
+        dataset = xr.Dataset(
+            data_vars=var_dict
+        )
+        dataset.attrs = prov_attrs
 
-            prov_attrs = get_provenance_attrs(great_circle_algorithm=True)   
-
-            dataset = xr.Dataset(
-                data_vars=var_dict
-            )
-            dataset.attrs = prov_attrs
-            self.dataset = dataset
-            dataset.to_netcdf(outfile)
+        return outfile, dataset
 
     def make_gridobj(self) -> "GridObj":
         var_dict = {}
@@ -541,3 +675,63 @@ class HGridObj():
         return GridObj(dataset=dataset)
 
 
+def _empty(size: int, scratch_dir: str = None, shms: dict = None, key: str = None) -> NDArray[np.float64]:
+
+    """
+    Returns an uninitialized float64 buffer of length size, memory
+    mapped to an unlinked file in scratch_dir if scratch_dir is given,
+    or in a new shared memory block stored as shms[key] if shms is given
+    """
+
+    if shms is not None:
+        shms[key] = shared_memory.SharedMemory(create=True, size=max(size, 1)*np.dtype(np.float64).itemsize)
+        return np.ndarray(shape=size, dtype=np.float64, buffer=shms[key].buf)
+
+    if scratch_dir is None:
+        return np.empty(shape=size, dtype=np.float64)
+
+    with tempfile.TemporaryFile(dir=scratch_dir) as scratch:
+        return np.memmap(scratch, dtype=np.float64, mode="w+", shape=(max(size, 1),))[:size]
+
+
+def _unlink_shared_memory(shms: dict):
+
+    """
+    Closes and removes the shared memory blocks of the grid buffers once the grid is released
+    """
+
+    for shm in shms.values():
+        try:
+            shm.close()
+        except BufferError:
+            #arrays that view the block are still alive, the mapping
+            #is closed when the last of them is released
+            pass
+        shm.unlink()
+
+
+_worker_shms = []
+_worker_hgrid = None
+
+def _init_worker(descriptors: dict, nxl: NDArray, nyl: NDArray, arcx: str):
+
+    """
+    Attaches the worker process to the grid buffers in shared memory
+    """
+
+    global _worker_hgrid
+
+    shms, arrays = attach_shared_memory(descriptors)
+    _worker_shms.extend(shms)
+
+    _worker_hgrid = HGridObj()
+    for key, array in arrays.items():
+        setattr(_worker_hgrid, key, array)
+    _worker_hgrid.nxl = nxl
+    _worker_hgrid.nyl = nyl
+    _worker_hgrid.arcx = arcx
+
+
+def _write_tile_worker(n: int, offset: tuple[int, int, int, int], encoding: dict, settings: dict) -> str:
+
+    return _worker_hgrid.write_tile(n, offset, encoding, **settings)
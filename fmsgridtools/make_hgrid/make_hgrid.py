@@ -1,7 +1,6 @@
 import click
 
-import fmsgridtools.make_hgrid.lonlat_grid as lonlat_grid
-import fmsgridtools.make_hgrid.gnomonic_grid as gnomonic_grid
+# the grid generators are imported in the commands to keep the CLI startup fast
 
 
 @click.command()
@@ -72,6 +71,8 @@ def lonlat(
     grid_name: str,
     verbose: bool,
 ):
+    import fmsgridtools.make_hgrid.lonlat_grid as lonlat_grid
+
     lonlat_grid.make(
         nlon=nlon,
         nlat=nlat,
@@ -225,6 +226,35 @@ def lonlat(
     be set: --stretch_factor, --target_lon, and --target_lat.
     """,
 )
+@click.option(
+    "--scratch_dir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="""
+    Back the grid buffers with temporary files in this directory instead
+    of memory. Every tile is still generated before any is written, so
+    the resident memory depends on the kernel writing the buffers back
+    to this directory. Cannot be used with --nprocs > 1.
+    """,
+)
+@click.option(
+    "--nprocs",
+    type=int,
+    default=1,
+    help="Number of processes writing the tile and nest files concurrently.",
+)
+@click.option(
+    "--compression",
+    type=str,
+    default=None,
+    help="Compression of the output variables, e.g. 'zlib'. Default is no compression.",
+)
+@click.option(
+    "--complevel",
+    type=int,
+    default=4,
+    help="Compression level used with --compression. Default value is 4.",
+)
 @click.option(
     "--verbose",
     is_flag=True,
@@ -250,8 +280,14 @@ def gnomonic(
     output_length_angle: bool,
     do_schmidt: bool,
     do_cube_transform: bool,
+    scratch_dir: str,
+    nprocs: int,
+    compression: str,
+    complevel: int,
     verbose: bool
 ):
+    import fmsgridtools.make_hgrid.gnomonic_grid as gnomonic_grid
+
     gnomonic_grid.make(
         nlon=nlon,
         shift_fac=shift_fac,
@@ -272,5 +308,9 @@ def gnomonic(
         output_length_angle=output_length_angle,
         do_schmidt=do_schmidt,
         do_cube_transform=do_cube_transform,
+        scratch_dir=scratch_dir,
+        nprocs=nprocs,
+        compression=compression,
+        complevel=complevel,
         verbose=verbose,
     )
@@ -1 +1,5 @@
+from ..shared.lazy import forward_to
 
+__getattr__ = forward_to(__name__, "make_mosaic",
+                         names=["solo", "regional", "quick", "coupler"],
+                         submodules=["coupler_mosaic", "regional_mosaic", "solo_mosaic"])
@@ -82,6 +82,9 @@ def get_ocn_mask(ocn_mosaic: type(MosaicObj), topog_file: dict() = None):
 
 def write_ocn_mask(ocn_mosaic, atmxocn):
 
+    ocn_shape = {ocntile: (ocn_mosaic.grid[ocntile].ny, ocn_mosaic.grid[ocntile].nx) for ocntile in atmxocn.datadict}
+    _, ocn_x_areas = atmxocn.sum_xarea(tgt_shape=ocn_shape, src=False)
+
     for ocntile in atmxocn.datadict:
         
         ocn_nlon, ocn_nlat = ocn_mosaic.grid[ocntile].nx, ocn_mosaic.grid[ocntile].ny
@@ -89,15 +92,7 @@ def write_ocn_mask(ocn_mosaic, atmxocn):
         ocn_area = pyfrenctools.grid_utils.get_grid_area(ocn_mosaic.grid[ocntile].x,
                                                          ocn_mosaic.grid[ocntile].y).reshape(ocn_nlat, ocn_nlon)
 
-        ocn_x_area = np.zeros((ocn_nlat,ocn_nlon), dtype=np.float64)
-        
-        for atmtile in atmxocn.datadict[ocntile]:
-
-            xgrid = atmxocn.datadict[ocntile][atmtile]
-            nxcells = xgrid["nxcells"]
-
-            i, j = xgrid["tgt_i"], xgrid["tgt_j"]
-            for ix in range(nxcells): ocn_x_area[j[ix]][i[ix]] += xgrid["xarea"][ix]
+        ocn_x_area = ocn_x_areas[ocntile]
 
         mask = xr.Dataset()
         mask["mask"] = xr.DataArray(ocn_x_area/ocn_area,
@@ -115,12 +110,7 @@ def write_ocn_mask(ocn_mosaic, atmxocn):
         mask.to_netcdf("ocean_mask.nc")
 
         
-def write_lnd_mask(atm_area, atmxlnd, itile):
-
-    #get mask
-    i, j, xarea = atmxlnd["src_i"], atmxlnd["src_j"], atmxlnd["xarea"]
-    lnd_x_area = np.zeros(atm_area.shape, dtype=np.float64)
-    for ix in range(atmxlnd["nxcells"]): lnd_x_area[j[ix]][i[ix]] += xarea[ix]
+def write_lnd_mask(atm_area, lnd_x_area, itile):
 
     mask = xr.Dataset()
     
@@ -144,84 +134,94 @@ def write_lnd_mask(atm_area, atmxlnd, itile):
         
 
 def get_atmxlnd(atmxocn_landpart: type[XGridObj], atm_mosaic: type[MosaicObj] = None, atm_area = None):
+
+    """
+    Returns the atm x lnd exchange grid with one cell per atm cell that overlaps land.
+    The land exchange grid area of each atm cell is summed over every ocean tile of
+    atmxocn_landpart.  Previously only the cells of the last ocean tile were kept, which
+    only gave the full land area of an atm cell for ocean mosaics with one tile.
+    """
+
+    atmxlnd = {}
     
-    for otile in atmxocn_landpart.datadict:
+    for atmtile in atm_mosaic.grid:
 
-        atmxlnd = {}
+        pairs = [atmxocn_landpart.datadict[otile][atmtile] for otile in atmxocn_landpart.datadict
+                 if atmtile in atmxocn_landpart.datadict[otile]]
+        if not pairs: continue
 
-        for atmtile in atmxocn_landpart.datadict[otile]:
+        #get atm area
+        nx, ny = atm_mosaic.grid[atmtile].nx, atm_mosaic.grid[atmtile].ny
+        atm_area = pyfrenctools.grid_utils.get_grid_area(atm_mosaic.grid[atmtile].x,
+                                                         atm_mosaic.grid[atmtile].y).reshape(ny, nx)
 
-            atmxlnd[atmtile] = {}
-            datadict = atmxocn_landpart.datadict[otile][atmtile]
+        src_i = np.concatenate([datadict["src_i"] for datadict in pairs])
+        src_j = np.concatenate([datadict["src_j"] for datadict in pairs])
+        xarea = np.concatenate([datadict["xarea"] for datadict in pairs])
 
-            #get atm area
-            nx, ny = atm_mosaic.grid[atmtile].nx, atm_mosaic.grid[atmtile].ny
-            atm_area = pyfrenctools.grid_utils.get_grid_area(atm_mosaic.grid[atmtile].x,
-                                                             atm_mosaic.grid[atmtile].y).reshape(ny, nx)
-            i_before, j_before = -99, -99
-            atm_i, atm_j, xarea = [], [], []
+        #drop negligible cells and sum the land exchange grid area in each atm cell
+        keep = xarea/atm_area[src_j, src_i] > np.float64(1.e-6)
+        index = src_j[keep]*nx + src_i[keep]
+        counts = np.bincount(index, minlength=nx*ny)
+        sums = np.bincount(index, weights=xarea[keep], minlength=nx*ny)
 
-            for ij in range(datadict["nxcells"]):
-            
-                this_i, this_j, this_xarea = datadict["src_i"][ij], datadict["src_j"][ij], datadict["xarea"][ij]
-                this_atm_area = atm_area[this_j][this_i]
-
-                if this_xarea/this_atm_area > np.float64(1.e-6):  
-                    if this_i == i_before and this_j == j_before:                    
-                        xarea[-1] += this_xarea
-                    else:
-                        i_before, j_before = this_i, this_j
-                        xarea.append(this_xarea)
-                        atm_i.append(this_i)
-                        atm_j.append(this_j)
-
-            nxcells = len(atm_i)
-            atmxlnd[atmtile] = {atmtile: dict(nxcells = len(atm_i),
-                                              src_i = np.array(atm_i),
-                                              src_j = np.array(atm_j),
-                                              tgt_i = np.array(atm_i),
-                                              tgt_j = np.array(atm_j),
-                                              xarea = np.array(xarea, dtype=np.float64))
-            }
-
-            write_lnd_mask(atm_area, atmxlnd[atmtile][atmtile], atmtile)
+        index = np.flatnonzero(counts)
+        atm_i, atm_j = (index % nx).astype(np.int32), (index // nx).astype(np.int32)
+
+        atmxlnd[atmtile] = {atmtile: dict(nxcells = index.size,
+                                          src_i = atm_i,
+                                          src_j = atm_j,
+                                          tgt_i = atm_i.copy(),
+                                          tgt_j = atm_j.copy(),
+                                          xarea = sums[index])
+        }
+
+        #sums is the land exchange grid area of each atm cell
+        write_lnd_mask(atm_area, sums.reshape(ny, nx), atmtile)
 
     return XGridObj(datadict=atmxlnd)
     
 
 def make(atm_mosaic_file: str, lnd_mosaic_file: str, ocn_mosaic_file: str,
-         topog_file: str, input_dir: str = "./", on_gpu: bool = False):    
+         topog_file: str, input_dir: str = "./", on_gpu: bool = False, cache_dir: str = None):    
     
     #read in mosaic files
     atm_mosaic = MosaicObj(input_dir=input_dir, mosaic_file=atm_mosaic_file).read()
     lnd_mosaic = MosaicObj(input_dir=input_dir, mosaic_file=lnd_mosaic_file).read()
     ocn_mosaic = MosaicObj(input_dir=input_dir, mosaic_file=ocn_mosaic_file).read()
 
-    #read in grids
-    atm_mosaic.get_grid(toradians=True, agrid=True, free_dataset=True)
-    lnd_mosaic.get_grid(toradians=True, agrid=True, free_dataset=True)
-    ocn_mosaic.get_grid(toradians=True, agrid=True, free_dataset=True)
+    #read in grids, the atm and lnd grids are usually the same files and
+    #are shared through the grid cache since they are not modified
+    atm_mosaic.get_grid(toradians=True, agrid=True, free_dataset=True, variables=["x", "y"], cache=True)
+    lnd_mosaic.get_grid(toradians=True, agrid=True, free_dataset=True, variables=["x", "y"], cache=True)
+    ocn_mosaic.get_grid(toradians=True, agrid=True, free_dataset=True, variables=["x", "y"])
     
     #get ocean mask
     topogfile_dict = {'tile1': input_dir + '/' + topog_file}
     extended_grid = extend_ocn_grid_south(ocn_mosaic)    
     ocn_mask = get_ocn_mask(ocn_mosaic=ocn_mosaic, topog_file=topogfile_dict)
 
-    #atmxocn
-    atmxocn = XGridObj(src_grid=atm_mosaic.grid, tgt_grid=extended_grid, on_gpu=on_gpu)
-    atmxocn.create_xgrid(tgt_mask=ocn_mask)
+    #clip atm and ocn cells once and split the exchange grid into the ocean and land parts,
+    #split is only available on the CPU so the ocean and land parts are clipped separately on the GPU
+    if on_gpu:
+        lnd_mask = {itile: np.float64(1.0) - ocn_mask[itile] for itile in ocn_mask}
+        atmxocn = XGridObj(src_grid=atm_mosaic.grid, tgt_grid=extended_grid, on_gpu=on_gpu, cache_dir=cache_dir)
+        atmxocn.create_xgrid(tgt_mask=ocn_mask)
+        atmxocn_landpart = XGridObj(src_grid=atm_mosaic.grid, tgt_grid=extended_grid, on_gpu=on_gpu,
+                                    cache_dir=cache_dir)
+        atmxocn_landpart.create_xgrid(tgt_mask=lnd_mask)
+    else:
+        atmxocn_all = XGridObj(src_grid=atm_mosaic.grid, tgt_grid=extended_grid, cache_dir=cache_dir)
+        atmxocn_all.create_xgrid()
+        atmxocn, atmxocn_landpart = atmxocn_all.split(tgt_mask=ocn_mask)
+        del atmxocn_all
 
     #undo extra ocn dimension
     for ocntile in atmxocn.datadict:
         for atmtile in atmxocn.datadict[ocntile]:
             atmxocn.datadict[ocntile][atmtile]['tgt_j'] -= ocn_mosaic.extended_south
 
-    #ocn mask for lnd    
-    for itile in ocn_mask: ocn_mask[itile] = np.float64(1.0) - ocn_mask[itile]
-            
-    #atmxocn the land part 
-    atmxocn_landpart = XGridObj(src_grid=atm_mosaic.grid, tgt_grid=extended_grid, on_gpu=on_gpu)
-    atmxocn_landpart.create_xgrid(tgt_mask=ocn_mask)
+    #atmxlnd from the land part
     atmxlnd = get_atmxlnd(atmxocn_landpart, atm_mosaic=atm_mosaic)
             
     #write
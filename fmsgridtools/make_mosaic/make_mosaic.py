@@ -1,9 +1,7 @@
 import click
 import numpy as np
 
-import fmsgridtools.make_mosaic.solo_mosaic as solo_mosaic
-import fmsgridtools.make_mosaic.regional_mosaic as regional_mosaic
-import fmsgridtools.make_mosaic.coupler_mosaic as coupler_mosaic
+# the mosaic generators are imported in the commands to keep the CLI startup fast
 
 ATMOS_MOSAIC_HELP = "specify the atmosphere mosaic information \
     This file contains list of tile files which specify \
@@ -59,7 +57,9 @@ def solo(num_tiles,
          tile_file,
          periodx,
          periody):
-    
+
+    import fmsgridtools.make_mosaic.solo_mosaic as solo_mosaic
+
     solo_mosaic.make(num_tiles,
                      mosaic_name,
                      list(tile_file),
@@ -79,7 +79,9 @@ def solo(num_tiles,
 
 def regional(global_mosaic, 
              regional_file):
-    
+
+    import fmsgridtools.make_mosaic.regional_mosaic as regional_mosaic
+
     regional_mosaic.make(global_mosaic, 
                          regional_file)
 
@@ -127,6 +129,10 @@ def quick(input_mosaic,
 
 @click.option('--rotate_poly')
 
+@click.option('--cache_dir',
+              type=click.Path(file_okay=False),
+              help="directory to cache the exchange grids in")
+
 def coupler(input_dir,
             atmos_mosaic,
             ocean_mosaic,
@@ -136,7 +142,10 @@ def coupler(input_dir,
             interp_order,
             area_ratio_thresh,
             check,
-            rotate_poly):
+            rotate_poly,
+            cache_dir):
+
+    import fmsgridtools.make_mosaic.coupler_mosaic as coupler_mosaic
 
     coupler_mosaic.set_parameters(sea_level,
                                   area_ratio_thresh,
@@ -147,4 +156,5 @@ def coupler(input_dir,
                         lnd_mosaic_file=land_mosaic,
                         ocn_mosaic_file=ocean_mosaic,
                         topog_file=ocean_topog,
-                        input_dir=input_dir)
+                        input_dir=input_dir,
+                        cache_dir=cache_dir)
@@ -0,0 +1,5 @@
+from ..shared.lazy import forward_to
+
+__getattr__ = forward_to(__name__, "make_topog",
+                         names=["realistic_or_basin"],
+                         submodules=["topogobj"])
@@ -5,10 +5,6 @@ from typing import Optional
 
 import click
 
-from fmsgridtools.shared.mosaicobj import MosaicObj
-from fmsgridtools.make_topog.topogobj import TopogObj
-from fmsgridtools.shared.gridtools_utils import check_file_is_there, get_provenance_attrs
-
 
 MOSAIC_FILE_OPT_HELP="Specify the mosaic file where topography data will be located."
 TOPOG_TYPE_OPT_HELP="""
@@ -56,6 +52,18 @@ of the polygon, with the copy being rotated far away from the pole
 GPU_HELP="""Enables using GPU acceleration via OpenACC for realistic topography generation.
 Nvidia (nvc) is the only currently supported compiler for offloading and must be available during the initial pip install.
 """
+NPROCS_HELP="Number of processes generating the realistic topography of the tiles concurrently"
+MIN_DEPTH_HELP="Minimum depth of the ocean used by the gaussian, bowl and idealized topog_type methods."
+GAUSS_AMP_HELP="Height of the gaussian bump as a fraction of bottom_depth"
+GAUSS_SCALE_HELP="Width of the gaussian bump as a fraction of the grid extent"
+SLOPE_X_HELP="Rise of the ocean floor to the east in meters/degree"
+SLOPE_Y_HELP="Rise of the ocean floor to the north in meters/degree"
+BOWL_HELP="Edge of the bowl in degrees"
+CHANNEL_HELP="Model grid j index bounding the open part of the west/east boundary of the box channel"
+DOME_SLOPE_HELP="Slope of the sloping bottom of the dome configuration"
+DOME_BOTTOM_HELP="Depth of the flat bottom of the dome configuration"
+DOME_EMBAYMENT_HELP="Edge of the embayment of the dome configuration in degrees"
+DOME_EMBAYMENT_DEPTH_HELP="Depth of the embayment of the dome configuration"
 # TODO add rest of the help descriptions
 
 @click.command()
@@ -169,6 +177,30 @@ Nvidia (nvc) is the only currently supported compiler for offloading and must be
 @click.option("--gpu",
               is_flag = True,
               help = GPU_HELP)
+@click.option("--nprocs",
+              type = int,
+              default = 1,
+              help = NPROCS_HELP)
+# idealized
+@click.option("--min_depth", type = float, default = 10.0, help = MIN_DEPTH_HELP)
+@click.option("--gauss_amp", type = float, default = 0.5, help = GAUSS_AMP_HELP)
+@click.option("--gauss_scale", type = float, default = 0.25, help = GAUSS_SCALE_HELP)
+@click.option("--slope_x", type = float, default = 0.0, help = SLOPE_X_HELP)
+@click.option("--slope_y", type = float, default = 0.0, help = SLOPE_Y_HELP)
+@click.option("--bowl_south", type = float, default = 60.0, help = BOWL_HELP)
+@click.option("--bowl_north", type = float, default = 70.0, help = BOWL_HELP)
+@click.option("--bowl_west", type = float, default = 0.0, help = BOWL_HELP)
+@click.option("--bowl_east", type = float, default = 20.0, help = BOWL_HELP)
+@click.option("--jwest_south", type = int, default = 0, help = CHANNEL_HELP)
+@click.option("--jwest_north", type = int, default = 0, help = CHANNEL_HELP)
+@click.option("--jeast_south", type = int, default = 0, help = CHANNEL_HELP)
+@click.option("--jeast_north", type = int, default = 0, help = CHANNEL_HELP)
+@click.option("--dome_slope", type = float, default = 0.01, help = DOME_SLOPE_HELP)
+@click.option("--dome_bottom", type = float, default = 3600.0, help = DOME_BOTTOM_HELP)
+@click.option("--dome_embayment_west", type = float, default = 19.0, help = DOME_EMBAYMENT_HELP)
+@click.option("--dome_embayment_east", type = float, default = 21.0, help = DOME_EMBAYMENT_HELP)
+@click.option("--dome_embayment_south", type = float, default = 69.0, help = DOME_EMBAYMENT_HELP)
+@click.option("--dome_embayment_depth", type = float, default = 600.0, help = DOME_EMBAYMENT_DEPTH_HELP)
 def realistic_or_basin(
     mosaic : str = None,
     topog_type : str = None,
@@ -199,6 +231,26 @@ def realistic_or_basin(
     vgrid_file : Optional[str] = None,
     output : Optional[str] = None,
     gpu: Optional[bool] = None,
+    nprocs : Optional[int] = None,
+    min_depth : Optional[float] = None,
+    gauss_amp : Optional[float] = None,
+    gauss_scale : Optional[float] = None,
+    slope_x : Optional[float] = None,
+    slope_y : Optional[float] = None,
+    bowl_south : Optional[float] = None,
+    bowl_north : Optional[float] = None,
+    bowl_west : Optional[float] = None,
+    bowl_east : Optional[float] = None,
+    jwest_south : Optional[int] = None,
+    jwest_north : Optional[int] = None,
+    jeast_south : Optional[int] = None,
+    jeast_north : Optional[int] = None,
+    dome_slope : Optional[float] = None,
+    dome_bottom : Optional[float] = None,
+    dome_embayment_west : Optional[float] = None,
+    dome_embayment_east : Optional[float] = None,
+    dome_embayment_south : Optional[float] = None,
+    dome_embayment_depth : Optional[float] = None,
     verbose : Optional[bool] = None):
     """
 make_topog can generate topography for any Mosaic. The output file
@@ -222,16 +274,38 @@ More details on the topog_type options are below.
               --fill_first_row  --filter_topog --round_shallow --fill_shallow --deepen_shallow
               --smooth_topo_allow_deepening --vgrid_file --full_cell --dont_fill_isolated_cells --on_grid
               --dont_change_landmask --kmt_min  --dont_adjust_topo --fraction_full_cell --dont_open_very_this_cell
-              --gpu
+              --gpu --nprocs
 
-              Realistic currently only supports single-tile grids, and x/y_refinement values of 2.
+              Each tile is generated independently, --nprocs sets the number of tiles generated concurrently.
+              Realistic currently only supports x/y_refinement values of 2.
 
 'rectangular_basin': Constructs a rectangular basin with a flat bottom.
                      --bottom_depth is its optional argument. Set bottom_depth
                      to 0 to get all land topography.
 
+'gaussian':  Gaussian bump on a sloping ocean floor.
+             Optional arguments are: --bottom_depth --min_depth --gauss_amp --gauss_scale --slope_x --slope_y
+
+'bowl':  Bowl from Winton et al. (1998).
+         Optional arguments are: --bottom_depth --min_depth --bowl_south --bowl_north --bowl_west --bowl_east
+
+'idealized':  Idealized world with continents and ridges, for lat-lon grids.
+              Optional arguments are: --bottom_depth --min_depth
+
+'box_channel':  Flat bottom box with channel openings on the west and east boundaries.
+                Optional arguments are: --bottom_depth --jwest_south --jwest_north --jeast_south --jeast_north
+
+'dome':  DOME configuration from Legg, Hallberg, and Girton (2005).
+         Optional arguments are: --dome_slope --dome_bottom --dome_embayment_west --dome_embayment_east
+         --dome_embayment_south --dome_embayment_depth
+
     """
 
+    # imported here to keep the CLI startup fast
+    from fmsgridtools.shared.mosaicobj import MosaicObj
+    from fmsgridtools.make_topog.topogobj import TopogObj
+    from fmsgridtools.shared.gridtools_utils import get_provenance_attrs
+
     # get provenance data
     prov_attrs = get_provenance_attrs()
 
@@ -260,11 +334,23 @@ More details on the topog_type options are below.
             flat_bottom, fill_first_row, filter_topog, round_shallow, fill_shallow,
             deepen_shallow, smooth_topo_allow_deepening, full_cell, dont_fill_isolated_cells,
             on_grid, dont_change_landmask, dont_adjust_topo, open_very_this_cell, inputMosaicObj.gridfiles,
-            rotate_poly, gpu)
+            rotate_poly, gpu, nprocs)
     elif (topog_type == "rectangular_basin"):
         topogOut.make_rectangular_basin(bottom_depth)
+    elif (topog_type == "gaussian"):
+        topogOut.make_topog_gaussian(gauss_scale, gauss_amp, slope_x, slope_y, bottom_depth, min_depth)
+    elif (topog_type == "bowl"):
+        topogOut.make_topog_bowl(bottom_depth, min_depth, bowl_south, bowl_north, bowl_west, bowl_east)
+    elif (topog_type == "idealized"):
+        topogOut.make_topog_box_idealized(bottom_depth, min_depth)
+    elif (topog_type == "box_channel"):
+        topogOut.make_topog_box_channel(jwest_south, jwest_north, jeast_south, jeast_north, bottom_depth)
+    elif (topog_type == "dome"):
+        topogOut.make_topog_dome(dome_slope, dome_bottom, dome_embayment_west, dome_embayment_east,
+                                 dome_embayment_south, dome_embayment_depth)
     else:
-        print("Error: invalid topog_type argument given, must be one of [realistic, gaussian, bowl, box_channel, dome]")
+        print("Error: invalid topog_type argument given, must be one of "
+              "[realistic, rectangular_basin, gaussian, bowl, idealized, box_channel, dome]")
         exit(1)
 
     # write out the result
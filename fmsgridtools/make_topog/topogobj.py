@@ -1,15 +1,80 @@
-import ctypes
 import dataclasses
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 import xarray as xr
 
+import pyfrenctools
+
 from ..shared.gridtools_utils import check_file_is_there
 
 
 # macro value from tool_util.h
 VERSION_2 = 2
 
+# meters per degree of latitude, from topog.c
+DEG2METRE = 111.324e3
+
+# (alat1, slon1, elon1, alat2, slon2, elon2) trapezoids of land in the idealized topography
+IDEALIZED_LAND = [
+    # antarctica
+    (-90.0, 0.0, 360.0, -80.0, 0.0, 360.0),
+    (-80.0, 360.0-25.0, 360.0, -70.0, 360.0, 360.0),
+    (-80.0, 0.0, 360.0, -70.0, 0.0, 170.0),
+    (-80.0, 360.0-135.0, 360.0-60.0, -68.0, 360.0-75.0, 360.0-60.0),
+    (-70.0, 0.0, 155.0, -67.0, 50.0, 145.0),
+    # australia
+    (-35.0, 116.0, 120.0, -31.0, 114.0, 130.0),
+    (-38.0, 140.0, 151.0, -31.0, 130.0, 151.0),
+    (-31.0, 115.0, 153.0, -20.0, 113.0, 149.0),
+    (-20.0, 113.0, 149.0, -11.0, 131.0, 143.0),
+    # south america
+    (-50.0, 360.0-74.0, 360.0-68.0, -40.0, 360.0-73.0, 360.0-62.0),
+    (-40.0, 360.0-73.0, 360.0-62.0, -20.0, 360.0-70.0, 360.0-40.0),
+    (-20.0, 360.0-70.0, 360.0-40.0, -16.0, 360.0-81.0, 360.0-35.0),
+    (-16.0, 360.0-81.0, 360.0-35.0, 0.0, 360.0-80.0, 360.0-50.0),
+    (0.0, 360.0-80.0, 360.0-50.0, 11.0, 360.0-75.0, 360.0-60.0),
+    # central america
+    (6.0, 360.0-78.0, 360.0-75.0, 20.0, 360.0-105.0, 360.0-97.0),
+    (20.0, 360.0-105.0, 360.0-97.0, 30.0, 360.0-115.0, 360.0-94.0),
+    # north america
+    (25.0, 360.0-82.0, 360.0-80.0, 30.0, 360.0-85.0, 360.0-81.0),
+    (30.0, 360.0-115.0, 360.0-80.0, 40.0, 360.0-124.0, 360.0-74.0),
+    (40.0, 360.0-124.0, 360.0-74.0, 50.0, 360.0-124.0, 360.0-57.0),
+    (50.0, 360.0-124.0, 360.0-57.0, 60.0, 360.0-140.0, 360.0-64.0),
+    (60.0, 360.0-165.0, 360.0-64.0, 65.0, 360.0-140.0, 360.0-64.0),
+    (65.0, 360.0-140.0, 360.0-64.0, 70.0, 360.0-162.0, 360.0-72.0),
+    (70.0, 360.0-162.0, 360.0-140.0, 72.0, 360.0-157.0, 360.0-157.0),
+    (70.0, 360.0-130.0, 360.0-70.0, 75.0, 360.0-120.0, 360.0-80.0),
+    # greenland
+    (60.0, 360.0-45.0, 360.0-45.0, 75.0, 360.0-58.0, 360.0-19.0),
+    # africa
+    (-35.0, 19.0, 28.0, 6.0, 8.0, 50.0),
+    (6.0, 0.0, 50.0, 18.0, 0.0, 56.0),
+    (18.0, 0.0, 56.0, 26.0, 0.0, 59.0),
+    (6.0, 360.0-10.0, 360.0, 18.0, 360.0-18.0, 360.0),
+    (18.0, 360.0-18.0, 360.0, 26.0, 360.0-15.0, 360.0),
+    # northern africa and europe and asia
+    (26.0, 360.0-15.0, 360.0, 40.0, 360.0-7.0, 360.0),
+    (40.0, 360.0-7.0, 360.0, 50.0, 360.0, 360.0),
+    (8.0, 77.0, 78.0, 26.0, 65.0, 90.0),
+    (4.0, 99.0, 100.0, 26.0, 90.0, 115.0),
+    (26.0, 0.0, 126.0, 40.0, 0.0, 122.0),
+    (40.0, 0.0, 130.0, 50.0, 0.0, 140.0),
+    (50.0, 0.0, 140.0, 60.0, 8.0, 140.0),
+    (60.0, 8.0, 163.0, 65.0, 13.0, 180.0),
+    (65.0, 13.0, 188.0, 70.0, 20.0, 180.0),
+    (70.0, 70.0, 180.0, 75.0, 90.0, 100.0),
+]
+
+# idealized ridges and their depth as a fraction of the bottom depth
+IDEALIZED_RIDGES = [
+    ((-20.0, 360.0-20.0, 360.0-10.0, 30.0, 360.0-45.0, 360.0-35.0), 0.666),
+    ((30.0, 360.0-45.0, 360.0-35.0, 60.0, 360.0-20.0, 360.0-30.0), 0.666),
+    ((-60.0, 360.0-100.0, 360.0-130.0, 40.0, 360.0-160.0, 180.0), 0.666),
+    ((-50.0, 360.0-120.0, 360.0-120.0, 30.0, 190.0, 190.0), 0.5),
+]
+
 # represents topography output file created by make_topog
 # contains parameters for topography generation that aren't tied to a specific topography type
 @dataclasses.dataclass
@@ -89,7 +154,7 @@ class TopogObj():
                 if self.has_vgrid:
                     self.depth_vars[f'num_levels_{tname}'] = xr.DataArray(
                         data = self.depth_vals[f'num_levels_{tname}'],
-                        dims = self.dims,
+                        dims = self.dims[(i-1)*2:(i-1)*2+2],
                         attrs = num_levels_attrs)
 
         # create dataset (this excludes ntiles, since it is not used in a variable)
@@ -104,7 +169,7 @@ class TopogObj():
     # 'realistic' option requires a data file (topog_file) and the topography data's variable name (topog_field)
     # and then interpolates the read in data as depth values onto the output grid.
     # It can also take a vertical grid file as input, in which case it will also add another variable 'num_levels'
-    # Currently, the realistic option is limited to single tile mosaics (ocean)
+    # Each tile of the mosaic is generated independently, on a pool of nprocs processes if nprocs > 1
     def make_topog_realistic( self,
         x_vals_tile: dict = None,
         y_vals_tile: dict = None,
@@ -130,29 +195,8 @@ class TopogObj():
         open_very_this_cell: bool = None,
         grid_filenames: str = None,
         rotate_poly: bool = None,
-        gpu: bool = None):
-
-        # first load the C library (this will be replaced with a different method eventually)
-        frenct_lib = ctypes.cdll.LoadLibrary("./FREnctools_lib/cfrenctools/c_build/clib.so")
-        # get the C functions we need and set their arg types
-        generate_realistic_c = frenct_lib.create_realistic_topog_wrapper
-        get_boundary_type_c = frenct_lib.get_boundary_type
-        generate_realistic_c.argtypes = [ ctypes.c_int, ctypes.c_int,                        # nx_dst, ny_dst
-                                          ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int), # x_dst, y_dst
-                                          ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p, # vgrid_file, topog_file, topog_field
-                                          ctypes.c_double, ctypes.c_int,                     # scale_factor, tripolar_grid,
-                                          ctypes.c_int, ctypes.c_int,                        # cyclic_x, cyclic_y
-                                          ctypes.c_int, ctypes.c_int, ctypes.c_int,          # fill_first_row, filter_topog, num_filter_pass
-                                          ctypes.c_int, ctypes.c_int, ctypes.c_int,          # smooth_topo_allow_deepening, round_shallow, fill_shallow
-                                          ctypes.c_int, ctypes.c_int, ctypes.c_int,          # deepen_shallow, full_cell, flat_bottom,
-                                          ctypes.c_int, ctypes.c_int, ctypes.c_int,          # adjust_topo, fill_isolated_cells, dont_change_landmask
-                                          ctypes.c_int, ctypes.c_double, ctypes.c_int,       # kmt_min, min_thickness, open_very_this_cell,
-                                          ctypes.c_double, ctypes.c_void_p, ctypes.c_void_p, # fraction_full_cell, depth, num_levels
-                                          ctypes.c_int, ctypes.c_int,                        # debug, use_great_circle_algo
-                                          ctypes.c_int, ctypes.c_int, ctypes.c_int,          # on_grid, x_refine, y_refine
-                                          ctypes.c_char_p, ctypes.c_int, ctypes.c_int ]      # tile_names, rotate_poly, gpu
-        get_boundary_type_c.argtypes = [ctypes.c_char_p, ctypes.c_int, ctypes.POINTER(ctypes.c_int),
-                                        ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)]
+        gpu: bool = None,
+        nprocs: int = 1):
 
         # TODO (done in c for now)
         # if optional vgrid file is provided, read in the dimension and zeta values
@@ -181,87 +225,67 @@ class TopogObj():
         check_file_is_there(topog_file)
         if topog_field is None:
             raise ValueError("No argument given for topog_field")
-        if self.ntiles != 1:
-            raise ValueError("Mosaic input file has more than one tile, 'realistic' option only supports single-tile mosaics")
+        if len(grid_filenames) != len(self.x_tile):
+            raise ValueError("A grid file is needed for each tile of the mosaic")
         # check vgrid
         if vgrid_file is not None:
             check_file_is_there(vgrid_file)
             self.has_vgrid = True
 
         # set boundary type arguments based on the mosaic
-        cyclic_x = ctypes.c_int(0)
-        cyclic_y = ctypes.c_int(0)
-        tripolar_grid = ctypes.c_int(0)
-        get_boundary_type_c(self.mosaic_filename.encode('utf-8'), VERSION_2, ctypes.byref(cyclic_x), ctypes.byref(cyclic_y),
-                            ctypes.byref(tripolar_grid))
-
-        # only need to generate for single tile, otherwise get_boundary_type errors out
-        tileName = list(self.x_tile.keys())[0]
+        # get_boundary_type only supports single tile mosaics, the tiles of multi-tile
+        # mosaics (cubed sphere) are connected by contacts and are neither cyclic nor folded
+        cyclic_x, cyclic_y, tripolar_grid = 0, 0, 0
+        if self.ntiles == 1:
+            cyclic_x, cyclic_y, tripolar_grid = pyfrenctools.topog.get_boundary_type(self.mosaic_filename, VERSION_2)
+
+        # arguments of create_realistic_topog shared by all tiles
+        # TODO remove use_great_circle_algorithm arg
+        options = dict( vgrid_file = vgrid_file, topog_file = topog_file, topog_field = topog_field,
+                        scale_factor = self.scale_factor, tripolar_grid = tripolar_grid,
+                        cyclic_x = cyclic_x, cyclic_y = cyclic_y,
+                        fill_first_row = bool_to_int(fill_first_row), filter_topog = bool_to_int(filter_topog),
+                        num_filter_pass = bool_to_int(num_filter_pass),
+                        smooth_topo_allow_deepening = bool_to_int(smooth_topo_allow_deepening),
+                        round_shallow = bool_to_int(round_shallow), fill_shallow = bool_to_int(fill_shallow),
+                        deepen_shallow = bool_to_int(deepen_shallow), full_cell = bool_to_int(full_cell),
+                        flat_bottom = bool_to_int(flat_bottom), adjust_topo = bool_to_int(dont_adjust_topo),
+                        fill_isolated_cells = bool_to_int(dont_fill_isolated_cells),
+                        dont_change_landmask = bool_to_int(dont_change_landmask),
+                        kmt_min = 0 if kmt_min is None else kmt_min,
+                        min_thickness = 0 if min_thickness is None else min_thickness,
+                        open_very_this_cell = bool_to_int(open_very_this_cell),
+                        fraction_full_cell = fraction_full_cell, debug = bool_to_int(self.debug),
+                        use_great_circle_algorithm = bool_to_int(False), on_grid = bool_to_int(on_grid),
+                        x_refine = self.x_refine, y_refine = self.y_refine,
+                        rotate_poly = bool_to_int(rotate_poly), gpu = bool_to_int(gpu) )
+
+        # one task per tile, with the grid file of the tile
+        tasks = {}
+        for itile, tileName in enumerate(self.x_tile.keys()):
+            if(self.debug):
+                print(f"Calling generate_realistic with nx: {self.nx_tile[tileName]}, ny: {self.ny_tile[tileName]}")
+            tasks[tileName] = dict( nx_dst = self.nx_tile[tileName], ny_dst = self.ny_tile[tileName],
+                                    x_dst = self.x_tile[tileName], y_dst = self.y_tile[tileName],
+                                    tile_file = grid_filenames[itile], **options )
+
+        # tiles are independent, the C wrapper initializes mpp and opens files through
+        # process-wide state so concurrent tiles run in separate processes
+        generate_realistic = pyfrenctools.topog.create_realistic_topog
+        if nprocs == 1 or len(tasks) == 1:
+            results = {tileName: generate_realistic(**task) for tileName, task in tasks.items()}
+        else:
+            with ProcessPoolExecutor(max_workers=nprocs) as pool:
+                futures = {tileName: pool.submit(generate_realistic, **task) for tileName, task in tasks.items()}
+                results = {tileName: future.result() for tileName, future in futures.items()}
+
         self.depth_vals = {}
-        # number of grid points
-        _nx_dst = self.nx_tile[tileName]
-        _ny_dst = self.ny_tile[tileName]
-        # get x/y values from grid objs
-        _x_dst = self.x_tile[tileName]
-        _y_dst = self.y_tile[tileName]
-        # set by 'get_boundary_type' call above
-        _tripolar_grid = tripolar_grid
-        _cyclic_x = cyclic_x
-        _cyclic_y = cyclic_y
-        # passed in flags (convert to ints)
-        _fill_first_row = bool_to_int(fill_first_row)
-        _filter_topog = bool_to_int(filter_topog)
-        _num_filter_pass = bool_to_int(num_filter_pass)
-        _smooth_topo_allow_deepening = bool_to_int(smooth_topo_allow_deepening)
-        _round_shallow = bool_to_int(round_shallow)
-        _fill_shadow = bool_to_int(fill_shallow)
-        _deepen_shallow = bool_to_int(deepen_shallow)
-        _full_cell = bool_to_int(full_cell)
-        _flat_bottom = bool_to_int(flat_bottom)
-        _dont_adjust_topo = bool_to_int(dont_adjust_topo)
-        _dont_fill_isolated_cells = bool_to_int(dont_fill_isolated_cells)
-        _dont_change_landmask = bool_to_int(dont_change_landmask)
-        _open_very_this_cell = bool_to_int(open_very_this_cell)
-        _on_grid = bool_to_int(on_grid)
-        _rotate_poly = bool_to_int(rotate_poly)
-        # anything else
-        _kmt_min = 0 if kmt_min is None else kmt_min
-        _min_thickness = 0 if min_thickness is None else min_thickness
-        _fraction_full_cell = fraction_full_cell # double
-        _debug = bool_to_int(self.debug)
-        _vgrid_file = None if vgrid_file is None else vgrid_file.encode('utf-8')
-        _gpu = bool_to_int(gpu)
-        # get the name of the grid file for the current tile
-        _grid_filename = grid_filenames[0].encode('utf-8')
-        # TODO remove arg
-        _use_great_circle_algorithm = bool_to_int(False)
-        # init return values for output arrays
-        # this might not be neccessary since arrays are malloc'd in C
-        _depth = np.zeros( (int(_ny_dst/self.y_refine), int(_nx_dst/self.x_refine)) )
-        _num_levels = np.zeros( (int(_ny_dst/self.y_refine), int(_nx_dst/self.x_refine)), dtype=ctypes.c_int)
-
-        if(self.debug):
-            print(f"Calling generate_realistic with nx: {self.nx_tile[tileName]}, ny: {self.ny_tile[tileName]}")
-        generate_realistic_c( _nx_dst, _ny_dst,
-                              _x_dst.ctypes.data_as(ctypes.POINTER(ctypes.c_int)),
-                              _y_dst.ctypes.data_as(ctypes.POINTER(ctypes.c_int)),
-                              _vgrid_file, topog_file.encode('utf-8'), topog_field.encode('utf-8'),
-                              self.scale_factor,
-                              _tripolar_grid, _cyclic_x, _cyclic_y,
-                              _fill_first_row, _filter_topog, _num_filter_pass,
-                              _smooth_topo_allow_deepening, _round_shallow, _fill_shadow,
-                              _deepen_shallow, _full_cell, _flat_bottom,
-                              _dont_adjust_topo, _dont_fill_isolated_cells, _dont_change_landmask,
-                              _kmt_min, _min_thickness, _open_very_this_cell,
-                              _fraction_full_cell, _depth.ctypes.data_as(ctypes.POINTER(ctypes.c_double)),
-                              _num_levels.ctypes.data_as(ctypes.POINTER(ctypes.c_int)),
-                               _debug, _use_great_circle_algorithm, _on_grid, self.x_refine, self.y_refine,
-                               _grid_filename, _rotate_poly, _gpu)
-        # set depth for current tile to depth values generated by c function
-        self.depth_vals[f"depth_{tileName}"] = _depth
-        # if a vgrid is used, add num_levels variable to the output data and set to returned array
-        if(self.has_vgrid):
-            self.depth_vals[f"num_levels_{tileName}"] = _num_levels
+        for tileName, (depth, num_levels) in results.items():
+            # set depth for current tile to depth values generated by c function
+            self.depth_vals[f"depth_{tileName}"] = depth
+            # if a vgrid is used, add num_levels variable to the output data and set to returned array
+            if(self.has_vgrid):
+                self.depth_vals[f"num_levels_{tileName}"] = num_levels
         self.__data_is_generated = True
 
     def make_rectangular_basin(self, bottom_depth: float = None):
@@ -272,13 +296,33 @@ class TopogObj():
         self.__data_is_generated = True
 
 
+    # gaussian bump on a sloping ocean floor, the bump is centered in the tile
     def make_topog_gaussian(self,
         gauss_scale: float = None,
         gauss_amp: float = None,
         slope_x: float = None,
-        slope_y: float = None):
-        pass
+        slope_y: float = None,
+        bottom_depth: float = None,
+        min_depth: float = None):
+        self.depth_vals = {}
+        for tileName in self.x_tile.keys():
+            xt, yt = self._get_cell_centers(tileName)
+            xw, xe = xt.min(), xt.max()
+            ys, yn = yt.min(), yt.max()
+            bump_height = gauss_amp*bottom_depth
+            bump_scale = gauss_scale*min(xe-xw, yn-ys)
+            xcent = 0.5*(xe+xw)
+            ycent = 0.5*(yn+ys)
+            if(self.debug):
+                print(f"Constructing a gaussian bump of height = {bump_height} meters with a scale width of {bump_scale} degrees.")
+                print(f"The bump is centered at (lon,lat) = ({xcent},{ycent}) deg.")
+            arg = (xt-xcent)**2 + (yt-ycent)**2
+            bottom = bottom_depth - bump_height*np.exp(-arg/bump_scale**2)
+            bottom -= slope_x*(xt-xw) + slope_y*(yt-ys)
+            self.depth_vals[f"depth_{tileName}"] = np.maximum(bottom, min_depth)
+        self.__data_is_generated = True
 
+    # bowl from Winton et al. JPO, Vol 28, No 11, 2163-2174, November 1998
     def make_topog_bowl(self,
         bottom_depth: float = None,
         min_depth: float = None,
@@ -286,21 +330,64 @@ class TopogObj():
         bowl_north: float = None,
         bowl_west: float = None,
         bowl_east: float = None):
-        pass
+        self.depth_vals = {}
+        for tileName in self.x_tile.keys():
+            xx, yy = self._get_cell_centers(tileName)
+            bottom = min_depth + bottom_depth \
+                * (1.0-np.exp(-((yy-bowl_south)/2.0)**2)) \
+                * (1.0-np.exp(-((yy-bowl_north)/2.0)**2)) \
+                * (1.0-np.exp(-((xx-bowl_west)/4.0)**2)) \
+                * (1.0-np.exp(-((xx-bowl_east)/4.0)**2))
+            outside = (xx <= bowl_west) | (xx >= bowl_east) | (yy <= bowl_south) | (yy >= bowl_north)
+            self.depth_vals[f"depth_{tileName}"] = np.where(outside, min_depth, bottom)
+        self.__data_is_generated = True
 
+    # highly "idealized" world with continents and ridges built from trapezoids, it somewhat
+    # resembles the real world on a lat-lon grid but is NOT realistic
     def make_topog_box_idealized(self,
         bottom_depth: float = None,
         min_depth: float = None):
-        pass
+        self.depth_vals = {}
+        for tileName in self.x_tile.keys():
+            x, y = self._get_model_grid(tileName)
+            ny, nx = x.shape[0]-1, x.shape[1]-1
+            xbnd = (x[0, :-1] + x[0, 1:])*0.5
+            ybnd = (y[:-1, 0] + y[1:, 0])*0.5
+            depth = np.full((ny, nx), bottom_depth, dtype=np.float64)
+            for trapezoid in IDEALIZED_LAND:
+                set_depth(xbnd, ybnd, *trapezoid, 0.0, depth)
+            # add an "idealized" undulating topography
+            jj, ii = np.ogrid[1:ny+1, 1:nx+1]
+            undulation = bottom_depth*(1-0.4*np.abs(np.cos((jj*np.pi)/(ny+1))*np.sin((ii*2*np.pi)/(nx+1))))
+            depth = np.where(depth > 0.0, np.maximum(undulation, min_depth), depth)
+            # add "idealized" ridges
+            for trapezoid, fraction in IDEALIZED_RIDGES:
+                set_depth(xbnd, ybnd, *trapezoid, fraction*bottom_depth, depth)
+            self.depth_vals[f"depth_{tileName}"] = depth
+        self.__data_is_generated = True
 
+    # flat bottomed box closed to the south and north, the west and east
+    # boundaries are open between the given j indices
     def make_topog_box_channel(self,
         jwest_south: int = None,
         jwest_north: int = None,
         ieast_south: int = None,
         ieast_north: int = None,
         bottom_depth: float = None):
-        pass
+        self.depth_vals = {}
+        for tileName in self.x_tile.keys():
+            ny, nx = self._get_model_grid(tileName)[0].shape
+            depth = np.full((ny-1, nx-1), bottom_depth, dtype=np.float64)
+            depth[0, :] = 0.0
+            depth[-1, :] = 0.0
+            depth[:jwest_south, 0] = 0.0
+            depth[jwest_north:, 0] = 0.0
+            depth[:ieast_south, -1] = 0.0
+            depth[ieast_north:, -1] = 0.0
+            self.depth_vals[f"depth_{tileName}"] = depth
+        self.__data_is_generated = True
 
+    # DOME configuration from Legg, Hallberg, and Girton (2005) Ocean Modelling
     def make_topog_dome(self,
         dome_slope: float = None,
         dome_bottom: float = None,
@@ -308,7 +395,39 @@ class TopogObj():
         dome_embayment_east: float = None,
         dome_embayment_south: float = None,
         dome_embayment_depth: float = None):
-        pass
+        self.depth_vals = {}
+        for tileName in self.x_tile.keys():
+            x, y = self._get_cell_centers(tileName)
+            # find grid (lat,lon) corresponding to embayment specifications
+            xw_embay = _snap_to_grid(x[0, :], dome_embayment_west)
+            xe_embay = _snap_to_grid(x[0, :], dome_embayment_east)
+            ys_embay = _snap_to_grid(y[:, 0], dome_embayment_south)
+            yn_embay = y.max()
+            # latitudes the sloping surface starts and finishes
+            yn_slope = ys_embay
+            ys_slope = _snap_to_grid(y[:, 0], yn_slope - (dome_bottom-dome_embayment_depth)/(dome_slope*DEG2METRE))
+            if(self.debug):
+                print(f"Constructing DOME configuration topography with embayment ({xw_embay}, {xe_embay}) x "
+                      f"({ys_embay}, {yn_embay}) and slope from {ys_slope} to {yn_slope}")
+            depth = np.full(x.shape, dome_bottom, dtype=np.float64)
+            slope = (y >= ys_slope) & (y < yn_slope)
+            depth[slope] = dome_bottom - dome_slope*DEG2METRE*(y[slope]-ys_slope)
+            depth[y >= yn_slope] = 0.0
+            depth[(x >= xw_embay) & (x <= xe_embay) & (y >= ys_embay) & (y <= yn_embay)] = dome_embayment_depth
+            self.depth_vals[f"depth_{tileName}"] = depth
+        self.__data_is_generated = True
+
+    # returns the corners of the model grid cells of the tile
+    def _get_model_grid(self, tileName: str):
+        return (self.x_tile[tileName][::self.y_refine, ::self.x_refine],
+                self.y_tile[tileName][::self.y_refine, ::self.x_refine])
+
+    # returns the average of the four corners of each model grid cell of the tile
+    def _get_cell_centers(self, tileName: str):
+        centers = []
+        for c in self._get_model_grid(tileName):
+            centers.append((c[:-1, :-1] + c[:-1, 1:] + c[1:, :-1] + c[1:, 1:])*0.25)
+        return centers
 
 
 def bool_to_int(bool_val):
@@ -316,3 +435,51 @@ def bool_to_int(bool_val):
         return 1
     else:
         return 0
+
+
+def nearest_index(value: float, array: np.ndarray) -> int:
+    """
+    Returns the index of the point in the monotonically increasing array nearest to value,
+    or the first/last index if value is outside of array
+    """
+    if value < array[0]: return 0
+    if value > array[-1]: return array.size-1
+    i = max(int(np.searchsorted(array, value)), 1)
+    return i-1 if array[i]-value > value-array[i-1] else i
+
+
+def set_depth(xbnd: np.ndarray, ybnd: np.ndarray, alat1: float, slon1: float, elon1: float,
+              alat2: float, slon2: float, elon2: float, depth_in: float, depth: np.ndarray):
+    """
+    Sets depth to depth_in within the trapezoid with the southern edge from (alat1, slon1)
+    to (alat1, elon1) and the northern edge from (alat2, slon2) to (alat2, elon2), in degrees
+    """
+    j1, j2 = nearest_index(alat1, ybnd), nearest_index(alat2, ybnd)
+    js, je = min(j1, j2), max(j1, j2)
+    i1, i2 = nearest_index(slon1, xbnd), nearest_index(elon1, xbnd)
+    is1, ie1 = min(i1, i2), max(i1, i2)
+    i1, i2 = nearest_index(slon2, xbnd), nearest_index(elon2, xbnd)
+    is2, ie2 = min(i1, i2), max(i1, i2)
+
+    # the zonal bounds of each row are interpolated from the previous row, the nudging
+    # of 1.e-5 is to insure the test case resolution gives the same topography on all computers
+    rdj = 1.0 if js == je else 1.0/(je-js)
+    j = np.arange(js, je)
+    bounds = []
+    for bnd1, bnd2 in ((is1, is2), (ie1, ie2)):
+        d = rdj*((j-js)*bnd2 + (je-j)*bnd1) + 1.0e-5
+        bnd = np.ceil(d)
+        bnd = np.where(bnd - d > 0.5, bnd-1, bnd).astype(np.int64)
+        bounds.append(np.concatenate(([bnd1], bnd))[:, np.newaxis])
+
+    i = np.arange(depth.shape[1])
+    rows = depth[js:je+1]
+    rows[(i >= bounds[0]) & (i <= bounds[1])] = depth_in
+
+
+def _snap_to_grid(coords: np.ndarray, value: float) -> float:
+    """
+    Returns the first coordinate at the start of an interval of coords containing value, or value
+    """
+    inside = np.flatnonzero((coords[:-1] <= value) & (coords[1:] >= value))
+    return coords[inside[0]] if inside.size else value
@@ -0,0 +1,5 @@
+from ..shared.lazy import forward_to
+
+__getattr__ = forward_to(__name__, "remap",
+                         names=["conservative_method"],
+                         submodules=["conservative"])
@@ -1,4 +1,10 @@
+import itertools
+import os
+
+import netCDF4
 import numpy as np
+import numpy.typing as npt
+import scipy.sparse
 
 from fmsgridtools.shared.xgridobj import XGridObj
 
@@ -16,10 +22,13 @@ def remap(src_mosaic: str,
           tbounds: list = None,
           order: int = 1,
           static_file: str = None,
-          check_conserve: bool = False):
+          check_conserve: bool = False,
+          cache_dir: str = None,
+          tchunk: int = 1,
+          kchunk: int = None):
 
     #create an xgrid object
-    xgrid = XGridObj(input_dir, src_mosaic_file=src_mosaic, tgt_mosaic_file=tgt_mosaic)
+    xgrid = XGridObj(input_dir, src_mosaic_file=src_mosaic, tgt_mosaic_file=tgt_mosaic, cache_dir=cache_dir)
 
     #create xgrid
     xgrid.create_xgrid()
@@ -27,5 +36,202 @@ def remap(src_mosaic: str,
     #write
     xgrid.write()
 
+    if input_file is None: return
+
+    #click passes opened files
+    input_file = getattr(input_file, "name", input_file)
+    if output_dir is None: output_dir = "./"
+    if output_file is None: output_file = os.path.basename(input_file)
+
+    src_files = get_tile_files(os.path.join(input_dir, os.path.basename(input_file)), list(xgrid.src_grid))
+    tgt_files = get_tile_files(os.path.join(output_dir, output_file), list(xgrid.tgt_grid))
+
+    for tgt_tile in xgrid.tgt_grid:
+        remap_file(xgrid, tgt_tile, src_files, tgt_files[tgt_tile],
+                   kbounds=kbounds, tbounds=tbounds, tchunk=tchunk, kchunk=kchunk)
+
+
+def get_tile_files(filename: str, tiles: list[str]) -> dict:
+
+    """
+    Returns the file for each tile.  For a single tile, filename is the file.
+    Else, the files are filename.tile#.nc where the suffix is omitted in filename
+    """
+
+    prefix = filename[:-3] if filename.endswith(".nc") else filename
+
+    if len(tiles) == 1:
+        return {tiles[0]: prefix + ".nc"}
+
+    return {tile: f"{prefix}.{tile}.nc" for tile in tiles}
+
+
+def apply_weights(weights: scipy.sparse.csr_array, src_data: npt.NDArray) -> npt.NDArray:
+
+    """
+    Remaps src_data of shape (m, source cells) with the normalized operator weights.
+    Each target cell is the exchange grid area weighted mean of the source cells.
+    Source cells with NaN are excluded and target cells without any valid source
+    cells are NaN.
+    """
+
+    valid = ~np.isnan(src_data)
+    numerator = weights @ np.where(valid, src_data, 0.0).T
+    denominator = weights @ valid.T.astype(np.float64)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(denominator > 0.0, numerator/denominator, np.nan).T
+
+
+def remap_file(xgrid: XGridObj,
+               tgt_tile: str,
+               src_files: dict[str, str],
+               tgt_file: str,
+               kbounds: list = None,
+               tbounds: list = None,
+               tchunk: int = 1,
+               kchunk: int = None):
+
+    """
+    Remaps every field in src_files defined on the source cells to tgt_tile
+    and writes them to tgt_file.  The fields are read, remapped, and written
+    tchunk time levels and kchunk vertical levels at a time.  kbounds and
+    tbounds are the 1-based first and last level to remap.  The vertical
+    dimensions are those whose coordinate has axis Z or a positive attribute.
+    """
+
+    src_tiles = list(xgrid.src_grid)
+    tgt_grid = xgrid.tgt_grid[tgt_tile]
+
+    #rows of the operator for tgt_tile
+    tgt_start = 0
+    for tile in xgrid.tgt_grid:
+        if tile == tgt_tile: break
+        tgt_start += xgrid.tgt_grid[tile].ny*xgrid.tgt_grid[tile].nx
+    weights = xgrid.to_sparse()[tgt_start:tgt_start+tgt_grid.ny*tgt_grid.nx]
+
+    src = {src_tile: netCDF4.Dataset(src_files[src_tile]) for src_tile in src_tiles}
+    tgt = netCDF4.Dataset(tgt_file, "w")
+
+    try:
+        nc = src[src_tiles[0]]
+        src_ny, src_nx = xgrid.src_grid[src_tiles[0]].ny, xgrid.src_grid[src_tiles[0]].nx
+
+        spatial_dims = set(_spatial_dims(nc, src_ny, src_nx))
+        fields, copies = [], []
+        for name, var in nc.variables.items():
+            if var.ndim >= 2 and var.shape[-2:] == (src_ny, src_nx):
+                fields.append(name)
+            elif var.ndim == 0 or not (set(var.dimensions) & spatial_dims):
+                copies.append(name)
+
+        tdim = _get_time_dim(nc)
+        zdims = _get_vertical_dims(nc)
+        bounds = {}
+        for name in fields + copies:
+            var = nc.variables[name]
+            leading = var.dimensions[:-2] if name in fields else var.dimensions
+            for dim in leading:
+                if dim == tdim and tbounds is not None:
+                    bounds[dim] = (tbounds[0]-1, tbounds[1])
+                elif name in fields and dim in zdims and kbounds is not None:
+                    bounds[dim] = (kbounds[0]-1, kbounds[1])
+                elif dim not in bounds:
+                    bounds[dim] = (0, len(nc.dimensions[dim]))
+
+        for dim, (start, end) in bounds.items():
+            tgt.createDimension(dim, None if nc.dimensions[dim].isunlimited() else end-start)
+        tgt.createDimension("grid_yt", tgt_grid.ny)
+        tgt.createDimension("grid_xt", tgt_grid.nx)
+
+        for name in copies:
+            var = nc.variables[name]
+            out = tgt.createVariable(name, var.dtype, var.dimensions, fill_value=_get_fill_value(var))
+            out.setncatts({key: var.getncattr(key) for key in var.ncattrs() if key != "_FillValue"})
+            out[...] = var[tuple(slice(*bounds[dim]) for dim in var.dimensions)]
+
+        for name in fields:
+            var = nc.variables[name]
+            leading = var.dimensions[:-2]
+            dtype = var.dtype if np.issubdtype(var.dtype, np.floating) else np.float64
+            fill_value = _get_fill_value(var)
+            if fill_value is None: fill_value = netCDF4.default_fillvals[np.dtype(dtype).str[1:]]
+            out = tgt.createVariable(name, dtype, leading + ("grid_yt", "grid_xt"), fill_value=fill_value)
+            out.setncatts({key: var.getncattr(key) for key in var.ncattrs() if key not in ("_FillValue", "missing_value")})
+
+            #stream over blocks of the leading dimensions
+            chunks = []
+            for dim in leading:
+                start, end = bounds[dim]
+                if dim == tdim: size = tchunk
+                elif dim in zdims and kchunk is not None: size = kchunk
+                else: size = end - start
+                chunks.append([(istart, min(istart+size, end)) for istart in range(start, end, max(size, 1))])
+
+            for block in itertools.product(*chunks):
+                src_slices = tuple(slice(istart, iend) for istart, iend in block)
+                tgt_slices = tuple(slice(istart-bounds[dim][0], iend-bounds[dim][0])
+                                   for dim, (istart, iend) in zip(leading, block))
+                shape = tuple(iend-istart for istart, iend in block)
+
+                src_data = []
+                for src_tile in src_tiles:
+                    data = src[src_tile].variables[name][src_slices]
+                    data = np.ma.filled(np.ma.asarray(data, dtype=np.float64), np.nan)
+                    src_data.append(data.reshape(-1, data.shape[-2]*data.shape[-1]))
+
+                tgt_data = apply_weights(weights, np.concatenate(src_data, axis=1))
+                out[tgt_slices] = np.ma.masked_invalid(tgt_data.reshape(shape + (tgt_grid.ny, tgt_grid.nx)))
+    finally:
+        for nc in src.values(): nc.close()
+        tgt.close()
+
+
+def _spatial_dims(nc: netCDF4.Dataset, ny: int, nx: int) -> list[str]:
+
+    """
+    Returns the dimensions of the source cells in nc
+    """
+
+    dims = set()
+    for var in nc.variables.values():
+        if var.ndim >= 2 and var.shape[-2:] == (ny, nx):
+            dims.update(var.dimensions[-2:])
+
+    return list(dims)
+
+
+def _get_time_dim(nc: netCDF4.Dataset) -> str:
+
+    """
+    Returns the unlimited dimension, or the dimension named time
+    """
+
+    for dim in nc.dimensions.values():
+        if dim.isunlimited(): return dim.name
+
+    return "time" if "time" in nc.dimensions else None
+
+
+def _get_vertical_dims(nc: netCDF4.Dataset) -> set[str]:
+
+    """
+    Returns the dimensions whose coordinate variable has axis Z or a positive attribute
+    """
+
+    zdims = set()
+    for name, dim in nc.dimensions.items():
+        var = nc.variables.get(name)
+        if var is None or var.dimensions != (name,): continue
+        if str(getattr(var, "axis", "")).upper() == "Z" or "positive" in var.ncattrs():
+            zdims.add(name)
+
+    return zdims
+
+
+def _get_fill_value(var: netCDF4.Variable):
 
+    if "_FillValue" in var.ncattrs(): return var.getncattr("_FillValue")
+    if "missing_value" in var.ncattrs(): return var.getncattr("missing_value")
 
+    return None
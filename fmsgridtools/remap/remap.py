@@ -3,7 +3,6 @@ import logging
 
 from fmsgridtools.remap import _options
 from fmsgridtools.utils import setlogger
-from fmsgridtools.remap import conservative
 
 logger = logging.getLogger(__name__)
 
@@ -32,15 +31,44 @@ logger = logging.getLogger(__name__)
               If true, output grid area conservative will be checked
               """
 )
+@click.option("--cache_dir",
+              type = click.Path(file_okay=False),
+              help =
+              """
+              Directory to cache exchange grids in.  Exchange grids between
+              the same grids are read from the cache instead of recomputed
+              """
+)
+@click.option("--tchunk",
+              type = int,
+              default = 1,
+              help =
+              """
+              Number of time levels read and remapped at a time
+              """
+)
+@click.option("--kchunk",
+              type = int,
+              help =
+              """
+              Number of vertical levels read and remapped at a time.
+              By default, all vertical levels are remapped at a time
+              """
+)
 def conservative_method(input_dir, output_dir, input_file, output_file, #common_options
                         src_mosaic, tgt_mosaic, tgt_nlon, tgt_nlat,     #common_options
                         lon_bounds, lat_bounds, kbounds, tbounds,       #common_options
-                        debug, order, static_file, check_conserve):
-    
+                        debug, order, static_file, check_conserve, cache_dir,
+                        tchunk, kchunk):
+
+    # imported here to keep the CLI startup fast
+    from fmsgridtools.remap import conservative
+
     setlogger.setconfig("remap.log", debug)
     logger.info("Starting conservative remapping")
     
     conservative.remap(src_mosaic, input_dir, output_dir, input_file,
                        output_file, tgt_mosaic, tgt_nlon, tgt_nlat,
                        lon_bounds, lat_bounds, kbounds, tbounds,
-                       order, static_file, check_conserve)    
+                       order, static_file, check_conserve, cache_dir,
+                       tchunk, kchunk)    
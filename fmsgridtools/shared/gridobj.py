@@ -1,4 +1,7 @@
 import dataclasses
+import os
+import threading
+from collections import OrderedDict
 from typing import List, Optional
 import numpy as np
 import numpy.typing as npt
@@ -30,46 +33,104 @@ class GridObj:
         self.angle_dy = None
         self.arcx = None
         self.dataset = dataset
+        self._lazy = {}
 
 
     """
     read:
-    This function reads in the gridfile and initializes the instance variables
+    This function reads in the gridfile and initializes the instance variables.
+    Only the data variables in variables are read if specified.  If lazy, the
+    data variables are read from the file when they are first accessed.
     """
-    def read(self, toradians: bool = False, agrid: bool = False, free_dataset: bool = False):
+    def read(self, toradians: bool = False, agrid: bool = False, free_dataset: bool = False,
+             variables: list[str] = None, lazy: bool = False):
 
         check_file_is_there(self.gridfile)
         self.dataset = xr.open_dataset(self.gridfile)
-        self.get_attributes()
-
-        if free_dataset:
-            del self.dataset
-            self.dataset = None
-        
-        if toradians:
-            self.x = np.radians(self.x, dtype=np.float64)
-            self.y = np.radians(self.y, dtype=np.float64)
 
         if agrid:
-            self.x, self.y = self.agrid()
+            #only the A-grid points of x and y are read and converted in place
+            if variables is None: variables = list(self.dataset.data_vars)
+            self.get_attributes(variables=[key for key in variables if key not in ("x", "y")], lazy=lazy)
+            self.x = self._read_agrid("x", toradians)
+            self.y = self._read_agrid("y", toradians)
             [self.nyp, self.nxp] = self.x.shape
             self.nx = self.nxp - 1
             self.ny = self.nyp - 1
-            
+        else:
+            self.get_attributes(variables=variables, lazy=lazy)
+            if toradians:
+                #the values are converted in place only if they are not kept in the dataset
+                self.x = self._to_radians(self.x, inplace=free_dataset)
+                self.y = self._to_radians(self.y, inplace=free_dataset)
+
+        if free_dataset:
+            del self.dataset
+            self.dataset = None
+
         return self
 
+
+    def _read_agrid(self, key: str, toradians: bool = False, nrows: int = 256) -> npt.NDArray:
+
+        """
+        Reads the A-grid points of the supergrid variable key into one contiguous array.
+        The rows are read nrows at a time so that the temporary arrays stay small.
+        """
+
+        dataarray = self.dataset[key]
+        nyp, nxp = (dataarray.shape[0]+1)//2, (dataarray.shape[1]+1)//2
+
+        values = np.empty((nyp, nxp), dtype=np.float64)
+        for jstart in range(0, nyp, nrows):
+            jend = min(jstart+nrows, nyp)
+            values[jstart:jend] = dataarray[2*jstart:2*jend:2, ::2].values
+            if toradians: np.radians(values[jstart:jend], out=values[jstart:jend])
+
+        return values
+
+
+    @staticmethod
+    def _to_radians(values: npt.NDArray, inplace: bool = False) -> npt.NDArray:
+
+        if inplace and values.dtype == np.float64 and values.flags.writeable:
+            return np.radians(values, out=values)
+        return np.radians(values, dtype=np.float64)
+
     
-    def get_attributes(self):
+    def get_attributes(self, variables: list[str] = None, lazy: bool = False):
 
         for key in self.dataset.data_vars:
-            if isinstance(self.dataset.data_vars[key].values, np.ndarray):
-                setattr(self, key, self.dataset[key].values)
+            if variables is not None and key not in variables: continue
+            if lazy:
+                #the instance variable is removed so that __getattr__ reads it on first access
+                self._lazy[key] = self.dataset[key]
+                self.__dict__.pop(key, None)
             else:
-                setattr(self, key, str(self.dataset[key].astype(str).values))
+                setattr(self, key, self._get_values(self.dataset[key]))
 
         for key in self.dataset.sizes:
             setattr(self, key, self.dataset.sizes[key])
 
+
+    def __getattr__(self, key: str):
+
+        lazy = self.__dict__.get("_lazy")
+        if lazy is None or key not in lazy:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{key}'")
+
+        value = self._get_values(lazy.pop(key))
+        setattr(self, key, value)
+        return value
+
+
+    @staticmethod
+    def _get_values(dataarray: xr.DataArray):
+
+        if isinstance(dataarray.values, np.ndarray):
+            return dataarray.values
+        return str(dataarray.astype(str).values)
+
     """
     write_out_grid:
     This method will generate a netcdf file containing the contents of the
@@ -164,3 +225,62 @@ class GridObj:
         return a_lon, a_lat
 
 #TODO: I/O method for passing to the host
+
+
+#maximum number of grids kept by read_grid
+grid_cache_size = 16
+
+_grid_cache = OrderedDict()
+_grid_cache_lock = threading.Lock()
+
+
+def read_grid(gridfile: str, toradians: bool = False, agrid: bool = False, free_dataset: bool = False,
+              variables: list[str] = None, lazy: bool = False, cache: bool = False) -> GridObj:
+
+    """
+    Returns GridObj(gridfile=gridfile).read(...).  If cache, the grid is kept in a
+    process-wide LRU cache of grid_cache_size grids keyed by the path, modification
+    time, and size of gridfile and the read options.  A modified file is read again.
+    Cached grids are shared by all callers and their arrays are read-only, so
+    callers that opt in with cache must not modify the grid in place.  Only
+    grids read with free_dataset and without lazy are cached so that the cache
+    never keeps files open.
+    """
+
+    def read() -> GridObj:
+        return GridObj(gridfile=gridfile).read(toradians=toradians,
+                                               agrid=agrid,
+                                               free_dataset=free_dataset,
+                                               variables=variables,
+                                               lazy=lazy)
+
+    if not cache or grid_cache_size <= 0 or not free_dataset or lazy: return read()
+
+    check_file_is_there(gridfile)
+    stat = os.stat(gridfile)
+    key = (os.path.realpath(gridfile), stat.st_mtime_ns, stat.st_size, toradians, agrid,
+           None if variables is None else tuple(variables))
+
+    with _grid_cache_lock:
+        grid = _grid_cache.get(key)
+        if grid is not None:
+            _grid_cache.move_to_end(key)
+            return grid
+
+    grid = read()
+    for value in vars(grid).values():
+        if isinstance(value, np.ndarray): value.flags.writeable = False
+
+    with _grid_cache_lock:
+        _grid_cache[key] = grid
+        _grid_cache.move_to_end(key)
+        while len(_grid_cache) > grid_cache_size:
+            _grid_cache.popitem(last=False)
+
+    return grid
+
+
+def clear_grid_cache():
+
+    with _grid_cache_lock:
+        _grid_cache.clear()
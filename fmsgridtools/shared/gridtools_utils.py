@@ -2,10 +2,10 @@ import os
 import sys
 from subprocess import run
 from time import ctime
+from multiprocessing import shared_memory
 from typing import Optional
 
-from git import Repo
-from pkg_resources import get_distribution
+import numpy as np
 
 
 def check_file_is_there( check_file: str, debug: bool = False ) :
@@ -15,11 +15,46 @@ def check_file_is_there( check_file: str, debug: bool = False ) :
     else :
         raise FileNotFoundError(f"Cannot find file \"{check_file}\"")
 
+def to_shared_memory(arrays: dict) -> tuple[list, dict]:
+
+    """
+    Copies each array into a new shared memory block.  Returns the blocks
+    and the (name, shape, dtype) needed to attach to each of them.
+    """
+
+    shms, descriptors = [], {}
+    for key, array in arrays.items():
+        array = np.asarray(array)
+        shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+        shms.append(shm)
+        descriptors[key] = (shm.name, array.shape, array.dtype.str)
+
+    return shms, descriptors
+
+def attach_shared_memory(descriptors: dict) -> tuple[list, dict]:
+
+    """
+    Attaches to the shared memory blocks in descriptors.  Returns the
+    blocks, which must stay open, and the arrays viewing them.
+    """
+
+    shms, arrays = [], {}
+    for key, (name, shape, dtype) in descriptors.items():
+        shm = shared_memory.SharedMemory(name=name)
+        shms.append(shm)
+        arrays[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+    return shms, arrays
+
 def get_provenance_attrs(
     great_circle_algorithm: Optional[bool] = False,
     grid_version: Optional[str] = "0.2") -> dict:
     # returns a dictionary of provenance information to be added
     # as global attributes for output netcdf files
+    # git and pkg_resources are slow to import, only import them when needed
+    from git import Repo
+    from pkg_resources import get_distribution
     try:
         repo = Repo(search_parent_directories=True)
         git_hash = repo.head.object.hexsha
@@ -0,0 +1,24 @@
+import importlib
+
+
+def forward_to(package: str, module: str, names: list[str], submodules: list[str] = None):
+
+    """
+    Returns a module __getattr__ for package that forwards names, e.g. the
+    click commands of package.<command>, to package.module and imports module
+    and the submodules of package on first access.  Any other attribute raises
+    AttributeError
+    """
+
+    modules = [module] + (submodules if submodules is not None else [])
+
+    def __getattr__(name: str):
+
+        if name in names:
+            return getattr(importlib.import_module(f"{package}.{module}"), name)
+        if name in modules:
+            return importlib.import_module(f"{package}.{name}")
+
+        raise AttributeError(f"module {package} has no attribute {name}")
+
+    return __getattr__
@@ -1,7 +1,8 @@
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, List, Any
 import xarray as xr
-from fmsgridtools.shared.gridobj import GridObj
+from fmsgridtools.shared.gridobj import GridObj, read_grid
 from fmsgridtools.shared.gridtools_utils import check_file_is_there
 
 
@@ -70,14 +71,45 @@ class MosaicObj:
         setattr(self, attribute, value)
 
 
-    def get_grid(self, toradians: bool = False, agrid: bool = False, free_dataset: bool = False) -> dict:
+    def get_grid(self, toradians: bool = False, agrid: bool = False, free_dataset: bool = False,
+                 variables: list[str] = None, lazy: bool = False, tiles: list[str] = None,
+                 nthreads: int = 1, cache: bool = False) -> dict:
+
+        """
+        Reads the grid of each tile in tiles, or of all tiles.  The tiles are read serially
+        unless nthreads > 1.  The netCDF4 backend of xarray serializes file access behind a
+        global lock, so threads only overlap the NumPy post-processing of the tiles, such as
+        the A-grid extraction and the conversion to radians.  The tiles are added to grid
+        in the order of tiles.  If cache, grids that were already read and whose files
+        have not changed are taken from the cache of read_grid and are read-only.
+        """
 
         if self.grid is None: self.grid = {}
-        for i in range(self.ntiles):
-            gridfile = str(self.input_dir) + str(self.gridlocation) + str(self.gridfiles[i])
-            self.grid[self.gridtiles[i]] = GridObj(gridfile=gridfile).read(toradians=toradians,
-                                                                           agrid=agrid,
-                                                                           free_dataset=free_dataset)
+
+        gridfiles = {str(self.gridtiles[i]): str(self.gridfiles[i]) for i in range(self.ntiles)}
+        if tiles is None: tiles = list(gridfiles)
+
+        for tile in tiles:
+            if tile not in gridfiles: raise ValueError(f"{tile} is not a tile in the mosaic")
+
+        def read_tile(tile: str) -> GridObj:
+            gridfile = str(self.input_dir) + str(self.gridlocation) + gridfiles[tile]
+            return read_grid(gridfile,
+                             toradians=toradians,
+                             agrid=agrid,
+                             free_dataset=free_dataset,
+                             variables=variables,
+                             lazy=lazy,
+                             cache=cache)
+
+        if nthreads <= 1 or len(tiles) == 1:
+            grids = [read_tile(tile) for tile in tiles]
+        else:
+            with ThreadPoolExecutor(max_workers=nthreads) as pool:
+                grids = list(pool.map(read_tile, tiles))
+
+        for tile, grid in zip(tiles, grids):
+            self.grid[tile] = grid
 
         return self.grid
 
@@ -1,15 +1,36 @@
 import ctypes
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+import netCDF4
 import numpy as np
 import numpy.typing as npt
+import scipy.sparse
 import xarray as xr
 
 import pyfrenctools
 import pyfms
 
 from fmsgridtools.shared.gridobj import GridObj
-from fmsgridtools.shared.gridtools_utils import check_file_is_there
+from fmsgridtools.shared.gridtools_utils import attach_shared_memory, check_file_is_there, to_shared_memory
 from fmsgridtools.shared.mosaicobj import MosaicObj
 
+#changes to the cached exchange grid format should increment the version
+XGRID_CACHE_VERSION = 1
+
+#same threshold as the clipping routines in FREnctools_lib
+MASK_THRESH = 0.5
+
+#npy remap directory format
+NPY_VERSION = 1
+NPY_INDEX_FILE = "xgrid.json"
+NPY_KEYS = ("src_i", "src_j", "tgt_i", "tgt_j", "xarea", "tile")
+
 
 class XGridObj() :
 
@@ -27,7 +48,16 @@ class XGridObj() :
                  datadict: dict = None,
                  on_agrid: bool = True,
                  order: int = 1,
-                 on_gpu: bool = False):
+                 on_gpu: bool = False,
+                 nprocs: int = 1,
+                 executor: str = "process",
+                 nblocks: int = None,
+                 cache_dir: str = None,
+                 cache_size: int = 2**30,
+                 grid_cache: bool = False,
+                 chunksize: int = 2**16,
+                 compression: str = None,
+                 complevel: int = 4):
         self.input_dir = input_dir
         self.src_mosaic_file = src_mosaic_file
         self.tgt_mosaic_file = tgt_mosaic_file
@@ -40,11 +70,21 @@ class XGridObj() :
         self.order = order
         self.on_gpu = on_gpu
         self.on_agrid = on_agrid
+        self.nprocs = nprocs
+        self.executor = executor
+        self.nblocks = nblocks
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size
+        self.grid_cache = grid_cache
+        self.chunksize = chunksize
+        self.compression = compression
+        self.complevel = complevel
         self.dataset = dataset
         self.datadict = datadict
 
         self._srcinfoisthere = False
         self._tgtinfoisthere = False
+        self._sparse = None
 
         if self._check_restart_remap_file(): return
         if self.datadict is not None: return
@@ -58,13 +98,28 @@ class XGridObj() :
             raise RuntimeError("Please provide grid information")
 
 
-    def read(self, infile: str = None):
+    def read(self, infile: str = None, tgt_tiles: list[str] = None):
+
+        """
+        Reads the remap file infile.  For files written by write, datadict is rebuilt
+        for the target tiles in tgt_tiles, or for all target tiles, and only the cells
+        of those tiles are read.  Else, the variables in infile are set as attributes.
+        """
 
         if infile is None:
             if self.restart_remap_file is None:
                 raise RuntimeError("must provide the input remap file for reading")
             infile = self.restart_remap_file
 
+        if os.path.isdir(infile):
+            self._read_npy(infile)
+            return
+
+        with netCDF4.Dataset(infile) as ncfile:
+            if "tile" in ncfile.variables and "tgt_tile" in ncfile.variables:
+                self._read_pairs(ncfile, tgt_tiles)
+                return
+
         self.dataset = xr.open_dataset(infile)
 
         for key in self.dataset.data_vars.keys():
@@ -74,19 +129,143 @@ class XGridObj() :
             setattr(self, key, self.dataset.sizes[key])
 
 
-    def write(self, outfile: str = None):
+    def _read_pairs(self, ncfile: netCDF4.Dataset, tgt_tiles: list[str] = None):
+
+        """
+        Sets datadict from the remap file ncfile.  The offset of the cells of each
+        tile pair is taken from the pair index or, if missing, from the tile columns.
+        """
+
+        ncfile.set_auto_mask(False)
+
+        if "pair_start" in ncfile.variables:
+            pair_tgt = ncfile["pair_tgt_tile"][:]
+            pair_src = ncfile["pair_src_tile"][:]
+            pair_start = ncfile["pair_start"][:]
+            pair_end = pair_start + ncfile["pair_nxcells"][:]
+        else:
+            tgt_column, src_column = ncfile["tgt_tile"][:], ncfile["tile"][:]
+            pair_start = np.flatnonzero(np.diff(tgt_column, prepend=-1) | np.diff(src_column, prepend=-1))
+            pair_end = np.append(pair_start[1:], tgt_column.size)
+            pair_tgt, pair_src = tgt_column[pair_start], src_column[pair_start]
+
+        def tile_names(attr: str, tile_numbers: npt.NDArray) -> list[str]:
+            if attr in ncfile.ncattrs(): return ncfile.getncattr(attr).split()
+            return [f"tile{n}" for n in range(1, int(tile_numbers.max(initial=0))+1)]
+
+        src_names, tgt_names = tile_names("src_tiles", pair_src), tile_names("tgt_tiles", pair_tgt)
+        if tgt_tiles is None: tgt_tiles = tgt_names
+
+        self.datadict = {tgt_tile: {} for tgt_tile in tgt_tiles}
+        for itgt, isrc, start, end in zip(pair_tgt, pair_src, pair_start, pair_end):
+            tgt_tile, src_tile = tgt_names[itgt-1], src_names[isrc-1]
+            if tgt_tile not in self.datadict: continue
+            src_cell, tgt_cell = ncfile["src_cell"][start:end], ncfile["tgt_cell"][start:end]
+            self.datadict[tgt_tile][src_tile] = dict(nxcells=int(end-start),
+                                                     src_i=np.ascontiguousarray(src_cell[:,0]-1),
+                                                     src_j=np.ascontiguousarray(src_cell[:,1]-1),
+                                                     tgt_i=np.ascontiguousarray(tgt_cell[:,0]-1),
+                                                     tgt_j=np.ascontiguousarray(tgt_cell[:,1]-1),
+                                                     xarea=ncfile["xarea"][start:end],
+                                                     tile=ncfile["tile"][start:end])
+
+        self._sparse = None
+
+
+    def _read_npy(self, indir: str):
+
+        """
+        Sets datadict from the directory written by write(format="npy").
+        The arrays are memory-mapped and are not copied.
+        """
+
+        with open(os.path.join(indir, NPY_INDEX_FILE)) as f:
+            index = json.load(f)
+
+        self.datadict = {tgt_tile: {} for tgt_tile in index["tgt_tiles"]}
+        for pair in index["pairs"]:
+            xgrid_out = {key: np.load(os.path.join(indir, pair["path"], f"{key}.npy"), mmap_mode="r")
+                         for key in NPY_KEYS}
+            xgrid_out["nxcells"] = pair["nxcells"]
+            self.datadict[pair["tgt_tile"]][pair["src_tile"]] = xgrid_out
+
+        self._sparse = None
+
+
+    def _write_npy(self, outdir: str):
+
+        """
+        Writes each tile pair to a subdirectory of outdir with one .npy file per
+        column.  The cell indices are 0-based int32.  As in the netcdf format, tile
+        is the 1-based position of the src tile in src_tiles.
+        """
+
+        os.makedirs(outdir, exist_ok=True)
+
+        src_tiles, tgt_tiles = self._get_writer_tiles()
+        src_itile = {src_tile: itile for itile, src_tile in enumerate(src_tiles, start=1)}
+        index = dict(version=NPY_VERSION, src_tiles=src_tiles, tgt_tiles=tgt_tiles, pairs=[])
+
+        for tgt_tile in self.datadict:
+            for src_tile, xgrid_out in self.datadict[tgt_tile].items():
+                path = f"pair{len(index['pairs']):06d}"
+                os.makedirs(os.path.join(outdir, path), exist_ok=True)
+                for key in NPY_KEYS:
+                    if key == "tile":
+                        values = np.full(int(xgrid_out["nxcells"]), src_itile[src_tile], dtype=np.int32)
+                    else:
+                        values = np.asarray(xgrid_out[key], dtype=np.float64 if key == "xarea" else np.int32)
+                    np.save(os.path.join(outdir, path, f"{key}.npy"), values)
+                index["pairs"].append(dict(tgt_tile=tgt_tile, src_tile=src_tile,
+                                           nxcells=int(xgrid_out["nxcells"]), path=path))
+
+        with open(os.path.join(outdir, NPY_INDEX_FILE), "w") as f:
+            json.dump(index, f, indent=1)
+
+
+    def write(self, outfile: str = None, format: str = "netcdf"):
+
+        """
+        Writes the exchange grid cells of all tile pairs to outfile.  For netcdf,
+        the cells of each pair are appended to the unlimited nxcells dimension one
+        pair at a time.  For npy, outfile is a directory of .npy files that read
+        memory-maps back.
+        """
 
         if outfile is None:
           outfile = self.write_remap_file
 
-        if self.dataset is None:
-          if self.datadict is not None:
-            self.to_dataset()
+        if self.datadict is None: raise RuntimeError("datadict is None")
+
+        if format == "npy":
+            self._write_npy(outfile)
+            return
+        if format != "netcdf":
+            raise ValueError(f"format must be 'netcdf' or 'npy', got {format}")
+
+        with self._get_writer(outfile) as writer:
+            for tgt_tile in self.datadict:
+                for src_tile, xgrid_out in self.datadict[tgt_tile].items():
+                    writer.write(tgt_tile, src_tile, xgrid_out)
+
+
+    def _get_writer_tiles(self) -> tuple[list[str], list[str]]:
+
+        src_tiles = list(self.src_grid) if self.src_grid is not None else \
+            list(dict.fromkeys(src_tile for tgt_tile in self.datadict for src_tile in self.datadict[tgt_tile]))
+        tgt_tiles = list(self.tgt_grid) if self.tgt_grid is not None else list(self.datadict)
+
+        return src_tiles, tgt_tiles
+
 
-        for tgt_tile in self.dataset:
-          concat_dataset = xr.concat([self.dataset[tgt_tile][src_tile] for src_tile in self.dataset[tgt_tile]], dim="nxcells")
+    def _get_writer(self, outfile: str) -> "_XGridWriter":
 
-        concat_dataset.to_netcdf(outfile)
+        src_tiles, tgt_tiles = self._get_writer_tiles()
+
+        return _XGridWriter(outfile, src_tiles, tgt_tiles,
+                            chunksize=self.chunksize,
+                            compression=self.compression,
+                            complevel=self.complevel)
 
 
     def to_dataset(self):
@@ -119,46 +298,360 @@ class XGridObj() :
                 )
 
 
-    def create_xgrid(self, src_mask: dict[str,npt.NDArray] = None, tgt_mask: dict[str, npt.NDArray] = None) -> dict:
+    def to_sparse(self, normalize: str = "tgt_area") -> scipy.sparse.csr_array:
+
+        """
+        Returns the remapping operator as a CSR array of shape (target cells, source cells).
+        The cells of all tiles are numbered (j*nx + i) + offset of the tile where the
+        tiles are ordered as in tgt_grid and src_grid.  A field f of shape (..., source cells)
+        is remapped with (operator @ f.T).T.  Each row is normalized by the area of the target
+        cell if normalize is "tgt_area", so that target cells only partly covered by the
+        source grid are weighted by the covered fraction, or by the exchange grid area of the
+        target cell if normalize is "xarea".  The operator is cached until the exchange grid
+        is regenerated.
+        """
+
+        if normalize not in ("tgt_area", "xarea"):
+            raise ValueError(f"normalize must be tgt_area or xarea, not {normalize}")
+
+        if self._sparse is None: self._sparse = {}
+        if normalize in self._sparse: return self._sparse[normalize]
+
+        if self.datadict is None: raise RuntimeError("datadict is None")
+        if self.src_grid is None or self.tgt_grid is None:
+            raise RuntimeError("src_grid and tgt_grid are required to number the cells")
+
+        src_offsets, nsrc = _get_offsets(self.src_grid)
+        tgt_offsets, ntgt = _get_offsets(self.tgt_grid)
+
+        rows, cols, xarea = [], [], []
+        for tgt_tile in self.datadict:
+            for src_tile, xgrid_out in self.datadict[tgt_tile].items():
+                rows.append(xgrid_out["tgt_j"]*self.tgt_grid[tgt_tile].nx + xgrid_out["tgt_i"] + tgt_offsets[tgt_tile])
+                cols.append(xgrid_out["src_j"]*self.src_grid[src_tile].nx + xgrid_out["src_i"] + src_offsets[src_tile])
+                xarea.append(xgrid_out["xarea"])
+
+        if rows:
+            rows, cols, xarea = np.concatenate(rows), np.concatenate(cols), np.concatenate(xarea)
+        else:
+            rows, cols, xarea = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0)
+
+        if normalize == "tgt_area":
+            #same cell areas as the clipping routines
+            tgt_area = np.concatenate([pyfrenctools.grid_utils.get_grid_area(grid.x, grid.y)
+                                       for grid in self.tgt_grid.values()])
+        else:
+            tgt_area = np.bincount(rows, weights=xarea, minlength=ntgt)
+
+        self._sparse[normalize] = scipy.sparse.csr_array((xarea/tgt_area[rows], (rows, cols)), shape=(ntgt, nsrc))
+
+        return self._sparse[normalize]
+
+
+    def sum_xarea(self, src_shape: dict[str, tuple] = None, tgt_shape: dict[str, tuple] = None,
+                  src: bool = True, tgt: bool = True) -> tuple[dict, dict]:
+
+        """
+        Returns the exchange grid area summed over each source cell and over each
+        target cell of every tile as {tile: array of shape (ny, nx)}.  The shapes
+        of the tiles are taken from src_grid and tgt_grid unless provided.
+        The source or target sums are not computed, and are None, if src or tgt is False.
+        """
+
+        if self.datadict is None: raise RuntimeError("datadict is None")
+
+        src_xarea = tgt_xarea = None
+        sides = []
+        if src:
+            src_shape = _get_shapes(self.src_grid, src_shape)
+            src_xarea = {tile: np.zeros(shape, dtype=np.float64) for tile, shape in src_shape.items()}
+            sides.append((src_xarea, "src"))
+        if tgt:
+            tgt_shape = _get_shapes(self.tgt_grid, tgt_shape)
+            tgt_xarea = {tile: np.zeros(shape, dtype=np.float64) for tile, shape in tgt_shape.items()}
+            sides.append((tgt_xarea, "tgt"))
+
+        for tgt_tile in self.datadict:
+            for src_tile, xgrid_out in self.datadict[tgt_tile].items():
+                for xarea, ij in sides:
+                    tile = src_tile if ij == "src" else tgt_tile
+                    ny, nx = xarea[tile].shape
+                    index = xgrid_out[f"{ij}_j"]*nx + xgrid_out[f"{ij}_i"]
+                    xarea[tile] += np.bincount(index, weights=xgrid_out["xarea"], minlength=ny*nx).reshape(ny, nx)
+
+        return src_xarea, tgt_xarea
+
+
+    def split(self, tgt_mask: dict[str, npt.NDArray]) -> tuple["XGridObj", "XGridObj"]:
+
+        """
+        Splits an exchange grid created without a target mask into the exchange grid
+        of the target cells with tgt_mask > 0.5 and the exchange grid of the target
+        cells with 1 - tgt_mask > 0.5.  The target mask only selects the target cells
+        when clipping, so both are identical to calling create_xgrid with tgt_mask
+        and with 1 - tgt_mask but the cells are clipped once.  The GPU clipping routine
+        does not apply the target mask in the same way, so split is only available for
+        exchange grids created on the CPU.
+        """
+
+        if self.datadict is None: raise RuntimeError("datadict is None")
+        if self.on_gpu:
+            raise RuntimeError("split is only available for exchange grids created with on_gpu=False, "
+                               "call create_xgrid with tgt_mask and 1 - tgt_mask instead")
+
+        masked, unmasked = {}, {}
+        for tgt_tile in self.datadict:
+            masked[tgt_tile], unmasked[tgt_tile] = {}, {}
+            mask = np.reshape(tgt_mask[tgt_tile], -1)
+            for src_tile, xgrid_out in self.datadict[tgt_tile].items():
+                cell_mask = mask[xgrid_out["tgt_j"]*self.tgt_grid[tgt_tile].nx + xgrid_out["tgt_i"]]
+                for datadict, keep in ((masked, cell_mask > MASK_THRESH),
+                                       (unmasked, np.float64(1.0) - cell_mask > MASK_THRESH)):
+                    nxcells = np.count_nonzero(keep)
+                    if nxcells == 0: continue
+                    datadict[tgt_tile][src_tile] = {key: value[keep] for key, value in xgrid_out.items()
+                                                    if key != "nxcells"}
+                    datadict[tgt_tile][src_tile]["nxcells"] = nxcells
+
+        return (XGridObj(src_grid=self.src_grid, tgt_grid=self.tgt_grid, datadict=masked, order=self.order),
+                XGridObj(src_grid=self.src_grid, tgt_grid=self.tgt_grid, datadict=unmasked, order=self.order))
+
+
+    def create_xgrid(self, src_mask: dict[str,npt.NDArray] = None, tgt_mask: dict[str, npt.NDArray] = None,
+                     outfile: str = None, keep: bool = True) -> dict:
+
+        """
+        Generates the exchange grid of every src and tgt tile pair.  If outfile,
+        the cells of each pair are written to outfile as soon as they are generated.
+        If keep is False, the pairs are only written and not kept in datadict.
+        """
 
         if self.order not in (1,2):
             raise RuntimeError("conservative order must be 1 or 2")
 
-        if self.on_gpu:
-            create_xgrid_2dx2d_order1 = pyfrenctools.create_xgrid.get_2dx2d_order1_gpu
-        else:
-            create_xgrid_2dx2d_order1 = pyfrenctools.create_xgrid.get_2dx2d_order1
+        if self.cache_dir is not None:
+            cache_key = self._get_cache_key(src_mask, tgt_mask)
+            if self._read_cache(cache_key):
+                if outfile is not None: self.write(outfile)
+                return
 
         if self.datadict is None: self.datadict = {}
+        self._sparse = None
 
+        #bounding boxes are computed once per tile
+        src_bounds = {src_tile: _get_bounds(self.src_grid[src_tile]) for src_tile in self.src_grid}
+        tgt_bounds = {tgt_tile: _get_bounds(self.tgt_grid[tgt_tile]) for tgt_tile in self.tgt_grid}
+
+        #skip tile pairs that cannot overlap and clip only the overlapping rows and columns
+        pairs = []
         for tgt_tile in self.tgt_grid:
+            self.datadict[tgt_tile] = {}
+            for itile, src_tile in enumerate(self.src_grid, start=1):
+                src_window = _get_window(src_bounds[src_tile], tgt_bounds[tgt_tile])
+                tgt_window = _get_window(tgt_bounds[tgt_tile], src_bounds[src_tile])
+                if src_window is None or tgt_window is None: continue
+                pairs.append((tgt_tile, src_tile, itile, src_window, tgt_window))
 
-            self.datadict[tgt_tile], itile = {}, 1
+        parallel = self.nprocs > 1 and not self.on_gpu
 
-            itgt_mask = None if tgt_mask is None else tgt_mask[tgt_tile]
+        #split the source window of each pair into latitude row blocks so that
+        #a single large tile pair is also shared among the workers
+        if parallel:
+            nblocks = self.nblocks if self.nblocks is not None else -(-self.nprocs // max(len(pairs), 1))
+            tasks = []
+            for tgt_tile, src_tile, itile, src_window, tgt_window in pairs:
+                for block_window in _get_row_blocks(src_window, nblocks):
+                    block_bounds = _get_block_bounds(src_bounds[src_tile], block_window)
+                    tgt_block_window = _get_window(tgt_bounds[tgt_tile], block_bounds)
+                    if tgt_block_window is None: continue
+                    tasks.append((tgt_tile, src_tile, itile, block_window, tgt_block_window))
+        else:
+            tasks = pairs
 
-            for src_tile in self.src_grid:
+        if not parallel:
+            results = (_create_xgrid_pair(self.src_grid[src_tile],
+                                          self.tgt_grid[tgt_tile],
+                                          None if src_mask is None else src_mask[src_tile],
+                                          None if tgt_mask is None else tgt_mask[tgt_tile],
+                                          src_window, tgt_window, self.on_gpu)
+                       for tgt_tile, src_tile, itile, src_window, tgt_window in tasks)
+        elif self.executor == "thread":
+            results = self._create_xgrid_threaded(tasks, src_mask, tgt_mask)
+        elif self.executor == "process":
+            results = self._create_xgrid_parallel(tasks, src_mask, tgt_mask)
+        else:
+            raise ValueError(f"executor must be 'process' or 'thread', got {self.executor}")
 
-                isrc_mask = None if src_mask is None else src_mask[src_tile]
+        writer = self._get_writer(outfile) if outfile is not None else None
 
-                xgrid_out = create_xgrid_2dx2d_order1(
-                    src_nlon = self.src_grid[src_tile].nx,
-                    src_nlat = self.src_grid[src_tile].ny,
-                    tgt_nlon = self.tgt_grid[tgt_tile].nx,
-                    tgt_nlat = self.tgt_grid[tgt_tile].ny,
-                    src_lon=self.src_grid[src_tile].x,
-                    src_lat=self.src_grid[src_tile].y,
-                    tgt_lon=self.tgt_grid[tgt_tile].x,
-                    tgt_lat=self.tgt_grid[tgt_tile].y,
-                    src_mask=isrc_mask,
-                    tgt_mask=itgt_mask
-                )
+        def add_pair(pair: tuple, xgrid_outs: list):
+            if not xgrid_outs: return
+            tgt_tile, src_tile, itile = pair
+            #the blocks of each pair are in row order, concatenating them gives the serial result
+            if len(xgrid_outs) == 1:
+                xgrid_out = xgrid_outs[0]
+            else:
+                xgrid_out = {key: np.concatenate([block[key] for block in xgrid_outs])
+                             for key in ("src_i", "src_j", "tgt_i", "tgt_j", "xarea")}
+                xgrid_out["nxcells"] = sum(block["nxcells"] for block in xgrid_outs)
+            xgrid_out["tile"] = np.full(xgrid_out["nxcells"], itile, dtype=np.int32)
+            if writer is not None: writer.write(tgt_tile, src_tile, xgrid_out)
+            if keep: self.datadict[tgt_tile][src_tile] = xgrid_out
+
+        try:
+            pair, xgrid_outs = None, []
+            for (tgt_tile, src_tile, itile, src_window, tgt_window), xgrid_out in zip(tasks, results):
+                if (tgt_tile, src_tile, itile) != pair:
+                    add_pair(pair, xgrid_outs)
+                    pair, xgrid_outs = (tgt_tile, src_tile, itile), []
+                if xgrid_out["nxcells"] > 0: xgrid_outs.append(xgrid_out)
+            add_pair(pair, xgrid_outs)
+        finally:
+            if writer is not None: writer.close()
+
+        if self.cache_dir is not None and keep:
+            self._write_cache(cache_key)
+
+
+    def _get_cache_key(self, src_mask: dict = None, tgt_mask: dict = None) -> str:
+
+        """
+        Returns the hash of the grids, masks, order, and clipping algorithm
+        """
+
+        if self.on_gpu:
+            algorithm = "create_xgrid_2dx2d_order1_gpu"
+        else:
+            algorithm = "create_xgrid_2dx2d_order1"
+
+        sha = hashlib.sha256(f"{XGRID_CACHE_VERSION}:{algorithm}:{self.order}".encode())
+        for prefix, grid, mask in (("src", self.src_grid, src_mask), ("tgt", self.tgt_grid, tgt_mask)):
+            for tile in grid:
+                sha.update(f"{prefix}:{tile}".encode())
+                arrays = [grid[tile].x, grid[tile].y]
+                if mask is not None: arrays.append(mask[tile])
+                for array in arrays:
+                    array = np.ascontiguousarray(array)
+                    sha.update(f"{array.dtype.str}{array.shape}".encode())
+                    sha.update(array.data)
+                if mask is None: sha.update(b"nomask")
+
+        return sha.hexdigest()
+
+
+    def _read_cache(self, cache_key: str) -> bool:
+
+        """
+        Sets datadict from the cached exchange grid with cache_key.
+        Returns False if the exchange grid is not in the cache.
+        """
+
+        entry = os.path.join(self.cache_dir, cache_key)
+        if not os.path.isdir(entry): return False
+
+        self._sparse = None
+
+        itiles = {src_tile: itile for itile, src_tile in enumerate(self.src_grid, start=1)}
+
+        self.datadict = {tgt_tile: {} for tgt_tile in self.tgt_grid}
+        for ncfile in sorted(os.listdir(entry)):
+            xgrid = XGridObj(restart_remap_file=os.path.join(entry, ncfile))
+            tgt_tile, src_tile = xgrid.dataset.attrs["tgt_tile"], xgrid.dataset.attrs["src_tile"]
+            xgrid.dataset.close()
+            self.datadict[tgt_tile][src_tile] = dict(nxcells=xgrid.nxcells,
+                                                     src_i=xgrid.src_cell[:,0]-1,
+                                                     src_j=xgrid.src_cell[:,1]-1,
+                                                     tgt_i=xgrid.tgt_cell[:,0]-1,
+                                                     tgt_j=xgrid.tgt_cell[:,1]-1,
+                                                     xarea=xgrid.xarea,
+                                                     tile=np.full(xgrid.nxcells, itiles[src_tile], dtype=np.int32))
+
+        #mark the entry as most recently used
+        os.utime(entry)
+
+        return True
+
+
+    def _write_cache(self, cache_key: str):
+
+        """
+        Writes datadict to the cache under cache_key and evicts the least
+        recently used exchange grids when the cache exceeds cache_size bytes
+        """
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry = os.path.join(self.cache_dir, cache_key)
+        if os.path.isdir(entry): return
+
+        #write to a temporary directory first so that readers never see a partial entry
+        tmpdir = tempfile.mkdtemp(dir=self.cache_dir, prefix=".tmp")
+        try:
+            ipair = 0
+            for tgt_tile in self.datadict:
+                for src_tile in self.datadict[tgt_tile]:
+                    dataset = XGridObj(datadict={tgt_tile: {src_tile: self.datadict[tgt_tile][src_tile]}})
+                    dataset.to_dataset()
+                    dataset = dataset.dataset[tgt_tile][src_tile]
+                    dataset.attrs.update(tgt_tile=tgt_tile, src_tile=src_tile)
+                    dataset.to_netcdf(os.path.join(tmpdir, f"pair{ipair:06d}.nc"))
+                    ipair += 1
+            os.rename(tmpdir, entry)
+        except OSError:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+            if not os.path.isdir(entry): raise
 
-                nxcells = xgrid_out["nxcells"]
-                if nxcells > 0:
-                    xgrid_out["tile"] = np.full(nxcells, itile, dtype=np.int32)
-                    self.datadict[tgt_tile][src_tile] = xgrid_out
-                itile = itile + 1
+        _evict_cache(self.cache_dir, self.cache_size)
+
+
+    def _create_xgrid_threaded(self, tasks: list, src_mask: dict = None, tgt_mask: dict = None):
+
+        """
+        Generates the exchange grid for each task on a pool of nprocs threads.
+        The clipping releases the GIL.  Results are yielded in task order.
+        """
+
+        with ThreadPoolExecutor(max_workers=self.nprocs) as pool:
+            futures = [pool.submit(_create_xgrid_pair,
+                                   self.src_grid[src_tile],
+                                   self.tgt_grid[tgt_tile],
+                                   None if src_mask is None else src_mask[src_tile],
+                                   None if tgt_mask is None else tgt_mask[tgt_tile],
+                                   src_window, tgt_window)
+                       for tgt_tile, src_tile, itile, src_window, tgt_window in tasks]
+            for future in futures:
+                yield future.result()
+
+
+    def _create_xgrid_parallel(self, tasks: list, src_mask: dict = None, tgt_mask: dict = None):
+
+        """
+        Generates the exchange grid for each task on a pool of
+        nprocs processes.  The grids and masks are placed in shared memory once
+        and are not pickled for each task.  Results are yielded in task order.
+        """
+
+        arrays = {}
+        for prefix, grid, mask in (("src", self.src_grid, src_mask), ("tgt", self.tgt_grid, tgt_mask)):
+            for tile in grid:
+                arrays[(prefix, tile, "x")] = grid[tile].x
+                arrays[(prefix, tile, "y")] = grid[tile].y
+                if mask is not None:
+                    arrays[(prefix, tile, "mask")] = mask[tile]
+
+        shms, descriptors = to_shared_memory(arrays)
+
+        try:
+            with ProcessPoolExecutor(max_workers=self.nprocs,
+                                     initializer=_init_worker,
+                                     initargs=(descriptors,)) as pool:
+                futures = [pool.submit(_create_xgrid_worker, src_tile, tgt_tile, src_window, tgt_window)
+                           for tgt_tile, src_tile, itile, src_window, tgt_window in tasks]
+                for future in futures:
+                    yield future.result()
+        finally:
+            for shm in shms:
+                shm.close()
+                shm.unlink()
 
 
     def to_dataset_raw(self):
@@ -186,7 +679,8 @@ class XGridObj() :
 
     def _check_restart_remap_file(self):
         if self.restart_remap_file is not None :
-            check_file_is_there(self.restart_remap_file)
+            if not os.path.isdir(self.restart_remap_file):
+                check_file_is_there(self.restart_remap_file)
             self.read()
             return True
         return False
@@ -204,9 +698,11 @@ class XGridObj() :
         if self.tgt_mosaic is None: return
 
         if self.src_mosaic.grid is None:
-            self.src_mosaic.get_grid(toradians=True, agrid=self.on_agrid, free_dataset=True)
+            self.src_mosaic.get_grid(toradians=True, agrid=self.on_agrid, free_dataset=True,
+                                     variables=["x", "y"], cache=self.grid_cache)
         if self.tgt_mosaic.grid is None:
-            self.tgt_mosaic.get_grid(toradians=True, agrid=self.on_agrid, free_dataset=True)
+            self.tgt_mosaic.get_grid(toradians=True, agrid=self.on_agrid, free_dataset=True,
+                                     variables=["x", "y"], cache=self.grid_cache)
 
         self.src_grid = self.src_mosaic.grid
         self.tgt_grid = self.tgt_mosaic.grid
@@ -220,13 +716,323 @@ class XGridObj() :
         if self.src_mosaic_file is not None:
             self.src_grid = MosaicObj(input_dir=self.input_dir,
                                       mosaic_file=self.src_mosaic_file).read().get_grid(toradians=True,
-                                                                            agrid=self.on_agrid,
-                                                                            free_dataset=True)
+                                                                                        agrid=self.on_agrid,
+                                                                                        free_dataset=True,
+                                                                                        variables=["x", "y"],
+                                                                                        cache=self.grid_cache)
             self._srcinfoisthere = True
 
         if self.tgt_mosaic_file is not None:
             self.tgt_grid = MosaicObj(input_dir=self.input_dir,
                                       mosaic_file=self.tgt_mosaic_file).read().get_grid(toradians=True,
                                                                                         agrid=self.on_agrid,
-                                                                                        free_dataset=True)
+                                                                                        free_dataset=True,
+                                                                                        variables=["x", "y"],
+                                                                                        cache=self.grid_cache)
             self._tgtinfoisthere = True
+
+
+class _XGridWriter:
+
+    """
+    Appends the exchange grid cells of one tile pair at a time to the unlimited
+    nxcells dimension of a netCDF file.  tile and tgt_tile are the 1-based
+    positions of the src and tgt tiles in the src_tiles and tgt_tiles attributes.
+    The offset and number of cells of each pair are written on close.
+    """
+
+    def __init__(self, outfile: str, src_tiles: list[str], tgt_tiles: list[str],
+                 chunksize: int = 2**16, compression: str = None, complevel: int = 4):
+
+        self.src_itile = {src_tile: itile for itile, src_tile in enumerate(src_tiles, start=1)}
+        self.tgt_itile = {tgt_tile: itile for itile, tgt_tile in enumerate(tgt_tiles, start=1)}
+        self.nxcells = 0
+        self.pairs = []
+
+        self.ncfile = netCDF4.Dataset(outfile, "w")
+        self.ncfile.setncatts({"src_tiles": " ".join(src_tiles), "tgt_tiles": " ".join(tgt_tiles)})
+        self.ncfile.createDimension("nxcells", None)
+        self.ncfile.createDimension("two", 2)
+
+        options = dict(compression=compression, complevel=complevel, shuffle=compression is not None)
+        self.variables = {}
+        for name, dtype, dims, attrs in (
+                ("src_cell", np.int32, ("nxcells", "two"), {"src_cell": "parent cell indices in src mosaic"}),
+                ("tgt_cell", np.int32, ("nxcells", "two"), {"tgt_cell": "parent cell indices in tgt mosaic"}),
+                ("xarea", np.float64, ("nxcells",), {"xarea": "exchange grid area"}),
+                ("tile", np.int32, ("nxcells",), {"tile": "src tile number"}),
+                ("tgt_tile", np.int32, ("nxcells",), {"tgt_tile": "tgt tile number"})):
+            chunksizes = (chunksize,) + (2,)*(len(dims)-1)
+            self.variables[name] = self.ncfile.createVariable(name, dtype, dims, chunksizes=chunksizes, **options)
+            self.variables[name].setncatts(attrs)
+
+
+    def write(self, tgt_tile: str, src_tile: str, xgrid_out: dict):
+
+        start, end = self.nxcells, self.nxcells + xgrid_out["nxcells"]
+
+        self.variables["src_cell"][start:end] = np.column_stack((xgrid_out["src_i"]+1, xgrid_out["src_j"]+1))
+        self.variables["tgt_cell"][start:end] = np.column_stack((xgrid_out["tgt_i"]+1, xgrid_out["tgt_j"]+1))
+        self.variables["xarea"][start:end] = xgrid_out["xarea"]
+        self.variables["tile"][start:end] = np.full(end-start, self.src_itile[src_tile], dtype=np.int32)
+        self.variables["tgt_tile"][start:end] = np.full(end-start, self.tgt_itile[tgt_tile], dtype=np.int32)
+
+        self.pairs.append((self.tgt_itile[tgt_tile], self.src_itile[src_tile], start, end-start))
+        self.nxcells = end
+
+
+    def close(self):
+
+        #index of the cells of each tile pair
+        self.ncfile.createDimension("npairs", len(self.pairs))
+        pairs = np.array(self.pairs, dtype=np.int64).reshape(-1, 4)
+        for icolumn, (name, dtype, attr) in enumerate((("pair_tgt_tile", np.int32, "tgt tile number of the pair"),
+                                                       ("pair_src_tile", np.int32, "src tile number of the pair"),
+                                                       ("pair_start", np.int64, "offset of the first cell of the pair"),
+                                                       ("pair_nxcells", np.int64, "number of cells of the pair"))):
+            variable = self.ncfile.createVariable(name, dtype, ("npairs",))
+            variable.setncatts({name: attr})
+            variable[:] = pairs[:, icolumn].astype(dtype)
+
+        self.ncfile.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _get_shapes(grid: dict, shape: dict = None) -> dict:
+
+    """
+    Returns shape if provided, else the (ny, nx) of each tile in grid
+    """
+
+    if shape is not None: return shape
+    if grid is None: raise RuntimeError("the shape of the tiles are required")
+
+    return {tile: (grid[tile].ny, grid[tile].nx) for tile in grid}
+
+
+def _get_offsets(grid: dict) -> tuple[dict, int]:
+
+    """
+    Returns the index of the first cell of each tile when the cells
+    of all tiles are numbered consecutively, and the number of cells
+    """
+
+    offsets, ncells = {}, 0
+    for tile in grid:
+        offsets[tile] = ncells
+        ncells += grid[tile].nx*grid[tile].ny
+
+    return offsets, ncells
+
+
+def _evict_cache(cache_dir: str, cache_size: int):
+
+    """
+    Removes the least recently used exchange grids in cache_dir
+    until the cache is at most cache_size bytes
+    """
+
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if not entry.is_dir() or entry.name.startswith("."): continue
+        nbytes = sum(ifile.stat().st_size for ifile in os.scandir(entry.path))
+        entries.append((entry.stat().st_mtime, nbytes, entry.path))
+
+    total = sum(nbytes for mtime, nbytes, path in entries)
+    for mtime, nbytes, path in sorted(entries):
+        if total <= cache_size: break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= nbytes
+
+
+def _get_bounds(grid: GridObj) -> dict:
+
+    """
+    Returns the 3D Cartesian bounding box of the tile and of each of its
+    cells on the unit sphere.  Each cell box is padded by the largest
+    distance between the cell vertices so that the box contains the whole
+    cell and not only its vertices.
+    """
+
+    lon, lat = np.asarray(grid.x, dtype=np.float64), np.asarray(grid.y, dtype=np.float64)
+    coslat = np.cos(lat)
+    xyz = (coslat*np.cos(lon), coslat*np.sin(lon), np.sin(lat))
+
+    #largest distance between the four vertices of each cell
+    corners = [(slice(None,-1), slice(None,-1)), (slice(None,-1), slice(1,None)),
+               (slice(1,None), slice(1,None)), (slice(1,None), slice(None,-1))]
+    pad = np.zeros((lon.shape[0]-1, lon.shape[1]-1), dtype=np.float64)
+    for n in range(4):
+        for m in range(n+1, 4):
+            dist2 = sum((icoord[corners[n]] - icoord[corners[m]])**2 for icoord in xyz)
+            np.maximum(pad, dist2, out=pad)
+    np.sqrt(pad, out=pad)
+
+    cell_min, cell_max = [], []
+    for icoord in xyz:
+        cell_min.append(np.minimum.reduce([icoord[corner] for corner in corners]) - pad)
+        cell_max.append(np.maximum.reduce([icoord[corner] for corner in corners]) + pad)
+
+    tile_min = np.array([icell.min() for icell in cell_min])
+    tile_max = np.array([icell.max() for icell in cell_max])
+
+    return dict(cell_min=cell_min, cell_max=cell_max, tile_min=tile_min, tile_max=tile_max)
+
+
+def _get_window(bounds: dict, other_bounds: dict) -> Optional[tuple[int, int, int, int]]:
+
+    """
+    Returns (jstart, jend, istart, iend) of the smallest block of cells
+    that contains every cell that may overlap the tile with other_bounds.
+    Returns None if no cell can overlap.
+    """
+
+    if np.any(bounds["tile_min"] > other_bounds["tile_max"]) or \
+       np.any(bounds["tile_max"] < other_bounds["tile_min"]):
+        return None
+
+    overlap = np.ones(bounds["cell_min"][0].shape, dtype=bool)
+    for k in range(3):
+        overlap &= bounds["cell_min"][k] <= other_bounds["tile_max"][k]
+        overlap &= bounds["cell_max"][k] >= other_bounds["tile_min"][k]
+
+    rows, cols = np.flatnonzero(overlap.any(axis=1)), np.flatnonzero(overlap.any(axis=0))
+    if rows.size == 0: return None
+
+    return rows[0], rows[-1]+1, cols[0], cols[-1]+1
+
+
+def _get_row_blocks(window: tuple[int, int, int, int], nblocks: int) -> list[tuple[int, int, int, int]]:
+
+    """
+    Splits the rows of window into at most nblocks blocks of consecutive rows
+    """
+
+    jstart, jend, istart, iend = window
+    edges = np.linspace(jstart, jend, min(nblocks, jend-jstart)+1).astype(int)
+
+    return [(edges[n], edges[n+1], istart, iend) for n in range(len(edges)-1)]
+
+
+def _get_block_bounds(bounds: dict, window: tuple[int, int, int, int]) -> dict:
+
+    """
+    Returns the bounds of the block of cells in window
+    """
+
+    jstart, jend, istart, iend = window
+    cell_min = [icell[jstart:jend, istart:iend] for icell in bounds["cell_min"]]
+    cell_max = [icell[jstart:jend, istart:iend] for icell in bounds["cell_max"]]
+
+    tile_min = np.array([icell.min() for icell in cell_min])
+    tile_max = np.array([icell.max() for icell in cell_max])
+
+    return dict(cell_min=cell_min, cell_max=cell_max, tile_min=tile_min, tile_max=tile_max)
+
+
+def _get_window_data(grid: GridObj, mask: npt.NDArray, window: tuple[int, int, int, int]):
+
+    """
+    Returns contiguous lon, lat, and mask of the block of cells in window
+    """
+
+    jstart, jend, istart, iend = window
+    ny, nx = grid.ny, grid.nx
+
+    if mask is not None:
+        mask = np.ascontiguousarray(np.reshape(mask, (ny, nx))[jstart:jend, istart:iend], dtype=np.float64)
+
+    if (jstart, jend, istart, iend) == (0, ny, 0, nx):
+        return grid.x, grid.y, mask
+
+    lon = np.ascontiguousarray(grid.x[jstart:jend+1, istart:iend+1])
+    lat = np.ascontiguousarray(grid.y[jstart:jend+1, istart:iend+1])
+
+    return lon, lat, mask
+
+
+def _create_xgrid_pair(src_grid: GridObj,
+                       tgt_grid: GridObj,
+                       src_mask: npt.NDArray,
+                       tgt_mask: npt.NDArray,
+                       src_window: tuple[int, int, int, int],
+                       tgt_window: tuple[int, int, int, int],
+                       on_gpu: bool = False) -> dict:
+
+    """
+    Returns the exchange grid between the src_window block of src_grid
+    and the tgt_window block of tgt_grid with indices relative to the tiles
+    """
+
+    if on_gpu:
+        create_xgrid_2dx2d_order1 = pyfrenctools.create_xgrid.get_2dx2d_order1_gpu
+    else:
+        create_xgrid_2dx2d_order1 = pyfrenctools.create_xgrid.get_2dx2d_order1
+
+    src_lon, src_lat, src_mask = _get_window_data(src_grid, src_mask, src_window)
+    tgt_lon, tgt_lat, tgt_mask = _get_window_data(tgt_grid, tgt_mask, tgt_window)
+    src_jstart, src_jend, src_istart, src_iend = src_window
+    tgt_jstart, tgt_jend, tgt_istart, tgt_iend = tgt_window
+
+    xgrid_out = create_xgrid_2dx2d_order1(
+        src_nlon = src_iend - src_istart,
+        src_nlat = src_jend - src_jstart,
+        tgt_nlon = tgt_iend - tgt_istart,
+        tgt_nlat = tgt_jend - tgt_jstart,
+        src_lon=src_lon,
+        src_lat=src_lat,
+        tgt_lon=tgt_lon,
+        tgt_lat=tgt_lat,
+        src_mask=src_mask,
+        tgt_mask=tgt_mask
+    )
+
+    xgrid_out["src_i"] += src_istart
+    xgrid_out["src_j"] += src_jstart
+    xgrid_out["tgt_i"] += tgt_istart
+    xgrid_out["tgt_j"] += tgt_jstart
+
+    return xgrid_out
+
+
+_worker_shms = []
+_worker_arrays = {}
+
+def _init_worker(descriptors: dict):
+
+    """
+    Attaches the worker process to the shared memory blocks in descriptors
+    """
+
+    shms, arrays = attach_shared_memory(descriptors)
+    _worker_shms.extend(shms)
+    _worker_arrays.update(arrays)
+
+
+def _get_worker_grid(prefix: str, tile: str) -> tuple[GridObj, npt.NDArray]:
+
+    grid = GridObj()
+    grid.x = _worker_arrays[(prefix, tile, "x")]
+    grid.y = _worker_arrays[(prefix, tile, "y")]
+    grid.nyp, grid.nxp = grid.x.shape
+    grid.ny, grid.nx = grid.nyp - 1, grid.nxp - 1
+
+    return grid, _worker_arrays.get((prefix, tile, "mask"))
+
+
+def _create_xgrid_worker(src_tile: str,
+                         tgt_tile: str,
+                         src_window: tuple[int, int, int, int],
+                         tgt_window: tuple[int, int, int, int]) -> dict:
+
+    src_grid, src_mask = _get_worker_grid("src", src_tile)
+    tgt_grid, tgt_mask = _get_worker_grid("tgt", tgt_tile)
+
+    return _create_xgrid_pair(src_grid, tgt_grid, src_mask, tgt_mask, src_window, tgt_window)
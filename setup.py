@@ -25,6 +25,7 @@ requirements: List[str] = [
     "h5netcdf",
     "h5py",
     "numpy",
+    "scipy",
     "xarray",
     "netCDF4",
     local_pkg("pyFMS", "pyFMS"),
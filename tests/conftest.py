@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+import fmsgridtools
+
+
+@pytest.fixture
+def make_gridobj():
+
+    """
+    Returns a function that makes a GridObj of nx by ny cells spanning
+    xstart to xend and ystart to yend in degrees, with x and y in radians
+    """
+
+    def make(xstart, xend, ystart, yend, nx, ny):
+
+        x, y = np.meshgrid(np.linspace(xstart, xend, nx+1), np.linspace(ystart, yend, ny+1))
+
+        grid = fmsgridtools.GridObj()
+        grid.x, grid.y = np.radians(x), np.radians(y)
+        grid.nx, grid.ny = nx, ny
+
+        return grid
+
+    return make
+
+
+@pytest.fixture
+def src_grid(make_gridobj):
+
+    """
+    Two source tiles side by side, 0 to 90 and 90 to 180 degrees in x
+    """
+
+    return {"tile1": make_gridobj(0, 90, -30, 30, 30, 20),
+            "tile2": make_gridobj(90, 180, -30, 30, 30, 20)}
+
+
+@pytest.fixture
+def tgt_grid(make_gridobj):
+
+    """
+    Two target tiles that overlap both tiles of src_grid and each other
+    """
+
+    return {"tile1": make_gridobj(45, 135, -20, 20, 25, 15),
+            "tile2": make_gridobj(60, 100, -40, 10, 20, 25)}
+
+
+@pytest.fixture
+def ocn_grid(make_gridobj):
+
+    """
+    One target tile covering most of src_grid and extending past it in y
+    """
+
+    return {"tile1": make_gridobj(10, 170, -40, 30, 70, 50)}
@@ -1,9 +1,13 @@
+from multiprocessing import shared_memory
 from pathlib import Path
+import gc
 from click.testing import CliRunner
 from fmsgridtools.main import main
-from fmsgridtools.make_hgrid.hgridobj import HGridObj
+from fmsgridtools.make_hgrid.hgridobj import HGridObj, fill_cubic_grid_halo
 from numpy.typing import NDArray
 import numpy as np
+import xarray as xr
+import pytest
 
 
 # Test `fmsgridtools make-hgrid`
@@ -129,6 +133,75 @@ def test_make_grid_info_gnomonic_ed():
     assert_grid_shape_and_size(grid, ntiles, grid_size, nsuper, narea, dx_size, dx_size)
 
 
+
+def test_make_grid_info_scratch_dir(tmp_path):
+    grid = HGridObj()
+
+    ntiles = 6
+    grid_size = 96
+    nlon = np.array([grid_size], dtype=np.int32)
+    grid.make_grid_info(nlon=nlon, ntiles=ntiles, ntiles_global=6,
+                        grid_type="GNOMONIC_ED", conformal=False, scratch_dir=str(tmp_path))
+
+    nsuper = (grid_size + 1) * (grid_size + 1) * ntiles
+    narea = (grid_size) * (grid_size) * ntiles
+    dx_size = (grid_size) * (grid_size + 1) * ntiles # Same as dy
+    assert_grid_shape_and_size(grid, ntiles, grid_size, nsuper, narea, dx_size, dx_size)
+    assert isinstance(grid.x, np.memmap)
+    assert list(tmp_path.iterdir()) == []
+
+    #every buffer is mapped to its own unlinked file in scratch_dir
+    if Path("/proc/self/maps").exists():
+        maps = Path("/proc/self/maps").read_text().splitlines()
+        scratch = {line.split()[-2] for line in maps if str(tmp_path) in line and line.endswith("(deleted)")}
+        assert len(scratch) == 7
+
+def test_make_grid_info_nprocs(tmp_path):
+    grid = HGridObj()
+
+    ntiles = 6
+    grid_size = 4
+    nlon = np.array([grid_size], dtype=np.int32)
+    grid.make_grid_info(nlon=nlon, ntiles=ntiles, ntiles_global=6,
+                        grid_type="GNOMONIC_ED", conformal=False, nprocs=2)
+    assert sorted(grid.shms) == ["angle_dx", "angle_dy", "area", "dx", "dy", "x", "y"]
+
+    rng = np.random.default_rng(0)
+    for key in grid.shms:
+        getattr(grid, key)[:] = rng.random(getattr(grid, key).size)
+
+    settings = dict(grid_type="gnomonic_ed", ntiles=ntiles, conformal=False)
+    grid.write_out_hgrid(grid_name=str(tmp_path/"serial"), **settings)
+    grid.write_out_hgrid(grid_name=str(tmp_path/"parallel"), nprocs=2, **settings)
+    for n in range(1, ntiles+1):
+        with xr.open_dataset(tmp_path/f"serial.tile{n}.nc") as ds1, xr.open_dataset(tmp_path/f"parallel.tile{n}.nc") as ds2:
+            for key in grid.shms:
+                np.testing.assert_array_equal(ds1[key].values, ds2[key].values)
+
+    with pytest.raises(ValueError):
+        HGridObj().make_grid_info(nlon=nlon, ntiles=ntiles, ntiles_global=6, grid_type="GNOMONIC_ED",
+                                  scratch_dir=str(tmp_path), nprocs=2)
+
+    #the shared memory blocks are removed with the grid
+    names = [shm.name for shm in grid.shms.values()]
+    del grid
+    gc.collect()
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+def test_make_hgrid_gnomonic_scratch_dir_nprocs(tmp_path):
+    runner = CliRunner()
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        result = runner.invoke(main, ['make-hgrid', 'gnomonic',
+                                      '--nlon',  '96',
+                                      '--scratch_dir', '.',
+                                      '--nprocs', '2',])
+        assert result.exit_code != 0
+        assert "--scratch_dir cannot be used with --nprocs > 1" in str(result.exception)
+        assert list(Path(".").iterdir()) == []
+
 def test_make_grid_info_gnomonic_ed_nest():
     grid = HGridObj()
 
@@ -222,6 +295,33 @@ def test_make_grid_info_lat_lon():
                                nxl_values=nlon, nyl_values=nlat)
 
 
+def test_fill_cubic_grid_halo():
+
+    nx, ny, halo = 4, 4, 1
+    nxp, nyp = nx+1, ny+1
+    data_all = np.arange(6*nxp*nyp, dtype=np.float64)
+    tiles = data_all.reshape((6, nyp, nxp))
+
+    #odd tile, west and north neighbours share the orientation
+    data = np.zeros((nyp+2*halo)*(nxp+2*halo), dtype=np.float64)
+    fill_cubic_grid_halo(nx, ny, halo, data, data_all, data_all, 1, 1, 1)
+    data = data.reshape((nyp+2*halo, nxp+2*halo))
+    assert np.array_equal(data[1:-1, 1:-1], tiles[1])
+    assert np.array_equal(data[1:-1, 0], tiles[0][:, nx-1])
+    assert np.array_equal(data[-1, 1:-1], tiles[2][1])
+    assert np.array_equal(data[0, 1:-1], data_all[5*nxp*nyp:][(nxp-1-np.arange(nxp))*nyp+nx-1])
+    assert np.all(data[[0, 0, -1, -1], [0, -1, 0, -1]] == -9999.)
+
+    #even tile, east and south neighbours share the orientation
+    data = np.zeros((nyp+2*halo)*(nxp+2*halo), dtype=np.float64)
+    fill_cubic_grid_halo(nx, ny, halo, data, data_all, data_all, 0, 1, 1)
+    data = data.reshape((nyp+2*halo, nxp+2*halo))
+    assert np.array_equal(data[1:-1, 1:-1], tiles[0])
+    assert np.array_equal(data[1:-1, -1], tiles[1][:, 1])
+    assert np.array_equal(data[0, 1:-1], tiles[5][ny-1])
+    assert np.array_equal(data[1:-1, 0], tiles[4].ravel()[(ny-1)*nxp:(ny-1)*nxp+nyp][::-1])
+
+
 def assert_grid_shape_and_size(grid, ntiles, grid_size, nsuper, narea, dx_size, dy_size,
                                nxl_values: NDArray=None, nyl_values: NDArray=None):
     if nxl_values is None:
@@ -255,3 +355,39 @@ def assert_grid_shape_and_size(grid, ntiles, grid_size, nsuper, narea, dx_size,
     assert grid.dy.size == dy_size, f"grid.dy.size mismatch: expected {dy_size}, got {grid.dy.size}"
     assert grid.angle_dx.size == nsuper, f"grid.angle_dx.size mismatch: expected {nsuper}, got {grid.angle_dx.size}"
     assert grid.angle_dy.size == nsuper, f"grid.angle_dy.size mismatch: expected {nsuper}, got {grid.angle_dy.size}"
+
+
+def test_write_out_hgrid_nprocs(tmp_path):
+
+    nx, ntiles = 4, 6
+    nxp = nx + 1
+    rng = np.random.default_rng(0)
+
+    grid = HGridObj()
+    grid.nxl = np.full(ntiles, nx, dtype=np.int32)
+    grid.nyl = np.full(ntiles, nx, dtype=np.int32)
+    grid.arcx = "small_circle"
+    grid.x = rng.random(ntiles*nxp*nxp)
+    grid.y = rng.random(ntiles*nxp*nxp)
+    grid.dx = rng.random(ntiles*nx*nxp)
+    grid.dy = rng.random(ntiles*nxp*nx)
+    grid.area = rng.random(ntiles*nx*nx)
+    grid.angle_dx = rng.random(ntiles*nxp*nxp)
+    grid.angle_dy = rng.random(ntiles*nxp*nxp)
+
+    for out_halo in (0, 1):
+        serial = str(tmp_path/f"serial{out_halo}")
+        parallel = str(tmp_path/f"parallel{out_halo}")
+        settings = dict(grid_type="gnomonic_ed", ntiles=ntiles, conformal=False, out_halo=out_halo)
+        grid.write_out_hgrid(grid_name=serial, **settings)
+        last_tile = grid.dataset["x"].values
+        grid.write_out_hgrid(grid_name=parallel, nprocs=3, compression="zlib", **settings)
+        #the last tile is kept for make_gridobj as in the serial write
+        np.testing.assert_array_equal(grid.dataset["x"].values, last_tile)
+        grid.dataset.close()
+
+        for n in range(1, ntiles+1):
+            with xr.open_dataset(f"{serial}.tile{n}.nc") as ds1, xr.open_dataset(f"{parallel}.tile{n}.nc") as ds2:
+                assert ds2["x"].encoding["zlib"]
+                for key in ("x", "y", "dx", "dy", "area", "angle_dx", "angle_dy"):
+                    np.testing.assert_array_equal(ds1[key].values, ds2[key].values)
@@ -1,7 +1,10 @@
+import os
+
 import numpy as np
 import xarray as xr
 
 import fmsgridtools
+import pyfrenctools
 
 def test_make_coupler_mosaic():
 
@@ -21,6 +24,106 @@ def test_make_coupler_mosaic():
                                      on_gpu=True)
 
 
+def test_get_atmxlnd(tmp_path, monkeypatch, src_grid, ocn_grid):
+
+    monkeypatch.chdir(tmp_path)
+
+    atm_mosaic = fmsgridtools.MosaicObj(grid=src_grid)
+    lnd_mask = {"tile1": (np.random.default_rng(1).random(70*50) > 0.5).astype(np.float64)}
+
+    atmxocn_landpart = fmsgridtools.XGridObj(src_grid=atm_mosaic.grid, tgt_grid=ocn_grid)
+    atmxocn_landpart.create_xgrid(tgt_mask=lnd_mask)
+    atmxlnd = fmsgridtools.coupler_mosaic.get_atmxlnd(atmxocn_landpart, atm_mosaic=atm_mosaic)
+
+    for atmtile, atm_grid in atm_mosaic.grid.items():
+        xgrid = atmxocn_landpart.datadict["tile1"][atmtile]
+        atm_area = pyfrenctools.grid_utils.get_grid_area(atm_grid.x, atm_grid.y).reshape(atm_grid.ny, atm_grid.nx)
+
+        answer = np.zeros((atm_grid.ny, atm_grid.nx))
+        for i, j, xarea in zip(xgrid["src_i"], xgrid["src_j"], xgrid["xarea"]):
+            if xarea/atm_area[j, i] > 1.e-6: answer[j, i] += xarea
+
+        result = atmxlnd.datadict[atmtile][atmtile]
+        j, i = np.nonzero(answer)
+        assert result["nxcells"] == i.size
+        assert np.array_equal(result["src_i"], i) and np.array_equal(result["tgt_i"], i)
+        assert np.array_equal(result["src_j"], j) and np.array_equal(result["tgt_j"], j)
+        assert np.array_equal(result["xarea"], answer[j, i])
+        assert os.path.exists(f"land_mask_{atmtile}.nc")
+
+
+def test_get_atmxlnd_ocean_tiles(tmp_path, monkeypatch, make_gridobj, src_grid):
+
+    monkeypatch.chdir(tmp_path)
+
+    #two ocean tiles that both overlap both atm tiles
+    ocn_grid = {"tile1": make_gridobj(10, 100, -40, 30, 36, 50),
+                "tile2": make_gridobj(80, 170, -40, 30, 36, 50)}
+    lnd_mask = {tile: (np.random.default_rng(i).random(36*50) > 0.5).astype(np.float64)
+                for i, tile in enumerate(ocn_grid)}
+
+    atm_mosaic = fmsgridtools.MosaicObj(grid=src_grid)
+    atmxocn_landpart = fmsgridtools.XGridObj(src_grid=atm_mosaic.grid, tgt_grid=ocn_grid)
+    atmxocn_landpart.create_xgrid(tgt_mask=lnd_mask)
+    atmxlnd = fmsgridtools.coupler_mosaic.get_atmxlnd(atmxocn_landpart, atm_mosaic=atm_mosaic)
+
+    for atmtile, atm_grid in atm_mosaic.grid.items():
+        atm_area = pyfrenctools.grid_utils.get_grid_area(atm_grid.x, atm_grid.y).reshape(atm_grid.ny, atm_grid.nx)
+
+        #the land area of each atm cell is summed over both ocean tiles
+        answer, last = np.zeros((atm_grid.ny, atm_grid.nx)), np.zeros((atm_grid.ny, atm_grid.nx))
+        for otile in ocn_grid:
+            xgrid = atmxocn_landpart.datadict[otile][atmtile]
+            for i, j, xarea in zip(xgrid["src_i"], xgrid["src_j"], xgrid["xarea"]):
+                if xarea/atm_area[j, i] > 1.e-6:
+                    answer[j, i] += xarea
+                    if otile == "tile2": last[j, i] += xarea
+
+        result = atmxlnd.datadict[atmtile][atmtile]
+        j, i = np.nonzero(answer)
+        assert np.array_equal(result["src_i"], i) and np.array_equal(result["src_j"], j)
+        assert np.allclose(result["xarea"], answer[j, i])
+        assert not np.allclose(answer, last)
+
+
+
+def write_supergrid(grid, gridfile):
+
+    #only the A-grid points are read back with agrid=True
+    x, y = np.zeros((2*grid.ny+1, 2*grid.nx+1)), np.zeros((2*grid.ny+1, 2*grid.nx+1))
+    x[::2, ::2], y[::2, ::2] = np.degrees(grid.x), np.degrees(grid.y)
+    xr.Dataset(data_vars=dict(x=(["nyp", "nxp"], x), y=(["nyp", "nxp"], y))).to_netcdf(gridfile)
+
+
+def test_cached_grids_are_not_modified(tmp_path, monkeypatch, src_grid, ocn_grid):
+
+    monkeypatch.chdir(tmp_path)
+
+    #read the grids through the grid cache as coupler_mosaic.make does
+    mosaics = {}
+    for name, grids in (("atm", src_grid), ("ocn", ocn_grid)):
+        gridfiles = [f"{name}.{tile}.nc" for tile in grids]
+        for grid, gridfile in zip(grids.values(), gridfiles): write_supergrid(grid, tmp_path/gridfile)
+        mosaics[name] = fmsgridtools.MosaicObj(input_dir=str(tmp_path), ntiles=len(grids),
+                                               gridtiles=list(grids), gridfiles=gridfiles)
+        mosaics[name].get_grid(toradians=True, agrid=True, free_dataset=True, variables=["x", "y"], cache=True)
+
+    original = {(name, tile, key): getattr(grid, key).copy() for name, mosaic in mosaics.items()
+                for tile, grid in mosaic.grid.items() for key in ("x", "y")}
+
+    xgrid = fmsgridtools.XGridObj(src_grid=mosaics["atm"].grid, tgt_grid=mosaics["ocn"].grid)
+    xgrid.create_xgrid()
+    xgrid.sum_xarea()
+    xgrid.to_sparse()
+    ocean, land = xgrid.split(tgt_mask={"tile1": np.random.default_rng(0).random((50, 70))})
+    fmsgridtools.coupler_mosaic.get_atmxlnd(land, atm_mosaic=mosaics["atm"])
+
+    for (name, tile, key), value in original.items():
+        array = getattr(mosaics[name].grid[tile], key)
+        assert not array.flags.writeable
+        assert np.array_equal(array, value)
+
+
 if __name__ == "__main__":
     test_make_coupler_mosaic()
 
@@ -75,11 +75,47 @@ def test_gridfiles():
     os.remove(output)
 
     
-def test_getgrid():
+def test_getgrid(tmp_path):
 
-    for ifile in gridfiles: make_grid(ifile)
-    mosaic = fmsgridtools.MosaicObj(ntiles=ntiles, gridtiles=gridtiles, gridfiles=gridfiles)
-    mosaic.get_grid(toradians=True, agrid=True, free_dataset=True)
+    for ifile in gridfiles: make_grid(tmp_path / ifile)
+    mosaic = fmsgridtools.MosaicObj(input_dir=str(tmp_path), ntiles=ntiles, gridtiles=gridtiles, gridfiles=gridfiles)
+    mosaic.get_grid(toradians=True, agrid=True, free_dataset=True, nthreads=4)
+    assert list(mosaic.grid.keys()) == gridtiles
+
+    serial = fmsgridtools.MosaicObj(input_dir=str(tmp_path), ntiles=ntiles, gridtiles=gridtiles, gridfiles=gridfiles)
+    serial.get_grid(toradians=True, agrid=True, free_dataset=True)
+    for tile in gridtiles:
+        assert serial.grid[tile] is not mosaic.grid[tile]
+        assert np.array_equal(mosaic.grid[tile].x, serial.grid[tile].x)
+        assert np.array_equal(mosaic.grid[tile].y, serial.grid[tile].y)
+
+    subset = fmsgridtools.MosaicObj(input_dir=str(tmp_path), ntiles=ntiles, gridtiles=gridtiles, gridfiles=gridfiles)
+    subset.get_grid(tiles=["tile4", "tile1"])
+    assert list(subset.grid.keys()) == ["tile4", "tile1"]
+
+    with pytest.raises(ValueError):
+        subset.get_grid(tiles=["tile6"])
+
+
+def test_getgrid_cache(tmp_path):
+
+    for ifile in gridfiles: make_grid(tmp_path / ifile)
+    mosaic = fmsgridtools.MosaicObj(input_dir=str(tmp_path), ntiles=ntiles, gridtiles=gridtiles, gridfiles=gridfiles)
+
+    first = mosaic.get_grid(free_dataset=True, cache=True)["tile2"]
+    assert mosaic.get_grid(free_dataset=True, cache=True)["tile2"] is first
+    assert mosaic.get_grid(free_dataset=True)["tile2"] is not first
+
+    #rewrite tile2 with new values, the cached grid must not be returned
+    xy = np.arange(0, grid_size+1, dtype=np.float64) + 100.0
+    xr.Dataset(data_vars=dict(x=xr.DataArray(np.tile(xy, (grid_size+1, 1)), dims=["nyp", "nxp"]),
+                              y=xr.DataArray(np.tile(xy, (grid_size+1, 1)), dims=["nyp", "nxp"]))
+    ).to_netcdf(tmp_path / "grid.tile2.nc")
+    os.utime(tmp_path / "grid.tile2.nc", ns=(0, 0))
+
+    second = mosaic.get_grid(free_dataset=True, cache=True)["tile2"]
+    assert second is not first
+    assert np.array_equal(second.x, np.tile(xy, (grid_size+1, 1)))
     
     
 def test_solo_mosaic():
@@ -0,0 +1,53 @@
+import numpy as np
+import xarray as xr
+
+import fmsgridtools
+from fmsgridtools.remap import conservative
+
+
+def test_remap_file(tmp_path, make_gridobj):
+
+    nt, nk, ny, nx = 5, 3, 20, 30
+
+    src_grid = {"tile1": make_gridobj(0, 90, -30, 30, nx, ny)}
+    tgt_grid = {"tile1": make_gridobj(0, 90, -30, 30, nx//2, ny//2)}
+    xgrid = fmsgridtools.XGridObj(src_grid=src_grid, tgt_grid=tgt_grid)
+    xgrid.create_xgrid()
+
+    rng = np.random.default_rng(0)
+    temp = rng.random((nt, nk, ny, nx))
+    temp[:, :, 0:2, 0:2] = np.nan
+    temp[:, :, 4, 4] = np.nan
+    ps = rng.random((nt, ny, nx))
+
+    infile, outfile = str(tmp_path/"input.nc"), str(tmp_path/"output.nc")
+    xr.Dataset(data_vars=dict(temp=(["time", "pfull", "grid_yt", "grid_xt"], temp),
+                              ps=(["time", "grid_yt", "grid_xt"], ps)),
+               coords=dict(time=np.arange(nt, dtype=np.float64),
+                           pfull=("pfull", np.arange(nk, dtype=np.float64), {"axis": "Z"}))
+    ).to_netcdf(infile, unlimited_dims=["time"])
+
+    conservative.remap_file(xgrid, "tile1", {"tile1": infile}, outfile, kbounds=[2, 3], tbounds=[2, 4])
+
+    #area weighted mean of the 2x2 source cells in each target cell
+    xgrid_out = xgrid.datadict["tile1"]["tile1"]
+    src_cells = (xgrid_out["src_j"], xgrid_out["src_i"])
+    tgt_cells = (xgrid_out["tgt_j"], xgrid_out["tgt_i"])
+
+    def expected(data):
+        values = data[..., src_cells[0], src_cells[1]]
+        xarea = np.where(np.isnan(values), 0.0, xgrid_out["xarea"])
+        numerator = np.zeros(data.shape[:-2] + (ny//2, nx//2))
+        denominator = np.zeros(data.shape[:-2] + (ny//2, nx//2))
+        np.add.at(numerator, (..., tgt_cells[0], tgt_cells[1]), np.nan_to_num(values)*xarea)
+        np.add.at(denominator, (..., tgt_cells[0], tgt_cells[1]), xarea)
+        return np.where(denominator > 0.0, numerator/np.where(denominator > 0.0, denominator, 1.0), np.nan)
+
+    with xr.open_dataset(outfile) as output:
+        assert output.sizes == {"time": 3, "pfull": 2, "grid_yt": ny//2, "grid_xt": nx//2}
+        assert np.array_equal(output["time"].values, np.arange(1, 4))
+        assert np.array_equal(output["pfull"].values, np.arange(1, 3))
+        assert np.allclose(output["temp"].values, expected(temp[1:4, 1:3]), equal_nan=True, rtol=1e-12)
+        assert np.allclose(output["ps"].values, expected(ps[1:4]), rtol=1e-12)
+        #only the first target cell has no valid source cells
+        assert np.isnan(output["temp"].values).sum() == 3*2
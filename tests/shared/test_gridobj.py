@@ -187,3 +187,77 @@ def test_gridobj_read(tmp_path):
             assert grid.y[i][j] == np.radians(-answer)
 
     os.remove(gridfile)
+
+
+def test_gridobj_read_variables(tmp_path):
+
+    gridfile = tmp_path / "test_grid.nc"
+
+    out_grid_dataset.to_netcdf(gridfile)
+
+    grid = GridObj(gridfile=gridfile).read(variables=["x", "y"])
+
+    np.testing.assert_array_equal(grid.x, out_grid_dataset.x.values)
+    np.testing.assert_array_equal(grid.y, out_grid_dataset.y.values)
+    assert grid.dx is None
+    assert grid.area is None
+    assert grid.nx == nx
+
+
+def test_gridobj_read_toradians_keeps_dataset(tmp_path):
+
+    gridfile = tmp_path / "test_grid.nc"
+
+    out_grid_dataset.to_netcdf(gridfile)
+
+    grid = GridObj(gridfile=gridfile).read(toradians=True)
+
+    np.testing.assert_array_equal(grid.x, np.radians(out_grid_dataset.x.values))
+    np.testing.assert_array_equal(grid.dataset.x.values, out_grid_dataset.x.values)
+    np.testing.assert_array_equal(grid.dataset.y.values, out_grid_dataset.y.values)
+
+    
+def test_gridobj_read_lazy(tmp_path):
+
+    gridfile = tmp_path / "test_grid.nc"
+
+    out_grid_dataset.to_netcdf(gridfile)
+
+    grid = GridObj(gridfile=gridfile).read(toradians=True, free_dataset=True, lazy=True)
+
+    assert grid.dataset is None
+    assert "area" not in grid.__dict__
+    
+    np.testing.assert_array_equal(grid.x, np.radians(out_grid_dataset.x.values))
+    np.testing.assert_array_equal(grid.area, out_grid_dataset.area.values)
+    assert "area" in grid.__dict__
+
+
+def test_read_grid_cache(tmp_path):
+
+    from fmsgridtools.shared.gridobj import clear_grid_cache, read_grid
+
+    gridfile = str(tmp_path / "test_grid.nc")
+
+    out_grid_dataset.to_netcdf(gridfile)
+
+    grid = read_grid(gridfile, toradians=True, agrid=True, free_dataset=True, cache=True)
+    assert read_grid(gridfile, toradians=True, agrid=True, free_dataset=True, cache=True) is grid
+    assert read_grid(gridfile, toradians=False, agrid=True, free_dataset=True, cache=True) is not grid
+    assert read_grid(gridfile, toradians=True, agrid=True, free_dataset=True, lazy=True, cache=True) is not grid
+    assert not grid.x.flags.writeable
+
+    #the cache is opt-in, grids read without it are private and writeable
+    private = read_grid(gridfile, toradians=True, agrid=True, free_dataset=True)
+    assert private is not grid
+    assert private.x.flags.writeable
+
+    #a modified file is read again
+    out_grid_dataset.assign(x=out_grid_dataset.x + 1.0).to_netcdf(gridfile)
+    os.utime(gridfile, ns=(0, 0))
+    modified = read_grid(gridfile, toradians=True, agrid=True, free_dataset=True, cache=True)
+    assert modified is not grid
+    np.testing.assert_array_equal(modified.x, np.radians(out_grid_dataset.x.values[::2, ::2] + 1.0))
+
+    clear_grid_cache()
+    assert read_grid(gridfile, toradians=True, agrid=True, free_dataset=True, cache=True) is not modified
@@ -0,0 +1,72 @@
+import subprocess
+import sys
+
+#the workflow engine spawns the fmsgridtools command line thousands of times
+HEAVY_MODULES = ["xarray", "pyfms", "pyfrenctools", "git", "pkg_resources", "netCDF4", "scipy"]
+
+
+def run_python(code: str) -> str:
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+
+
+def test_cli_import_is_lazy():
+
+    """
+    Importing the command line does not import the heavy dependencies
+    """
+
+    code = f"""
+import sys
+import fmsgridtools.main
+print(*[module for module in {HEAVY_MODULES} if module in sys.modules])
+"""
+
+    assert run_python(code).split() == []
+
+
+def test_cli_help_is_lazy():
+
+    """
+    Listing the commands of a group does not import the heavy dependencies
+    """
+
+    code = f"""
+import sys
+from click.testing import CliRunner
+from fmsgridtools.main import main
+for args in [["--help"], ["make-mosaic", "--help"], ["make-hgrid", "--help"]]:
+    assert CliRunner().invoke(main, args).exit_code == 0
+print(*[module for module in {HEAVY_MODULES} if module in sys.modules])
+"""
+
+    assert run_python(code).split() == []
+
+
+def test_pyfrenctools_loads_library_lazily():
+
+    code = """
+import pyfrenctools
+print(pyfrenctools.cfrenctools.functions().lib is None)
+pyfrenctools.cfrenctools.lib()
+print(pyfrenctools.cfrenctools.functions().lib is None)
+"""
+
+    assert run_python(code).split() == ["True", "False"]
+
+
+def test_subpackages_forward_only_known_names():
+
+    """
+    The subpackages forward their commands and submodules independent of
+    the import order and raise AttributeError for any other name
+    """
+
+    code = """
+import fmsgridtools
+print(fmsgridtools.make_mosaic.coupler_mosaic.__name__)
+print(fmsgridtools.make_mosaic.solo.name)
+for package in [fmsgridtools.make_hgrid, fmsgridtools.make_mosaic, fmsgridtools.make_topog, fmsgridtools.remap]:
+    print(hasattr(package, "click"), hasattr(package, "np"))
+"""
+
+    assert run_python(code).split() == ["fmsgridtools.make_mosaic.coupler_mosaic", "solo"] + ["False", "False"]*4
@@ -5,6 +5,7 @@ import pytest
 import xarray as xr
 
 import fmsgridtools
+import pyfrenctools
 
 
 def generate_mosaic(nx: int = 90, ny: int = 45, refine: int = 2):
@@ -104,5 +105,287 @@ def test_create_xgrid(on_gpu):
     remove_mosaic()
 
 
+def test_create_xgrid_skip_tiles(make_gridobj):
+
+    src_grid = {"tile1": make_gridobj(0, 90, -30, 30, 30, 20),
+                "tile2": make_gridobj(180, 270, -30, 30, 30, 20)}
+    tgt_grid = {"tile1": make_gridobj(18, 54, -12, 12, 36, 24)}
+
+    xgrid = fmsgridtools.XGridObj(src_grid=src_grid, tgt_grid=tgt_grid)
+    xgrid.create_xgrid()
+
+    #src tile2 does not overlap the target tile
+    assert list(xgrid.datadict["tile1"].keys()) == ["tile1"]
+
+    #the target covers src cells 6 to 17 in x and 6 to 13 in y
+    xgrid_out = xgrid.datadict["tile1"]["tile1"]
+    assert xgrid_out["nxcells"] == 36*24
+    assert np.all(xgrid_out["tile"] == 1)
+    assert np.all(xgrid_out["src_i"] == xgrid_out["tgt_i"]//3 + 6)
+    assert np.all(xgrid_out["src_j"] == xgrid_out["tgt_j"]//3 + 6)
+
+
+def test_create_xgrid_nprocs(src_grid, tgt_grid):
+
+    rng = np.random.default_rng(0)
+    src_mask = {tile: rng.random(30*20) for tile in src_grid}
+
+    serial = fmsgridtools.XGridObj(src_grid=src_grid, tgt_grid=tgt_grid)
+    serial.create_xgrid(src_mask=src_mask)
+
+    parallel = fmsgridtools.XGridObj(src_grid=src_grid, tgt_grid=tgt_grid, nprocs=2)
+    parallel.create_xgrid(src_mask=src_mask)
+
+    for tgt_tile in serial.datadict:
+        assert list(parallel.datadict[tgt_tile].keys()) == list(serial.datadict[tgt_tile].keys())
+        for src_tile in serial.datadict[tgt_tile]:
+            for key, value in serial.datadict[tgt_tile][src_tile].items():
+                assert np.array_equal(parallel.datadict[tgt_tile][src_tile][key], value)
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_create_xgrid_row_blocks(executor, make_gridobj):
+
+    src_grid = {"tile1": make_gridobj(0, 360, -80, 80, 72, 64)}
+    tgt_grid = {"tile1": make_gridobj(0, 360, -90, 90, 50, 45)}
+
+    rng = np.random.default_rng(0)
+    src_mask = {"tile1": rng.random(72*64)}
+
+    serial = fmsgridtools.XGridObj(src_grid=src_grid, tgt_grid=tgt_grid)
+    serial.create_xgrid(src_mask=src_mask)
+
+    parallel = fmsgridtools.XGridObj(src_grid=src_grid, tgt_grid=tgt_grid, nprocs=4, executor=executor)
+    parallel.create_xgrid(src_mask=src_mask)
+
+    for key, value in serial.datadict["tile1"]["tile1"].items():
+        assert np.array_equal(parallel.datadict["tile1"]["tile1"][key], value)
+
+
+def test_create_xgrid_cache(tmp_path, src_grid, tgt_grid):
+
+    tgt_grid = {"tile1": tgt_grid["tile1"]}
+    cache_dir = str(tmp_path/"cache")
+
+    xgrid = fmsgridtools.XGridObj(src_grid=src_grid, tgt_grid=tgt_grid, cache_dir=cache_dir)
+    xgrid.create_xgrid()
+    assert len(os.listdir(cache_dir)) == 1
+
+    cached = fmsgridtools.XGridObj(src_grid=src_grid, tgt_grid=tgt_grid, cache_dir=cache_dir)
+    assert cached._read_cache(cached._get_cache_key())
+
+    for src_tile in xgrid.datadict["tile1"]:
+        for key, value in xgrid.datadict["tile1"][src_tile].items():
+            assert np.array_equal(cached.datadict["tile1"][src_tile][key], value)
+
+    #a different mask is a different exchange grid
+    tgt_mask = {"tile1": np.ones(25*15)}
+    fmsgridtools.XGridObj(src_grid=src_grid, tgt_grid=tgt_grid, cache_dir=cache_dir).create_xgrid(tgt_mask=tgt_mask)
+    assert len(os.listdir(cache_dir)) == 2
+
+    #the least recently used exchange grid is evicted first
+    key = cached._get_cache_key()
+    os.utime(os.path.join(cache_dir, key), (0, 0))
+    entry_size = sum(ifile.stat().st_size for ifile in os.scandir(os.path.join(cache_dir, key)))
+
+    tgt_mask = {"tile1": np.full(25*15, 0.9)}
+    fmsgridtools.XGridObj(src_grid=src_grid, tgt_grid=tgt_grid, cache_dir=cache_dir,
+                          cache_size=2*entry_size).create_xgrid(tgt_mask=tgt_mask)
+    assert len(os.listdir(cache_dir)) == 2
+    assert key not in os.listdir(cache_dir)
+
+def test_to_sparse(make_gridobj, src_grid):
+
+    tgt_grid = {"tile1": make_gridobj(45, 135, -30, 30, 10, 10)}
+
+    xgrid = fmsgridtools.XGridObj(src_grid=src_grid, tgt_grid=tgt_grid)
+    xgrid.create_xgrid()
+
+    operator = xgrid.to_sparse()
+    assert operator is xgrid.to_sparse()
+    assert operator.shape == (10*10, 2*30*20)
+    assert np.allclose(operator.sum(axis=1), 1.0)
+
+    #a field that is constant on each source tile
+    field = np.concatenate([np.ones(30*20), np.full(30*20, 3.0)])
+    remapped = (operator @ field).reshape(10, 10)
+    assert np.allclose(remapped[:, :5], 1.0)
+    assert np.allclose(remapped[:, 5:], 3.0)
+
+    xgrid.create_xgrid()
+    assert xgrid.to_sparse() is not operator
+
+
+def test_to_sparse_normalize(src_grid, ocn_grid):
+
+    xgrid = fmsgridtools.XGridObj(src_grid=src_grid, tgt_grid=ocn_grid)
+    xgrid.create_xgrid()
+
+    #the rows of target cells only partly covered by src_grid sum to the covered fraction
+    tgt_area = pyfrenctools.grid_utils.get_grid_area(ocn_grid["tile1"].x, ocn_grid["tile1"].y)
+    _, tgt_xarea = xgrid.sum_xarea(src=False)
+    operator = xgrid.to_sparse()
+    assert np.allclose(operator.sum(axis=1), tgt_xarea["tile1"].flatten()/tgt_area)
+    assert np.any(operator.sum(axis=1) < 0.99)
+
+    #the rows of all covered target cells sum to 1 when normalized by the exchange grid area
+    covered = tgt_xarea["tile1"].flatten() > 0.0
+    assert np.allclose(xgrid.to_sparse(normalize="xarea").sum(axis=1)[covered], 1.0)
+    assert xgrid.to_sparse() is operator
+
+    with pytest.raises(ValueError):
+        xgrid.to_sparse(normalize="src_area")
+
+
+def test_sum_xarea(src_grid, tgt_grid):
+
+    xgrid = fmsgridtools.XGridObj(src_grid=src_grid, tgt_grid=tgt_grid)
+    xgrid.create_xgrid()
+    src_xarea, tgt_xarea = xgrid.sum_xarea()
+
+    for tgt_tile in tgt_grid:
+        answer = np.zeros((tgt_grid[tgt_tile].ny, tgt_grid[tgt_tile].nx))
+        for xgrid_out in xgrid.datadict[tgt_tile].values():
+            np.add.at(answer, (xgrid_out["tgt_j"], xgrid_out["tgt_i"]), xgrid_out["xarea"])
+        assert np.allclose(tgt_xarea[tgt_tile], answer, rtol=1e-14)
+
+    for src_tile in src_grid:
+        answer = np.zeros((src_grid[src_tile].ny, src_grid[src_tile].nx))
+        for tgt_tile in tgt_grid:
+            xgrid_out = xgrid.datadict[tgt_tile].get(src_tile)
+            if xgrid_out is None: continue
+            np.add.at(answer, (xgrid_out["src_j"], xgrid_out["src_i"]), xgrid_out["xarea"])
+        assert np.allclose(src_xarea[src_tile], answer, rtol=1e-14)
+
+    #only one side is summed
+    no_src, tgt_only = xgrid.sum_xarea(src=False)
+    src_only, no_tgt = xgrid.sum_xarea(tgt=False)
+    assert no_src is None and no_tgt is None
+    for tgt_tile in tgt_grid: assert np.array_equal(tgt_only[tgt_tile], tgt_xarea[tgt_tile])
+    for src_tile in src_grid: assert np.array_equal(src_only[src_tile], src_xarea[src_tile])
+
+
+def test_split(src_grid, ocn_grid):
+
+    tgt_mask = {"tile1": np.random.default_rng(0).random((50, 70))}
+
+    xgrid = fmsgridtools.XGridObj(src_grid=src_grid, tgt_grid=ocn_grid)
+    xgrid.create_xgrid()
+    ocean, land = xgrid.split(tgt_mask=tgt_mask)
+
+    for part, mask in ((ocean, tgt_mask["tile1"]), (land, 1.0 - tgt_mask["tile1"])):
+        answer = fmsgridtools.XGridObj(src_grid=src_grid, tgt_grid=ocn_grid)
+        answer.create_xgrid(tgt_mask={"tile1": mask})
+        assert list(part.datadict["tile1"].keys()) == list(answer.datadict["tile1"].keys())
+        for src_tile, xgrid_out in answer.datadict["tile1"].items():
+            for key, value in xgrid_out.items():
+                assert np.array_equal(part.datadict["tile1"][src_tile][key], value)
+
+
+def test_split_on_gpu(src_grid, ocn_grid):
+
+    #the GPU clipping routine does not apply the target mask as split does
+    xgrid = fmsgridtools.XGridObj(src_grid=src_grid, tgt_grid=ocn_grid, datadict={"tile1": {}}, on_gpu=True)
+    with pytest.raises(RuntimeError):
+        xgrid.split(tgt_mask={"tile1": np.ones((50, 70))})
+
+
+def test_write(tmp_path, src_grid, tgt_grid):
+
+    outfile = str(tmp_path/"remap.nc")
+
+    xgrid = fmsgridtools.XGridObj(src_grid=src_grid, tgt_grid=tgt_grid, chunksize=100, compression="zlib")
+    xgrid.create_xgrid()
+    xgrid.write(outfile)
+
+    pairs = [(itgt, tgt_tile, src_tile) for itgt, tgt_tile in enumerate(tgt_grid, start=1)
+             for src_tile in xgrid.datadict[tgt_tile]]
+    assert len(pairs) == 4
+
+    with xr.open_dataset(outfile) as dataset:
+        assert dataset.attrs["src_tiles"] == "tile1 tile2"
+        assert dataset.attrs["tgt_tiles"] == "tile1 tile2"
+        assert dataset["xarea"].encoding["chunksizes"] == (100,)
+        assert dataset["xarea"].encoding["zlib"]
+
+        columns = dict(src_i=dataset["src_cell"].values[:,0]-1, src_j=dataset["src_cell"].values[:,1]-1,
+                       tgt_i=dataset["tgt_cell"].values[:,0]-1, tgt_j=dataset["tgt_cell"].values[:,1]-1,
+                       xarea=dataset["xarea"].values, tile=dataset["tile"].values)
+        tgt_itile = np.concatenate([np.full(xgrid.datadict[tgt_tile][src_tile]["nxcells"], itgt)
+                                    for itgt, tgt_tile, src_tile in pairs])
+        assert np.array_equal(dataset["tgt_tile"].values, tgt_itile)
+
+    for key, value in columns.items():
+        answer = np.concatenate([xgrid.datadict[tgt_tile][src_tile][key] for itgt, tgt_tile, src_tile in pairs])
+        assert np.array_equal(value, answer)
+
+    #cells are written as they are generated
+    streamed = fmsgridtools.XGridObj(src_grid=src_grid, tgt_grid=tgt_grid)
+    streamed.create_xgrid(outfile=str(tmp_path/"streamed.nc"), keep=False)
+    assert all(len(streamed.datadict[tgt_tile]) == 0 for tgt_tile in tgt_grid)
+
+    with xr.open_dataset(outfile) as dataset, xr.open_dataset(str(tmp_path/"streamed.nc")) as streamed:
+        for key in dataset.data_vars:
+            assert np.array_equal(dataset[key].values, streamed[key].values)
+
+
+def test_write_npy(tmp_path, make_gridobj, src_grid, tgt_grid):
+
+    tgt_grid = {"tile1": tgt_grid["tile1"], "tile2": make_gridobj(200, 240, -40, 10, 20, 25)}
+    outdir = str(tmp_path/"remap")
+
+    xgrid = fmsgridtools.XGridObj(src_grid=src_grid, tgt_grid=tgt_grid)
+    xgrid.create_xgrid()
+    xgrid.write(outdir, format="npy")
+
+    restart = fmsgridtools.XGridObj(restart_remap_file=outdir)
+    assert list(restart.datadict.keys()) == ["tile1", "tile2"]
+    assert restart.datadict["tile2"] == {}
+
+    for src_tile, xgrid_out in xgrid.datadict["tile1"].items():
+        for key, value in xgrid_out.items():
+            assert np.array_equal(restart.datadict["tile1"][src_tile][key], value)
+        assert isinstance(restart.datadict["tile1"][src_tile]["xarea"], np.memmap)
+        assert restart.datadict["tile1"][src_tile]["src_i"].dtype == np.int32
+
+    #the tile column is not required in datadict
+    for tgt_tile in xgrid.datadict:
+        for xgrid_out in xgrid.datadict[tgt_tile].values(): del xgrid_out["tile"]
+    xgrid.write(str(tmp_path/"notile"), format="npy")
+
+    restart = fmsgridtools.XGridObj(restart_remap_file=str(tmp_path/"notile"))
+    for src_tile, xgrid_out in restart.datadict["tile1"].items():
+        assert np.all(xgrid_out["tile"] == list(src_grid).index(src_tile) + 1)
+
+
+def test_read_pairs(tmp_path, make_gridobj, src_grid, tgt_grid):
+
+    tgt_grid = {**tgt_grid, "tile3": make_gridobj(200, 240, -40, 10, 20, 25)}
+    outfile = str(tmp_path/"remap.nc")
+
+    xgrid = fmsgridtools.XGridObj(src_grid=src_grid, tgt_grid=tgt_grid)
+    xgrid.create_xgrid()
+    xgrid.write(outfile)
+
+    #without the pair index, the pairs are found from the tile columns
+    noindex = str(tmp_path/"noindex.nc")
+    with xr.open_dataset(outfile) as dataset:
+        dataset.drop_dims("npairs").to_netcdf(noindex)
+
+    for infile in (outfile, noindex):
+        restart = fmsgridtools.XGridObj(restart_remap_file=infile)
+        assert list(restart.datadict.keys()) == ["tile1", "tile2", "tile3"]
+        assert restart.datadict["tile3"] == {}
+        for tgt_tile in ("tile1", "tile2"):
+            assert list(restart.datadict[tgt_tile].keys()) == list(xgrid.datadict[tgt_tile].keys())
+            for src_tile, xgrid_out in xgrid.datadict[tgt_tile].items():
+                for key, value in xgrid_out.items():
+                    assert np.array_equal(restart.datadict[tgt_tile][src_tile][key], value)
+
+        restart.read(infile, tgt_tiles=["tile2"])
+        assert list(restart.datadict.keys()) == ["tile2"]
+        assert np.array_equal(restart.datadict["tile2"]["tile1"]["xarea"], xgrid.datadict["tile2"]["tile1"]["xarea"])
+
+
 if __name__ == "__main__":
     test_create_xgrid(on_gpu=False)
@@ -57,7 +57,48 @@ def test_generate_rectangular_basin_multi_tile():
         assert all( val == 128.0 for val in ds.data_vars[f'depth_tile{i+1}'].values.flatten())
     remove(Path(out_file))
 
-# needs input files generated, will be much easier once make_hgrid and make_mosaic are done
-@pytest.mark.skip(reason="TODO")
-def test_generate_realistic():
-    pass
+def fake_create_realistic_topog(nx_dst, ny_dst, x_dst, y_dst, tile_file, **options):
+    # stands in for the C function, the values identify the tile of tile_file
+    itile = int(Path(tile_file).suffixes[0][len(".tile"):])
+    depth = np.full((ny_dst, nx_dst), 100.0*itile)
+    num_levels = np.full((ny_dst, nx_dst), itile, dtype=np.int32)
+    return depth, num_levels
+
+
+@pytest.mark.parametrize("nprocs", [1, 2])
+def test_generate_realistic(nprocs, tmp_path, monkeypatch):
+    monkeypatch.setattr("pyfrenctools.topog.create_realistic_topog", fake_create_realistic_topog)
+
+    topog_file, vgrid_file = tmp_path/"topog.nc", tmp_path/"vgrid.nc"
+    topog_file.touch()
+    vgrid_file.touch()
+
+    # tiles of different sizes in mosaic order
+    tiles = {"tile1": 1, "tile2": 2, "tile3": 3}
+    x_tile, y_tile = {}, {}
+    for tile, itile in tiles.items():
+        x_tile[tile], y_tile[tile] = np.meshgrid(np.arange(2*itile+3, dtype=np.float64),
+                                                 np.arange(itile+3, dtype=np.float64))
+
+    out_file = tmp_path/"topog_realistic.nc"
+    topog = TopogObj(output_name=str(out_file), ntiles=3, x_tile=x_tile, y_tile=y_tile,
+                     x_refine=1, y_refine=1, scale_factor=1)
+    topog.make_topog_realistic(topog_file=str(topog_file), topog_field="depth",
+                               vgrid_file=str(vgrid_file),
+                               grid_filenames=[f"grid.{tile}.nc" for tile in tiles],
+                               nprocs=nprocs)
+
+    assert list(topog.depth_vals) == [f"{var}_{tile}" for tile in tiles for var in ("depth", "num_levels")]
+    for tile, itile in tiles.items():
+        assert topog.depth_vals[f"depth_{tile}"].shape == (itile+2, 2*itile+2)
+        assert np.all(topog.depth_vals[f"depth_{tile}"] == 100.0*itile)
+        assert np.all(topog.depth_vals[f"num_levels_{tile}"] == itile)
+
+    topog.write_topog_file()
+    with xarray.open_dataset(out_file) as ds:
+        for tile, itile in tiles.items():
+            dims = (f"ny_{tile}", f"nx_{tile}")
+            assert ds[f"depth_{tile}"].dims == dims
+            assert ds[f"num_levels_{tile}"].dims == dims
+            assert ds.sizes[f"ny_{tile}"] == itile+2 and ds.sizes[f"nx_{tile}"] == 2*itile+2
+            assert np.all(ds[f"num_levels_{tile}"].values == itile)
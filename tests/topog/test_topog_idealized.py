@@ -0,0 +1,83 @@
+# unit tests for the idealized topography generators
+
+import numpy as np
+
+from fmsgridtools.make_topog.topogobj import TopogObj, nearest_index
+
+
+def make_topog(lon, lat, ntiles=1):
+    x, y = np.meshgrid(lon, lat)
+    tiles = [f"tile{i+1}" for i in range(ntiles)]
+    return TopogObj(ntiles=ntiles,
+                    x_tile={tile: x for tile in tiles},
+                    y_tile={tile: y for tile in tiles},
+                    x_refine=2,
+                    y_refine=2)
+
+
+def test_nearest_index():
+    array = np.array([0.0, 1.0, 2.0, 3.0])
+    assert nearest_index(-1.0, array) == 0
+    assert nearest_index(0.0, array) == 0
+    assert nearest_index(1.4, array) == 1
+    assert nearest_index(1.6, array) == 2
+    assert nearest_index(4.0, array) == 3
+
+
+def test_make_topog_gaussian():
+    topog = make_topog(np.linspace(0.0, 40.0, 81), np.linspace(-20.0, 20.0, 81), ntiles=2)
+    topog.make_topog_gaussian(gauss_scale=0.25, gauss_amp=0.5, slope_x=0.0, slope_y=0.0,
+                              bottom_depth=5000.0, min_depth=10.0)
+    for tile in ("tile1", "tile2"):
+        depth = topog.depth_vals[f"depth_{tile}"]
+        assert depth.shape == (40, 40)
+        #bump is centered in the tile and symmetric
+        assert np.unravel_index(depth.argmin(), depth.shape) in [(19, 19), (19, 20), (20, 19), (20, 20)]
+        np.testing.assert_allclose(depth, depth[::-1, ::-1])
+        assert depth.min() > 2500.0 and depth.max() < 5000.0
+
+
+def test_make_topog_bowl():
+    topog = make_topog(np.linspace(0.0, 20.0, 41), np.linspace(60.0, 70.0, 21))
+    topog.make_topog_bowl(bottom_depth=5000.0, min_depth=10.0, bowl_south=60.0,
+                          bowl_north=70.0, bowl_west=0.0, bowl_east=20.0)
+    depth = topog.depth_vals["depth_tile1"]
+    assert depth.shape == (10, 20)
+    assert np.all(depth >= 10.0)
+    assert depth[5, 10] > depth[0, 10] and depth[5, 10] > depth[5, 0]
+
+
+def test_make_topog_box_idealized():
+    topog = make_topog(np.linspace(0.0, 360.0, 361), np.linspace(-90.0, 90.0, 181))
+    topog.make_topog_box_idealized(bottom_depth=5000.0, min_depth=10.0)
+    depth = topog.depth_vals["depth_tile1"]
+    assert depth.shape == (90, 180)
+    #antarctica is land, the ocean is undulating and no deeper than bottom_depth
+    assert np.all(depth[:5] == 0.0)
+    assert np.all(depth <= 5000.0)
+    assert 0.2 < np.mean(depth == 0.0) < 0.5
+
+
+def test_make_topog_box_channel():
+    topog = make_topog(np.linspace(0.0, 20.0, 41), np.linspace(0.0, 20.0, 41))
+    topog.make_topog_box_channel(jwest_south=5, jwest_north=10, ieast_south=8, ieast_north=12,
+                                 bottom_depth=4000.0)
+    depth = topog.depth_vals["depth_tile1"]
+    assert np.all(depth[[0, -1]] == 0.0)
+    assert np.array_equal(np.flatnonzero(depth[:, 0]), np.arange(5, 10))
+    assert np.array_equal(np.flatnonzero(depth[:, -1]), np.arange(8, 12))
+    assert np.all(depth[1:-1, 1:-1] == 4000.0)
+
+
+def test_make_topog_dome():
+    topog = make_topog(np.linspace(10.0, 30.0, 81), np.linspace(60.0, 72.0, 49))
+    topog.make_topog_dome(dome_slope=0.01, dome_bottom=3600.0, dome_embayment_west=19.0,
+                          dome_embayment_east=21.0, dome_embayment_south=69.0,
+                          dome_embayment_depth=600.0)
+    depth = topog.depth_vals["depth_tile1"]
+    assert depth.shape == (24, 40)
+    #flat bottom in the south, shelf in the north, and the embayment cuts through the shelf
+    assert np.all(depth[0] == 3600.0)
+    assert np.all(depth[-1][(depth[-1] != 600.0)] == 0.0)
+    assert np.any(depth[-1] == 600.0)
+    assert np.all(np.diff(depth[:, 0]) <= 0.0)